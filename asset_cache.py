@@ -0,0 +1,323 @@
+"""
+Host-wide disk cache for the portal's ScriptResource / WebResource bundles
+CreateJob.aspx references a few MB of ASP.NET and Telerik script and skin bundles
+(ScriptResource.axd, WebResource.axd, Telerik.Web.UI.WebResource.axd). They are
+immutable - the version is in the query string - but every new session starts with an
+empty browser cache and downloads them all again.
+
+Each session's FetchInterceptor (devtools.py, the tab the worker fills in) pauses every
+bundle request for an AssetHandler: one already in the cache is answered from disk, one
+that is not continues to the server and its response is stored on the way back. The cache is
+keyed by the full URL, shared by all sessions and processes on the host, and evicts the
+least recently used bundles beyond ASSET_CACHE_MB.
+
+SERVPRO_ASSET_CACHE=0 turns it off. Only the tab that was current when the session
+started is intercepted (as with request_blocking.py).
+
+The standin command serves a stand-in CreateJob page with versioned bundles and counts
+the bundle requests that reach it; check loads it in two fresh sessions and shows that
+the second one is served from the cache.
+
+Usage:
+    python asset_cache.py stats
+    python asset_cache.py clear
+    python asset_cache.py standin [--port 8765]
+    python asset_cache.py check [--port 8765]       # needs Chrome and a running standin
+"""
+
+import os
+import sys
+import json
+import time
+import fnmatch
+import hashlib
+import threading
+
+from control_index import CACHE_DIR
+
+ASSET_CACHE = os.environ.get("SERVPRO_ASSET_CACHE", "1") != "0"
+
+ASSET_CACHE_DIR = os.path.join(CACHE_DIR, "assets")
+
+# Bundles beyond this size (all files together) are evicted least recently used first
+ASSET_CACHE_MB = int(os.environ.get("SERVPRO_ASSET_CACHE_MB", "200"))
+
+# Requests intercepted by the cache (CDP patterns; '*' and '?' are wildcards)
+ASSET_PATTERNS = ("*ScriptResource.axd?*", "*WebResource.axd?*")
+
+# Response headers replayed from the cache (the body is stored decoded, so no encoding/length)
+KEPT_HEADERS = ("content-type", "cache-control", "expires", "last-modified", "etag")
+
+STANDIN_PORT = 8765
+
+MB = 1024 * 1024
+
+
+class AssetCache:
+    """Bundles on disk, one body and one metadata file per URL"""
+
+    def __init__(self, directory=ASSET_CACHE_DIR, max_bytes=ASSET_CACHE_MB * MB):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+
+    def get_path(self, url, suffix):
+        return os.path.join(self.directory, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.{suffix}")
+
+    def get(self, url):
+        """
+        Cached bundle for a URL
+
+        Returns:
+            Tuple of (headers, body) or None on a miss
+        """
+        body_path = self.get_path(url, "body")
+        try:
+            with open(self.get_path(url, "json"), "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            with open(body_path, "rb") as file:
+                body = file.read()
+            # mtime is the recency used by eviction
+            os.utime(body_path)
+        except (OSError, ValueError):
+            return None
+        if meta.get('url') != url or meta.get('size') != len(body):
+            return None
+        return meta['headers'], body
+
+    def put(self, url, headers, body):
+        """Store a bundle (atomically; another process may be reading it) and evict beyond the limit"""
+        os.makedirs(self.directory, exist_ok=True)
+        meta = {'url': url, 'headers': headers, 'size': len(body), 'stored_at': time.time()}
+        for suffix, data in (("body", body), ("json", json.dumps(meta).encode("utf-8"))):
+            path = self.get_path(url, suffix)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        self.evict()
+
+    def list_bodies(self):
+        """(mtime, size, path) of every cached body"""
+        bodies = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return bodies
+        for name in names:
+            if not name.endswith(".body"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, path))
+        return bodies
+
+    def evict(self):
+        """Delete least recently used bundles until the cache fits max_bytes; returns how many"""
+        with self.lock:
+            bodies = sorted(self.list_bodies())
+            total = sum(size for _, size, _ in bodies)
+            evicted = 0
+            while bodies and total > self.max_bytes:
+                _, size, path = bodies.pop(0)
+                for victim in (path, path[:-len(".body")] + ".json"):
+                    try:
+                        os.remove(victim)
+                    except OSError:
+                        pass
+                total -= size
+                evicted += 1
+            return evicted
+
+    def get_stats(self):
+        bodies = self.list_bodies()
+        return {'bundles': len(bodies), 'bytes': sum(size for _, size, _ in bodies), 'max_bytes': self.max_bytes}
+
+    def clear(self):
+        removed = 0
+        for _, _, path in self.list_bodies():
+            for victim in (path, path[:-len(".body")] + ".json"):
+                try:
+                    os.remove(victim)
+                    removed += 1
+                except OSError:
+                    pass
+        return removed // 2
+
+
+class AssetHandler:
+    """Serves one tab's bundle requests from the AssetCache and fills the cache on misses (see devtools.FetchInterceptor)"""
+
+    def __init__(self, cache=None):
+        self.cache = cache or AssetCache()
+        self.stats = {'hits': 0, 'misses': 0, 'bytes_from_cache': 0, 'bytes_fetched': 0}
+        self.lock = threading.Lock()
+
+    def get_patterns(self):
+        # Paused twice: at the request (answered on a hit) and at the response (stored on a miss)
+        return [{'urlPattern': pattern, 'requestStage': stage}
+                for pattern in ASSET_PATTERNS for stage in ("Request", "Response")]
+
+    def __call__(self, interceptor, params):
+        url = params['request']['url']
+        if not any(fnmatch.fnmatchcase(url, pattern) for pattern in ASSET_PATTERNS):
+            return False
+        if 'responseStatusCode' in params or 'responseErrorReason' in params:
+            return self.store(interceptor, params)
+        return self.serve(interceptor, params)
+
+    def serve(self, interceptor, params):
+        """Request stage: answer from the cache, or let the request go to the server"""
+        cached = self.cache.get(params['request']['url'])
+        if cached is None:
+            return False
+        headers, body = cached
+        interceptor.fulfill(params['requestId'], headers, body)
+        with self.lock:
+            self.stats['hits'] += 1
+            self.stats['bytes_from_cache'] += len(body)
+        return True
+
+    def store(self, interceptor, params):
+        """Response stage: store a successful bundle, then hand the response to the page"""
+        request_id, url = params['requestId'], params['request']['url']
+        if params.get('responseStatusCode') != 200:
+            return False
+        body = interceptor.get_response_body(request_id)
+        headers = [(header['name'], header['value']) for header in params.get('responseHeaders', [])
+                   if header['name'].lower() in KEPT_HEADERS]
+        interceptor.fulfill(request_id, headers, body)
+        try:
+            self.cache.put(url, headers, body)
+        except OSError as e:
+            print(f"⚠️ Asset cache: could not store {url}: {str(e)}")
+        with self.lock:
+            self.stats['misses'] += 1
+            self.stats['bytes_fetched'] += len(body)
+        return True
+
+    def take_stats(self):
+        """Counters since the last call: 'hits', 'misses', 'bytes_from_cache', 'bytes_fetched'"""
+        with self.lock:
+            stats = dict(self.stats)
+            for key in self.stats:
+                self.stats[key] = 0
+        return stats
+
+
+def start_asset_cache(driver, interceptor, cache=None):
+    """
+    Serve the session's bundles from the host cache through its FetchInterceptor (before it starts)
+
+    Returns:
+        The AssetHandler (also set as driver.asset_handler), or None when the cache is
+        off or the session has no interceptor
+    """
+    if not ASSET_CACHE or interceptor is None:
+        return None
+    handler = AssetHandler(cache)
+    interceptor.add_handler(handler.get_patterns(), handler)
+    driver.asset_handler = handler
+    return handler
+
+
+def serve_standin(port=STANDIN_PORT):
+    """Serve a stand-in CreateJob page with versioned bundles; /counts reports bundle requests served"""
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    counts = {}
+    bundles = {
+        "/ScriptResource.axd?d=standin-ajax&t=1": ("application/x-javascript", b"window.ajaxLoaded = true;\n" * 20000),
+        "/WebResource.axd?d=standin-webforms&t=1": ("application/x-javascript", b"window.webFormsLoaded = true;\n" * 5000),
+        "/Telerik.Web.UI.WebResource.axd?d=standin-skin&t=1": ("text/css", b".RadComboBox { color: #333; }\n" * 20000),
+    }
+    page = ("<html><head>" + "".join(
+        f'<link rel="stylesheet" href="{path}">' if kind == "text/css" else f'<script src="{path}"></script>'
+        for path, (kind, _) in bundles.items()) + "</head><body><h1>CreateJob stand-in</h1></body></html>").encode()
+
+    class StandinHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/counts":
+                self.reply("application/json", json.dumps(counts).encode())
+            elif self.path in bundles:
+                counts[self.path] = counts.get(self.path, 0) + 1
+                kind, body = bundles[self.path]
+                self.reply(kind, body, {'Cache-Control': "public, max-age=31536000"})
+            else:
+                self.reply("text/html", page, {'Cache-Control': "no-cache"})
+
+        def reply(self, kind, body, headers=None):
+            self.send_response(200)
+            self.send_header("Content-Type", kind)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandinHandler)
+    print(f"🧪 Stand-in CreateJob page on http://127.0.0.1:{port}/ ({len(bundles)} bundles)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def check_standin(port=STANDIN_PORT):
+    """Load the stand-in page in two fresh sessions and compare the bundle requests that reached it"""
+    import urllib.request
+    from servpro_login import setup_driver, quit_session
+
+    def get_counts():
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/counts", timeout=10) as response:
+            return sum(json.loads(response.read()).values())
+
+    for session in (1, 2):
+        before = get_counts()
+        driver = setup_driver()
+        try:
+            started = time.time()
+            driver.get(f"http://127.0.0.1:{port}/")
+            load_time = time.time() - started
+            stats = driver.asset_handler.take_stats() if getattr(driver, 'asset_handler', None) else {}
+        finally:
+            quit_session(driver)
+        print(f"🧪 Session {session}: {get_counts() - before} bundle request(s) reached the server, "
+              f"{stats.get('hits', 0)} served from the cache, page loaded in {load_time:.2f}s")
+
+
+def main():
+    """Command line front end (see module docstring)"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 2
+    command = args[0]
+    port = int(args[args.index("--port") + 1]) if "--port" in args else STANDIN_PORT
+    cache = AssetCache()
+    if command == "stats":
+        stats = cache.get_stats()
+        print(f"📚 Asset cache {cache.directory}: {stats['bundles']} bundle(s), "
+              f"{stats['bytes'] / MB:.1f} of {stats['max_bytes'] / MB:.0f} MB")
+    elif command == "clear":
+        print(f"🧹 Removed {cache.clear()} bundle(s)")
+    elif command == "standin":
+        serve_standin(port)
+    elif command == "check":
+        check_standin(port)
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""
+asyncio facade over the blocking Selenium fill path
+Every WebDriver call runs on a bounded thread pool; the event loop only awaits.
+Jobs are filled one plan action per executor call, postback waits are polled with
+asyncio.sleep, and the fixed sleeps inside the fillers are interruptible (see
+cancellation.py). Each job gets a deadline; a job that times out or is cancelled
+stops at its next pause, and a browser that does not let go within CANCEL_GRACE
+seconds is killed so the thread is freed.
+
+Usage:
+    python async_runner.py job1.json [job2.json ...] [--sessions N] [--timeout SECONDS]
+"""
+
+import sys
+import time
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from servpro_login import (
+    open_job_creation_session, navigate_to_job_creation, fill_plan_action,
+    is_postback_pending, verify_and_retry_form, quit_session
+)
+from form_plan import get_form_plan, get_customer_type, iter_plan_values
+from form_checkpoint import get_job_id
+from control_drift import check_control_drift, get_quarantined_fields
+from cancellation import run_with_cancel_event
+from worker_pool import summarize_report, load_payloads, print_pool_summary
+
+DEFAULT_MAX_THREADS = 8
+DEFAULT_JOB_TIMEOUT = 300
+
+# Seconds a cancelled job's thread gets to stop on its own before the browser is killed
+CANCEL_GRACE = 5
+
+POSTBACK_TIMEOUT = 10
+POSTBACK_POLL = 0.2
+
+
+class AsyncSession:
+    """
+    One browser session driven from asyncio
+
+    Calls for a session are serialized (WebDriver has one focused window); calls for
+    different sessions run concurrently on the runner's thread pool.
+    """
+
+    def __init__(self, runner, driver):
+        self.runner = runner
+        self.driver = driver
+        self.lock = asyncio.Lock()
+        self.broken = False
+        self.in_flight = None
+
+    async def call(self, func, *args, cancel_event=None, **kwargs):
+        """Run a blocking call for this session on the thread pool"""
+        future = asyncio.wrap_future(self.runner.submit(func, *args, cancel_event=cancel_event, **kwargs))
+        # A cancelled job's call still finishes (usually with JobCancelled); consume its outcome
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.in_flight = future
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if cancel_event is not None:
+                cancel_event.set()
+            raise
+
+    async def wait_for_postback(self, cancel_event, timeout=POSTBACK_TIMEOUT):
+        """Awaitable postback wait: polls the page without holding a thread between polls"""
+        deadline = time.monotonic() + timeout
+        while await self.call(is_postback_pending, self.driver, cancel_event=cancel_event):
+            if time.monotonic() > deadline:
+                print(f"    ⚠️ Postback still running after {timeout}s")
+                return False
+            await asyncio.sleep(POSTBACK_POLL)
+        return True
+
+    async def fill_steps(self, form_data, cancel_event):
+        """Fill and verify one job, one plan action per executor call"""
+        await self.call(check_control_drift, self.driver, cancel_event=cancel_event)
+        quarantined = get_quarantined_fields(self.driver)
+        wait = WebDriverWait(self.driver, 10)
+        plan = get_form_plan(get_customer_type(form_data))
+
+        for action, value in iter_plan_values(plan, form_data):
+            if f"{action.section}.{action.field}" in quarantined:
+                continue
+            await self.call(fill_plan_action, self.driver, wait, action, value, wait_postback=False,
+                            cancel_event=cancel_event)
+            if action.postback:
+                await self.wait_for_postback(cancel_event)
+
+        return await self.call(verify_and_retry_form, self.driver, wait, form_data, cancel_event=cancel_event)
+
+    async def fill_job(self, form_data, timeout=DEFAULT_JOB_TIMEOUT, fresh_page=True):
+        """
+        Fill one job with a deadline
+
+        Args:
+            form_data: Dictionary containing form data
+            timeout: Seconds before the job is cancelled (None for no deadline)
+            fresh_page: Reload the CreateJob page first
+
+        Returns:
+            Verification report
+
+        Raises:
+            asyncio.TimeoutError / asyncio.CancelledError after aborting the browser work
+        """
+        async with self.lock:
+            if self.broken:
+                raise Exception("Session is broken")
+            cancel_event = threading.Event()
+
+            async def run():
+                if fresh_page:
+                    await self.call(navigate_to_job_creation, self.driver, cancel_event=cancel_event)
+                return await self.fill_steps(form_data, cancel_event)
+
+            try:
+                return await asyncio.wait_for(run(), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                cancel_event.set()
+                await self.abort_in_flight()
+                raise
+
+    async def abort_in_flight(self):
+        """Give the running call CANCEL_GRACE seconds to stop, then kill the browser"""
+        future = self.in_flight
+        if future is None or future.done():
+            return
+        done, _ = await asyncio.wait({future}, timeout=CANCEL_GRACE)
+        if done:
+            return
+        print("🛑 Job did not stop in time, closing its browser")
+        self.broken = True
+        # Not the bounded pool: its threads may all be stuck in browser calls
+        await asyncio.get_running_loop().run_in_executor(None, self.quit_driver)
+
+    def quit_driver(self):
+        quit_session(self.driver)
+
+    async def close(self):
+        """Quit the session's browser"""
+        self.broken = True
+        await asyncio.get_running_loop().run_in_executor(None, self.quit_driver)
+
+
+class AsyncRunner:
+    """Bounded thread pool shared by all sessions of one event loop"""
+
+    def __init__(self, max_threads=DEFAULT_MAX_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=max_threads, thread_name_prefix="servpro")
+
+    def submit(self, func, *args, cancel_event=None, **kwargs):
+        """Schedule a blocking call with the job's cancel event installed on its thread"""
+        return self.executor.submit(functools.partial(run_with_cancel_event, cancel_event, func, *args, **kwargs))
+
+    async def open_session(self, **account):
+        """Start a browser, log in and open the CreateJob page without blocking the loop"""
+        driver = await asyncio.wrap_future(self.submit(open_job_creation_session, **account))
+        return AsyncSession(self, driver)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def run_jobs_async(payloads, sessions=2, max_threads=DEFAULT_MAX_THREADS, job_timeout=DEFAULT_JOB_TIMEOUT):
+    """
+    Fill a batch of jobs from one event loop across several browser sessions
+
+    Args:
+        payloads: List of form data dicts
+        sessions: Number of concurrent browser sessions
+        max_threads: Size of the thread pool running WebDriver calls
+        job_timeout: Per-job deadline in seconds
+
+    Returns:
+        List of result dicts in payload order (same shape as worker_pool results)
+    """
+    runner = AsyncRunner(max_threads)
+    jobs = asyncio.Queue()
+    for index, payload in enumerate(payloads):
+        jobs.put_nowait((index, payload))
+    results = {}
+
+    async def consume(worker_id):
+        session = None
+        first_job = True
+        try:
+            while not jobs.empty():
+                index, payload = jobs.get_nowait()
+                job_id = get_job_id(payload)
+                started = time.time()
+                result = {'index': index, 'job_id': job_id, 'worker': worker_id, 'report': None, 'error': None}
+                try:
+                    if session is None or session.broken:
+                        session = await runner.open_session()
+                        first_job = True
+                    report = await session.fill_job(payload, timeout=job_timeout, fresh_page=not first_job)
+                    first_job = False
+                    result['report'] = summarize_report(report)
+                    result['status'] = 'failed' if report.get('failed') else 'ok'
+                except asyncio.TimeoutError:
+                    result['status'] = 'error'
+                    result['error'] = f"Job exceeded its {job_timeout}s deadline"
+                except Exception as e:
+                    result['status'] = 'error'
+                    result['error'] = f"{type(e).__name__}: {str(e)}"
+                result['duration'] = time.time() - started
+                results[index] = result
+                print(f"📦 Job {job_id} ({len(results)}/{len(payloads)}): {result['status']} on session {worker_id}")
+        finally:
+            if session is not None:
+                await session.close()
+
+    try:
+        await asyncio.gather(*(consume(worker_id) for worker_id in range(max(1, min(sessions, len(payloads))))))
+    finally:
+        runner.shutdown()
+    return [results[index] for index in range(len(payloads))]
+
+
+def main():
+    """Fill the JSON payload files given on the command line from one event loop"""
+    args = sys.argv[1:]
+    options = {'--sessions': 2, '--timeout': DEFAULT_JOB_TIMEOUT}
+    for option in list(options):
+        if option in args:
+            position = args.index(option)
+            options[option] = int(args[position + 1])
+            del args[position:position + 2]
+    if not args:
+        print(__doc__)
+        return 2
+
+    results = asyncio.run(run_jobs_async(
+        load_payloads(args), sessions=options['--sessions'], job_timeout=options['--timeout']
+    ))
+    print_pool_summary(results)
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Autoscaling of the job service's worker pool
+Every AUTOSCALE_INTERVAL seconds the service asks the Autoscaler how many browser
+workers it should run. The answer is the largest of:
+
+- backlog: queued jobs x per-job latency / TARGET_DRAIN_SECONDS (clear the queue in time)
+- load: arrival rate x per-job latency / UTILIZATION_TARGET (Little's law, keep up)
+- forecast: the same for the arrival rate usually seen PREWARM_LEAD seconds from now
+  (hour-of-day average over the last FORECAST_DAYS), so sessions are warm before a daily peak
+- the minimum pool size, raised to CAT_MIN_FRACTION of the maximum while a catastrophe
+  surge is on (a job with catReference arrived within CAT_HOLD seconds)
+
+bounded by the maximum the host can run (worker_pool.get_pool_size) and by the
+adaptive concurrency limit (concurrency.py): workers beyond the number of jobs the
+server may have in flight would only sit idle. Scaling up is
+immediate; scaling down waits until the lower size has been enough for
+SCALE_DOWN_DELAY seconds and then drains one worker at a time (it exits after its
+current job instead of being killed mid-form).
+"""
+
+import math
+import time
+
+AUTOSCALE_INTERVAL = 30
+
+# Recent window used for arrival rate and per-job latency
+LOAD_WINDOW = 15 * 60
+
+# Per-job latency assumed until jobs have finished in the window
+DEFAULT_JOB_SECONDS = 180
+
+# A backlog should be cleared within this many seconds
+TARGET_DRAIN_SECONDS = 15 * 60
+
+# Share of worker time spent filling at the sized arrival rate (headroom for bursts)
+UTILIZATION_TARGET = 0.8
+
+SCALE_DOWN_DELAY = 10 * 60
+
+FORECAST_DAYS = 7
+FORECAST_REFRESH = 10 * 60
+PREWARM_LEAD = 60 * 60
+
+# Catastrophe surges last days: hold at least this share of the maximum pool
+CAT_MIN_FRACTION = 0.5
+CAT_HOLD = 6 * 60 * 60
+
+
+def workers_for_rate(rate, job_seconds):
+    """Workers needed to keep up with rate jobs/second at UTILIZATION_TARGET"""
+    return math.ceil(rate * job_seconds / UTILIZATION_TARGET)
+
+
+def get_desired_workers(load, forecast_rate, min_workers, max_workers, cat_surge=False):
+    """
+    Pool size for the current load
+
+    Args:
+        load: Dict from JobQueue.load_stats() ('depth', 'arrivals', 'window', 'job_seconds')
+        forecast_rate: Expected arrivals/second PREWARM_LEAD seconds from now
+        min_workers / max_workers: Bounds of the pool
+        cat_surge: True while a catastrophe surge is on
+
+    Returns:
+        Tuple of (worker count, reason)
+    """
+    job_seconds = load['job_seconds'] or DEFAULT_JOB_SECONDS
+    floor = min_workers
+    if cat_surge:
+        floor = max(floor, math.ceil(max_workers * CAT_MIN_FRACTION))
+    candidates = [
+        (floor, "CAT surge" if cat_surge and floor > min_workers else "minimum"),
+        (math.ceil(load['depth'] * job_seconds / TARGET_DRAIN_SECONDS), f"backlog of {load['depth']}"),
+        (workers_for_rate(load['arrivals'] / load['window'], job_seconds),
+         f"{load['arrivals'] * 3600 / load['window']:.0f} jobs/h arriving"),
+        (workers_for_rate(forecast_rate, job_seconds), f"forecast {forecast_rate * 3600:.0f} jobs/h"),
+    ]
+    count, reason = max(candidates, key=lambda candidate: candidate[0])
+    return max(min_workers, min(max_workers, count)), reason
+
+
+def get_forecast_rate(hourly_arrivals, days, at=None):
+    """
+    Expected arrivals/second for the local hour containing `at`
+
+    Args:
+        hourly_arrivals: Dict of local hour (0-23) -> arrivals over the last `days` days
+        days: Number of days the counts cover
+    """
+    hour = time.localtime(at or time.time()).tm_hour
+    return hourly_arrivals.get(hour, 0) / days / 3600
+
+
+class Autoscaler:
+    """Stateful wrapper around get_desired_workers: forecast cache, CAT hold, scale-down delay"""
+
+    def __init__(self, job_queue, min_workers, max_workers, limiter=None):
+        self.queue = job_queue
+        self.limiter = limiter
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.forecast = {}
+        self.forecast_at = 0
+        self.cat_until = 0
+        self.lower_since = None
+        self.reason = "starting"
+
+    def refresh_forecast(self, now):
+        if now - self.forecast_at > FORECAST_REFRESH:
+            self.forecast = self.queue.hourly_arrivals(FORECAST_DAYS)
+            self.forecast_at = now
+
+    def get_target(self, current):
+        """Pool size to run now, given `current` active (non-draining) workers"""
+        now = time.time()
+        load = self.queue.load_stats(LOAD_WINDOW)
+        if load['cat_arrivals']:
+            if now > self.cat_until:
+                print(f"🌪️ Catastrophe surge: {load['cat_arrivals']} CAT job(s) in the last {LOAD_WINDOW // 60} min")
+            self.cat_until = now + CAT_HOLD
+        self.refresh_forecast(now)
+
+        desired, self.reason = get_desired_workers(
+            load, get_forecast_rate(self.forecast, FORECAST_DAYS, now + PREWARM_LEAD),
+            self.min_workers, self.max_workers, cat_surge=now < self.cat_until,
+        )
+        capacity = self.limiter.get_capacity() if self.limiter is not None else None
+        if capacity is not None and desired > max(capacity, self.min_workers):
+            desired = max(capacity, self.min_workers)
+            self.reason = f"concurrency limit {capacity}"
+        if desired >= current:
+            self.lower_since = None
+            return desired
+
+        # Scale down one worker at a time, and only once the smaller pool has been enough for a while
+        if self.lower_since is None:
+            self.lower_since = now
+        if now - self.lower_since < SCALE_DOWN_DELAY:
+            return current
+        self.lower_since = now
+        return current - 1
@@ -0,0 +1,222 @@
+"""
+Isolated browser contexts for multi-account concurrency in one Chrome
+Creates incognito-style browser contexts over CDP (Target.createBrowserContext),
+each with its own cookie jar and its own SERVPRO login, and hands them out to jobs
+by account. One Chrome process then serves several accounts/offices without the
+startup and memory cost of a browser per account.
+
+Accounts are read from accounts.json (not committed):
+    {
+        "default": {"username": "...", "password": "...", "company_id": "..."},
+        "north": {"username": "...", "password": "...", "company_id": "...", "offices": ["SPNC, LLC"]}
+    }
+A payload uses the first account listing its generalInformation.officeName (the
+json.txt enum value; "SPNC" also matches "SPNC, LLC", case-insensitively),
+otherwise "default" (which falls back to the credentials in servpro_login.py).
+
+Usage:
+    python browser_contexts.py job1.json [job2.json ...] [--contexts N]
+"""
+
+import os
+import sys
+import json
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from servpro_login import (
+    USERNAME, PASSWORD, COMPANY_ID, setup_driver, login_to_servpro,
+    dismiss_post_login_popups, navigate_to_job_creation, quit_session
+)
+from office_cache import get_job_office
+from tab_pool import run_tab_jobs, DEFAULT_MAX_TABS
+from worker_pool import load_payloads, print_pool_summary
+
+ACCOUNTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "accounts.json")
+
+# How long to wait for a new target to show up as a WebDriver window handle
+HANDLE_TIMEOUT = 10
+
+
+def load_accounts(path=ACCOUNTS_PATH):
+    """Load account credentials; always contains a 'default' account"""
+    accounts = {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            accounts = json.load(file)
+    except FileNotFoundError:
+        pass
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"⚠️ Could not read {path}: {str(e)}")
+    accounts.setdefault("default", {"username": USERNAME, "password": PASSWORD, "company_id": COMPANY_ID})
+    return accounts
+
+
+def normalize_office(office):
+    """Office code for matching: "SPNC, LLC", "spnc" and "SPNC" all give spnc"""
+    return str(office or "").split(",", 1)[0].strip().lower()
+
+
+def get_payload_account(payload, accounts):
+    """Account name for a payload, chosen by its office"""
+    office = normalize_office(get_job_office(payload))
+    for name, account in accounts.items():
+        if office and office in {normalize_office(o) for o in account.get("offices", [])}:
+            return name
+    return "default"
+
+
+def create_browser_context(driver, url="about:blank"):
+    """
+    Create an isolated browser context with one page in it
+
+    Returns:
+        Dict with 'context_id' and 'handle' (the page's WebDriver window handle)
+    """
+    context_id = driver.execute_cdp_cmd("Target.createBrowserContext", {"disposeOnDetach": False})["browserContextId"]
+    target_id = driver.execute_cdp_cmd("Target.createTarget", {"url": url, "browserContextId": context_id})["targetId"]
+
+    # chromedriver uses the target ID as the window handle once it has attached to it
+    deadline = time.time() + HANDLE_TIMEOUT
+    while target_id not in driver.window_handles:
+        if time.time() > deadline:
+            dispose_browser_context(driver, {"context_id": context_id, "handle": None})
+            raise Exception(f"Browser context page {target_id} never became a window handle")
+        time.sleep(0.1)
+    return {"context_id": context_id, "handle": target_id}
+
+
+def dispose_browser_context(driver, context):
+    """Close a browser context and every page in it"""
+    try:
+        driver.execute_cdp_cmd("Target.disposeBrowserContext", {"browserContextId": context["context_id"]})
+    except Exception as e:
+        print(f"⚠️ Could not dispose browser context {context['context_id']}: {str(e)}")
+
+
+class BrowserContextPool:
+    """
+    Hands out logged-in browser contexts by account
+
+    acquire(account) returns the window handle of an idle context already logged in
+    as that account (creating and logging in a new one if needed), on the CreateJob page.
+    release(handle) puts it back for reuse. At most max_contexts exist at once; idle
+    contexts of other accounts are disposed to make room.
+    """
+
+    def __init__(self, driver, accounts=None, max_contexts=DEFAULT_MAX_TABS):
+        self.driver = driver
+        self.accounts = accounts or load_accounts()
+        self.max_contexts = max_contexts
+        self.home_handle = driver.current_window_handle
+        self.contexts = {}      # handle -> context dict
+        self.idle = []          # handles, least recently released first
+
+    def acquire(self, account):
+        """Return the handle of a context logged in as account, focused and on the CreateJob page"""
+        handle = next((h for h in self.idle if self.contexts[h]["account"] == account), None)
+        if handle is not None:
+            self.idle.remove(handle)
+            self.driver.switch_to.window(handle)
+            if not navigate_to_job_creation(self.driver, allow_new_tab=False):
+                self.discard(handle)
+                return self.acquire(account)
+            return handle
+
+        if len(self.contexts) >= self.max_contexts:
+            if not self.idle:
+                raise Exception(f"All {self.max_contexts} browser contexts are busy")
+            self.discard(self.idle[0])
+        return self.open_context(account)
+
+    def open_context(self, account):
+        """Create a context, log it in as account and open the CreateJob page"""
+        credentials = self.accounts[account]
+        context = create_browser_context(self.driver)
+        context["account"] = account
+        self.contexts[context["handle"]] = context
+        print(f"🔐 New browser context for account '{account}'")
+        try:
+            self.driver.switch_to.window(context["handle"])
+            wait = WebDriverWait(self.driver, 10)
+            if not login_to_servpro(self.driver, wait, credentials["username"], credentials["password"],
+                                    credentials["company_id"]):
+                raise Exception(f"Login failed for account '{account}'")
+            dismiss_post_login_popups(self.driver)
+            if not navigate_to_job_creation(self.driver, allow_new_tab=False):
+                raise Exception(f"Could not reach the Job Creation page for account '{account}'")
+        except Exception:
+            self.discard(context["handle"])
+            raise
+        return context["handle"]
+
+    def release(self, handle):
+        """Return a context to the idle list and focus the home tab"""
+        if handle in self.contexts and handle not in self.idle:
+            self.idle.append(handle)
+        self.driver.switch_to.window(self.home_handle)
+
+    def discard(self, handle):
+        """Dispose a context for good"""
+        context = self.contexts.pop(handle, None)
+        if handle in self.idle:
+            self.idle.remove(handle)
+        if context:
+            dispose_browser_context(self.driver, context)
+        self.driver.switch_to.window(self.home_handle)
+
+    def close(self):
+        """Dispose every context"""
+        for handle in list(self.contexts):
+            self.discard(handle)
+
+
+def run_context_jobs(driver, payloads, accounts=None, max_contexts=DEFAULT_MAX_TABS):
+    """
+    Fill a batch of jobs across isolated per-account browser contexts of one Chrome
+
+    Args:
+        driver: WebDriver (no login needed; each context logs in on its own)
+        payloads: List of form data dicts
+        accounts: Account credentials (see load_accounts)
+        max_contexts: Number of contexts (and concurrently filled jobs)
+
+    Returns:
+        List of result dicts in payload order (see tab_pool.run_tab_jobs)
+    """
+    pool = BrowserContextPool(driver, accounts, max_contexts)
+    try:
+        return run_tab_jobs(
+            driver, payloads, max_tabs=max_contexts,
+            open_tab=lambda payload: pool.acquire(get_payload_account(payload, pool.accounts)),
+            close_tab=pool.release,
+        )
+    finally:
+        pool.close()
+
+
+def main():
+    """Fill the JSON payload files given on the command line in per-account browser contexts"""
+    args = sys.argv[1:]
+    max_contexts = DEFAULT_MAX_TABS
+    if "--contexts" in args:
+        position = args.index("--contexts")
+        max_contexts = int(args[position + 1])
+        del args[position:position + 2]
+    if not args:
+        print(__doc__)
+        return 2
+
+    payloads = load_payloads(args)
+    driver = setup_driver()
+    try:
+        results = run_context_jobs(driver, payloads, max_contexts=max_contexts)
+    finally:
+        quit_session(driver)
+    print_pool_summary(results)
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
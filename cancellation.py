@@ -0,0 +1,57 @@
+"""
+Cooperative cancellation for the blocking fill code
+The async runner (async_runner.py) runs fill functions on worker threads and gives
+each job a threading.Event. pause() replaces time.sleep in the fill path: it sleeps
+as before when no event is installed, and raises JobCancelled as soon as the job's
+event is set, so a cancelled job stops at its next pause instead of finishing the form.
+"""
+
+import time
+import threading
+
+_local = threading.local()
+
+
+class JobCancelled(BaseException):
+    """Raised inside a worker thread when its job was cancelled
+
+    Derives from BaseException so the fillers' broad `except Exception` handlers
+    don't swallow it.
+    """
+
+
+def set_cancel_event(event):
+    """Install the cancel event for jobs run on the current thread (None to remove it)"""
+    _local.cancel_event = event
+
+
+def get_cancel_event():
+    """Cancel event installed on the current thread, or None"""
+    return getattr(_local, 'cancel_event', None)
+
+
+def check_cancelled():
+    """Raise JobCancelled if the current thread's job was cancelled"""
+    event = get_cancel_event()
+    if event is not None and event.is_set():
+        raise JobCancelled()
+
+
+def pause(seconds):
+    """Interruptible time.sleep: returns early with JobCancelled when the job is cancelled"""
+    event = get_cancel_event()
+    if event is None:
+        time.sleep(seconds)
+        return
+    if event.wait(seconds):
+        raise JobCancelled()
+
+
+def run_with_cancel_event(event, func, *args, **kwargs):
+    """Call func on this thread with event installed as its cancel event"""
+    set_cancel_event(event)
+    try:
+        check_cancelled()
+        return func(*args, **kwargs)
+    finally:
+        set_cancel_event(None)
@@ -0,0 +1,264 @@
+"""
+Adaptive concurrency limits for SERVPRO
+Every worker takes a slot for its SERVPRO account and for the SERVPRO host before it
+claims a job, and gives it back when the job is done. The number of slots per key is
+an AIMD limit shared by all workers through the queue database:
+
+- workers record the latency of every postback and CreateJob navigation, and
+  errors (postback timeouts, failed attempts)
+- every ADJUST_INTERVAL seconds the limit of a key is re-evaluated over the last
+  SAMPLE_WINDOW seconds of samples: if p95 latency rose above LATENCY_TOLERANCE x
+  the key's baseline (the lowest p95 seen, slowly forgotten) or the error rate is
+  above MAX_ERROR_RATE, the limit is cut by DECREASE_FACTOR; otherwise, if the
+  limit was reached since the last evaluation, it grows by one. No further cut is
+  made while jobs started before the last one are still in flight.
+
+So the fleet settles on the highest number of in-flight jobs the server handles
+without slowing down, and backs off on its own when it does.
+"""
+
+import time
+from urllib.parse import urlparse
+
+from scheduler import percentile
+
+# Limit of a key before it has been evaluated
+INITIAL_LIMIT = 2
+
+MIN_LIMIT = 1
+MAX_LIMIT = 32
+
+ADJUST_INTERVAL = 60
+
+# Samples older than this are ignored and pruned
+SAMPLE_WINDOW = 5 * 60
+
+# Fewer samples than this in the window leave the limit unchanged
+MIN_SAMPLES = 20
+
+# Back off when p95 latency exceeds the baseline by this factor
+LATENCY_TOLERANCE = 2.0
+
+# Back off when more than this share of samples are errors
+MAX_ERROR_RATE = 0.05
+
+DECREASE_FACTOR = 0.7
+INCREASE_STEP = 1
+
+# The baseline creeps up by this factor per evaluation, so a stale low is forgotten
+BASELINE_DRIFT = 1.02
+
+# A slot of a worker that died without releasing it expires after this many seconds; a
+# running job's slots are renewed with its lease (see renew)
+SLOT_SECONDS = 900
+
+LIMITS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS concurrency_limits (
+    key TEXT PRIMARY KEY,
+    slot_limit REAL NOT NULL,
+    peak INTEGER NOT NULL DEFAULT 0,
+    baseline REAL,
+    p95 REAL,
+    error_rate REAL,
+    reason TEXT,
+    adjusted_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS concurrency_slots (
+    key TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (key, owner)
+);
+CREATE TABLE IF NOT EXISTS latency_samples (
+    key TEXT NOT NULL,
+    at REAL NOT NULL,
+    seconds REAL,
+    error INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS latency_samples_key ON latency_samples (key, at);
+"""
+
+
+def get_limit_keys(account, url):
+    """Limiter keys of a session: its account and the host it talks to"""
+    return [f"account:{account}", f"host:{urlparse(url).hostname}"]
+
+
+class LatencyRecorder:
+    """In-process buffer of latency samples, flushed into the limiter after each job"""
+
+    def __init__(self):
+        self.samples = []
+
+    def observe(self, seconds, error=False):
+        """One round trip (seconds None for an error without a latency)"""
+        self.samples.append((time.time(), seconds, int(error)))
+
+    def observe_event(self, event):
+        """Record a postback_wait progress event"""
+        if event.get('kind') == 'postback_wait':
+            self.observe(event['seconds'], event['timed_out'])
+
+    def drain(self):
+        samples, self.samples = self.samples, []
+        return samples
+
+
+class ConcurrencyLimiter:
+    """
+    AIMD slot limits per key, stored in the job queue's database
+
+    Uses the queue's per-thread connections and BEGIN IMMEDIATE transactions, so
+    any number of worker processes share the same limits.
+    """
+
+    def __init__(self, job_queue):
+        self.queue = job_queue
+        self.queue.connection().executescript(LIMITS_SCHEMA)
+
+    def try_acquire(self, owner, keys, slot_seconds=SLOT_SECONDS):
+        """
+        Take one slot of every key for owner
+
+        Returns:
+            True when every key had a free slot (all taken), False otherwise (none taken)
+        """
+        now = time.time()
+        with self.queue.transaction() as db:
+            db.execute("DELETE FROM concurrency_slots WHERE expires_at < ?", (now,))
+            in_flight = {}
+            for key in keys:
+                db.execute(
+                    "INSERT OR IGNORE INTO concurrency_limits (key, slot_limit, adjusted_at) VALUES (?, ?, ?)",
+                    (key, INITIAL_LIMIT, now),
+                )
+                slot_limit = db.execute(
+                    "SELECT slot_limit FROM concurrency_limits WHERE key = ?", (key,)
+                ).fetchone()[0]
+                in_flight[key] = db.execute(
+                    "SELECT COUNT(*) FROM concurrency_slots WHERE key = ? AND owner != ?", (key, owner)
+                ).fetchone()[0]
+                if in_flight[key] >= int(slot_limit):
+                    return False
+            for key in keys:
+                db.execute(
+                    "INSERT OR REPLACE INTO concurrency_slots (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, owner, now + slot_seconds),
+                )
+                db.execute(
+                    "UPDATE concurrency_limits SET peak = MAX(peak, ?) WHERE key = ?", (in_flight[key] + 1, key)
+                )
+        return True
+
+    def renew(self, owner, slot_seconds=SLOT_SECONDS):
+        """Push out the expiry of owner's slots (its job's lease was just extended); returns the count"""
+        now = time.time()
+        cursor = self.queue.write(
+            "UPDATE concurrency_slots SET expires_at = ? WHERE owner = ?", (now + slot_seconds, owner)
+        )
+        return cursor.rowcount
+
+    def release(self, owner):
+        """Give back every slot held by owner"""
+        with self.queue.transaction() as db:
+            db.execute("DELETE FROM concurrency_slots WHERE owner = ?", (owner,))
+
+    def record(self, keys, samples):
+        """Store latency samples (see LatencyRecorder) under every key"""
+        if not samples:
+            return
+        with self.queue.transaction() as db:
+            db.executemany(
+                "INSERT INTO latency_samples (key, at, seconds, error) VALUES (?, ?, ?, ?)",
+                [(key,) + sample for key in keys for sample in samples],
+            )
+
+    def adjust(self, key):
+        """
+        Re-evaluate the limit of key if ADJUST_INTERVAL has passed
+
+        Returns:
+            The new limit, or None when the limit was not evaluated
+        """
+        now = time.time()
+        with self.queue.transaction() as db:
+            row = db.execute("SELECT * FROM concurrency_limits WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row["adjusted_at"] < ADJUST_INTERVAL:
+                return None
+            db.execute("DELETE FROM latency_samples WHERE key = ? AND at < ?", (key, now - SAMPLE_WINDOW))
+            samples = db.execute("SELECT seconds, error FROM latency_samples WHERE key = ?", (key,)).fetchall()
+            if len(samples) < MIN_SAMPLES:
+                return None
+
+            latencies = sorted(seconds for seconds, _ in samples if seconds is not None)
+            p95 = percentile(latencies, 95)
+            error_rate = sum(error for _, error in samples) / len(samples)
+            baseline = row["baseline"]
+            if p95 is not None:
+                baseline = p95 if baseline is None else min(baseline * BASELINE_DRIFT, p95)
+
+            in_flight = db.execute("SELECT COUNT(*) FROM concurrency_slots WHERE key = ?", (key,)).fetchone()[0]
+            slot_limit = row["slot_limit"]
+            if in_flight > int(slot_limit):
+                # Jobs started before the last cut are still running: judge the cut once they are done
+                reason = f"{in_flight} in flight above the limit"
+                db.execute("DELETE FROM latency_samples WHERE key = ?", (key,))
+            elif error_rate > MAX_ERROR_RATE:
+                slot_limit = max(MIN_LIMIT, slot_limit * DECREASE_FACTOR)
+                reason = f"error rate {error_rate:.0%}"
+            elif p95 is not None and p95 > baseline * LATENCY_TOLERANCE:
+                slot_limit = max(MIN_LIMIT, slot_limit * DECREASE_FACTOR)
+                reason = f"p95 {p95:.2f}s vs baseline {baseline:.2f}s"
+            elif row["peak"] >= int(slot_limit):
+                slot_limit = min(MAX_LIMIT, slot_limit + INCREASE_STEP)
+                reason = "limit reached, latency steady"
+            else:
+                reason = "limit not reached"
+
+            if slot_limit < row["slot_limit"]:
+                # Judge the lower limit on its own samples only
+                db.execute("DELETE FROM latency_samples WHERE key = ?", (key,))
+            db.execute(
+                "UPDATE concurrency_limits SET slot_limit = ?, peak = ?, baseline = ?, p95 = ?, error_rate = ?, "
+                "reason = ?, adjusted_at = ? WHERE key = ?",
+                (slot_limit, in_flight, baseline, p95, error_rate, reason, now, key),
+            )
+        if int(slot_limit) != int(row["slot_limit"]):
+            arrow = "📈" if slot_limit > row["slot_limit"] else "📉"
+            print(f"{arrow} Concurrency limit {key}: {int(row['slot_limit'])} -> {int(slot_limit)} ({reason})")
+        return slot_limit
+
+    def get_capacity(self):
+        """Smallest whole limit over all keys (None before any key exists)"""
+        value = self.queue.connection().execute("SELECT MIN(slot_limit) FROM concurrency_limits").fetchone()[0]
+        return int(value) if value is not None else None
+
+    def get_limits(self):
+        """Current limit, in-flight slots and last evaluation of every key"""
+        db = self.queue.connection()
+        limits = {}
+        for row in db.execute("SELECT * FROM concurrency_limits ORDER BY key").fetchall():
+            in_flight = db.execute(
+                "SELECT COUNT(*) FROM concurrency_slots WHERE key = ? AND expires_at >= ?", (row["key"], time.time())
+            ).fetchone()[0]
+            limits[row["key"]] = {
+                'limit': int(row["slot_limit"]),
+                'in_flight': in_flight,
+                'p95': row["p95"],
+                'baseline': row["baseline"],
+                'error_rate': row["error_rate"],
+                'reason': row["reason"],
+            }
+        return limits
+
+
+def print_limits(limits):
+    """Print the concurrency limits returned by ConcurrencyLimiter.get_limits"""
+    if not limits:
+        print("🚦 No concurrency limits yet")
+        return
+    print("🚦 Concurrency limits:")
+    for key, stats in limits.items():
+        latency = f"p95 {stats['p95']:.2f}s (baseline {stats['baseline']:.2f}s)" if stats['p95'] is not None else "no samples"
+        print(f"  {key:<32} {stats['in_flight']}/{stats['limit']} in flight, {latency}, "
+              f"last: {stats['reason'] or 'not evaluated'}")
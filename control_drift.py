@@ -0,0 +1,225 @@
+"""
+Live control-inventory drift detection for the SERVPRO job creation form
+Takes one snapshot of the live page's Telerik controls per browser session and
+diffs it against the cached control index (control_index.py). Registry mappings
+whose control disappeared or changed type are quarantined - skipped by the plan
+runner and the verifier - instead of timing out one field at a time on every job.
+"""
+
+import time
+
+from field_mappings import PREFIX, FIELD_REGISTRY
+from control_index import get_control_index, get_indexed_control_id, TYPE, SECTION
+
+# "quarantine" skips stale fields, "flag" only reports them
+DRIFT_POLICY = "quarantine"
+
+# Refuse to fill at all when this share of the mapped fields is stale
+MAX_STALE_RATIO = 0.25
+
+# Control types that register a client component with Sys.Application
+TELERIK_TYPES = (
+    "RadComboBox", "RadDropDownTree", "RadSearchBox", "RadListBox", "RadButton",
+    "RadDatePicker", "RadTextBox", "RadMaskedTextBox",
+)
+
+# One snapshot: arguments[0] is a list of plain element IDs to probe for existence
+INVENTORY_SCRIPT = """
+var probe = arguments[0];
+var out = {components: null, elements: {}};
+try {
+    if (typeof Sys !== 'undefined' && Sys.Application) {
+        out.components = {};
+        var components = Sys.Application.getComponents();
+        for (var i = 0; i < components.length; i++) {
+            var c = components[i];
+            var id = c.get_id ? c.get_id() : c.id;
+            if (!id) { continue; }
+            out.components[id] = Object.getType(c).getName().split('.').pop();
+        }
+    }
+} catch (e) {
+    out.error = String(e);
+}
+for (var j = 0; j < probe.length; j++) {
+    out.elements[probe[j]] = !!document.getElementById(probe[j]);
+}
+return out;
+"""
+
+_session_reports = {}
+
+
+def load_index_or_none():
+    """Cached control index, or None when the saved page source is not available"""
+    try:
+        return get_control_index()
+    except OSError as e:
+        print(f"⚠️ No control index available, checking the registry only: {str(e)}")
+        return None
+
+
+def get_expected_controls(index, registry=FIELD_REGISTRY):
+    """
+    Controls the live page is expected to have
+
+    Returns:
+        Dict of control_id -> type: every form control in the index plus every registry control
+    """
+    expected = {}
+    if index is not None:
+        for control_id, row in index["controls"].items():
+            if row[SECTION] is not None:
+                expected[control_id] = row[TYPE]
+    for entries in registry.values():
+        for entry in entries:
+            control_id = get_indexed_control_id(entry["control_id"], entry["control"])
+            expected.setdefault(control_id, entry["control"])
+    return expected
+
+
+def take_inventory_snapshot(driver, expected):
+    """Read the live Telerik component inventory and probe plain controls in one script call"""
+    probe = [control_id for control_id, control in expected.items() if control not in TELERIK_TYPES]
+    snapshot = driver.execute_script(INVENTORY_SCRIPT, probe) or {}
+    snapshot['taken_at'] = time.time()
+    return snapshot
+
+
+def diff_inventory(expected, snapshot):
+    """
+    Diff the expected controls against a live snapshot
+
+    Returns:
+        Dict with 'missing' [ids], 'retyped' {id: (expected, live)} and 'added' {id: live type}
+    """
+    components = snapshot.get('components')
+    elements = snapshot.get('elements') or {}
+    diff = {'missing': [], 'retyped': {}, 'added': {}}
+
+    for control_id, control in expected.items():
+        if control in TELERIK_TYPES:
+            if components is None:
+                continue
+            live = components.get(control_id)
+            if live is None:
+                diff['missing'].append(control_id)
+            elif live != control:
+                diff['retyped'][control_id] = (control, live)
+        elif not elements.get(control_id, True):
+            diff['missing'].append(control_id)
+
+    for control_id, live in (components or {}).items():
+        if control_id.startswith(PREFIX) and live in TELERIK_TYPES and control_id not in expected:
+            diff['added'][control_id] = live
+    return diff
+
+
+def find_stale_mappings(diff, registry=FIELD_REGISTRY):
+    """
+    Registry fields whose control is missing or retyped on the live page
+
+    Returns:
+        Dict of "section.field" -> reason
+    """
+    missing = set(diff['missing'])
+    stale = {}
+    for section, entries in registry.items():
+        for entry in entries:
+            control_id = get_indexed_control_id(entry["control_id"], entry["control"])
+            if control_id in missing:
+                stale[f"{section}.{entry['field']}"] = f"missing: {control_id}"
+            elif control_id in diff['retyped']:
+                indexed, live = diff['retyped'][control_id]
+                stale[f"{section}.{entry['field']}"] = f"type changed {indexed} -> {live}: {control_id}"
+
+    # Fields that depend on a stale field cannot be filled either
+    changed = True
+    while changed:
+        changed = False
+        for section, entries in registry.items():
+            for entry in entries:
+                key = f"{section}.{entry['field']}"
+                blocker = next((dep for dep in entry["depends_on"] if dep in stale), None)
+                if key not in stale and blocker:
+                    stale[key] = f"depends on stale {blocker}"
+                    changed = True
+    return stale
+
+
+def print_drift_report(report):
+    """Print a compact drift summary for one session"""
+    diff = report['diff']
+    if report['unavailable']:
+        print("⚠️ Control drift: Telerik inventory unavailable (Sys.Application not loaded), only plain controls checked")
+    print(f"🧭 Control drift: {len(diff['missing'])} missing, {len(diff['retyped'])} retyped, "
+          f"{len(diff['added'])} new control(s)")
+    for key, reason in report['stale'].items():
+        marker = "🚧 quarantined" if key in report['quarantined'] else "⚠️ stale"
+        print(f"  {marker} {key}: {reason}")
+    for control_id, live in diff['added'].items():
+        print(f"  ➕ {live} {control_id[len(PREFIX):]}")
+
+
+def check_control_drift(driver, policy=DRIFT_POLICY, force=False):
+    """
+    Snapshot the live form once per browser session and quarantine stale mappings
+
+    Call on the CreateJob page before filling. Later calls for the same session
+    return the stored report without touching the browser.
+
+    Args:
+        driver: Selenium WebDriver instance on the CreateJob page
+        policy: "quarantine" to skip stale fields, "flag" to only report them
+        force: Take a new snapshot even if this session was already checked
+
+    Returns:
+        Drift report: {'session_id', 'taken_at', 'unavailable', 'diff', 'stale', 'quarantined', 'refused'}
+
+    Raises:
+        Exception on every call for a session whose stale share is above MAX_STALE_RATIO
+    """
+    session_id = getattr(driver, 'session_id', None)
+    if not force and session_id in _session_reports:
+        return raise_if_refused(_session_reports[session_id])
+
+    index = load_index_or_none()
+    expected = get_expected_controls(index)
+    snapshot = take_inventory_snapshot(driver, expected)
+    diff = diff_inventory(expected, snapshot)
+    stale = find_stale_mappings(diff)
+
+    report = {
+        'session_id': session_id,
+        'taken_at': snapshot['taken_at'],
+        'unavailable': snapshot.get('components') is None,
+        'diff': diff,
+        'stale': stale,
+        'quarantined': set(stale) if policy == "quarantine" else set(),
+        'refused': None,
+    }
+    mapped = sum(len(entries) for entries in FIELD_REGISTRY.values())
+    if mapped and len(stale) / mapped > MAX_STALE_RATIO:
+        report['refused'] = (f"Control drift: {len(stale)} of {mapped} mapped fields are stale - "
+                             f"CreateJob.aspx changed, refresh form-source-code.txt and field_mappings.py")
+    _session_reports[session_id] = report
+    print_drift_report(report)
+    return raise_if_refused(report)
+
+
+def raise_if_refused(report):
+    """Return the drift report, or raise if its session has too many stale fields to fill"""
+    if report['refused']:
+        raise Exception(report['refused'])
+    return report
+
+
+def get_quarantined_fields(driver):
+    """Set of "section.field" keys quarantined for this driver's session (empty if never checked)"""
+    report = _session_reports.get(getattr(driver, 'session_id', None))
+    return report['quarantined'] if report else set()
+
+
+def forget_session(driver):
+    """Drop the stored drift report for a session (e.g. when its browser is closed)"""
+    _session_reports.pop(getattr(driver, 'session_id', None), None)
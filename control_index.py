@@ -0,0 +1,360 @@
+"""
+Control index for the SERVPRO job creation form
+Stream-parses the saved page source (form-source-code.txt) into a compact index of
+every control: client ID, Telerik/ASP.NET control type, form section, whether it
+posts back and its ClientState field. The index is cached on disk keyed by a hash
+of the page source, so mapping validation and the plan compiler don't re-parse
+the half-megabyte dump on every run.
+
+Usage:
+    python control_index.py [form-source-code.txt] [--unmapped]
+"""
+
+import os
+import re
+import sys
+import json
+import mmap
+import codecs
+import hashlib
+from html.parser import HTMLParser
+
+from field_mappings import PREFIX, FIELD_REGISTRY
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(BASE_DIR, "form-source-code.txt")
+CACHE_DIR = os.path.join(BASE_DIR, ".form_cache")
+
+# Bump when the parse rules or index layout change so stale cache files are ignored
+INDEX_VERSION = 1
+
+PARSE_CHUNK_SIZE = 64 * 1024
+
+# Positions inside an index row: controls[control_id] = [type, section, postback, client_state_id]
+TYPE, SECTION, POSTBACK, CLIENT_STATE = range(4)
+
+# Element IDs (without PREFIX) that open a form section, in page order
+SECTION_MARKERS = {
+    "GenaralInfo_LabelGenaralInfo": "generalInformation",
+    "RadioButton_IndividualCustomer": "customerInformation",
+    "CustomerInformationLabel": "customerInformation",
+    "customerConpamyLabel": "customerInformation",
+    "jobAddressLabel": "jobAddressInformation",
+    "companyJobAddressLabel": "jobAddressInformation",
+    "LabelInternalParticipants": "internalParticipants",
+    "InsuranceInformationLabel": "externalParticipants",
+    "PolicyInformationLabel": "policyInformation",
+    "Required_ServicesLabel": "division",
+    "PaymentServicesLabel": "paymentServices",
+    "Loss_DescriptionLabel": "lossDescriptionSection",
+    "UpdatePanel_Error": "formActions",
+    # Add contact/company/job-grid modal popups are not part of the job form
+    "UpdatePanel_ModalPopup_Contact": None,
+}
+
+# Telerik wrapper CSS class -> control type
+TELERIK_CLASSES = {
+    "RadComboBox": "RadComboBox",
+    "RadDropDownTree": "RadDropDownTree",
+    "RadSearchBox": "RadSearchBox",
+    "RadListBox": "RadListBox",
+    "RadButton": "RadButton",
+}
+
+# Registry control IDs point at the inner input; the index keys on the control itself
+INPUT_SUFFIXES = {
+    "RadComboBox": "_Input",
+    "RadSearchBox": "_Input",
+    "RadDatePicker": "_dateInput",
+}
+
+POSTBACK_PATTERN = re.compile(r"__doPostBack|WebForm_DoPostBack")
+
+_index_memo = {}
+
+
+class ControlIndexParser(HTMLParser):
+    """Incremental parser that collects controls as the page source is fed in"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.section = None
+        self.controls = {}
+        self.tables = set()
+
+    def add_control(self, control_id, control_type, postback=False):
+        if control_id not in self.controls:
+            self.controls[control_id] = [control_type, self.section, postback, ""]
+        elif postback:
+            self.controls[control_id][POSTBACK] = True
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        element_id = attrs.get("id")
+        if not element_id:
+            return
+
+        marker = element_id[len(PREFIX):] if element_id.startswith(PREFIX) else element_id
+        if marker in SECTION_MARKERS:
+            self.section = SECTION_MARKERS[marker]
+
+        classes = (attrs.get("class") or "").split()
+        input_type = (attrs.get("type") or "").lower()
+        handlers = (attrs.get("onclick") or "") + (attrs.get("onchange") or "")
+        # Cascading participant combos reload their children when changed
+        postback = bool(POSTBACK_PATTERN.search(handlers)) or "data-childcontrolid" in attrs
+
+        if tag == "input" and input_type == "hidden":
+            if element_id.endswith("_ClientState"):
+                self.handle_client_state(element_id, attrs.get("value") or "")
+            return
+
+        for css_class, control_type in TELERIK_CLASSES.items():
+            if css_class in classes:
+                self.add_control(element_id, control_type, postback)
+                return
+
+        if element_id.endswith("_wrapper"):
+            base_id = element_id[:-len("_wrapper")]
+            if "RadPicker" in classes:
+                self.add_control(base_id, "RadDatePicker", postback)
+            elif "RadInput" in classes and not base_id.endswith("_dateInput"):
+                # Refined to RadMaskedTextBox once its ClientState is seen
+                self.add_control(base_id, "RadTextBox", postback)
+            return
+
+        if tag == "table":
+            self.tables.add(element_id)
+        elif tag == "select":
+            self.add_control(element_id, "DropDownList", postback)
+        elif tag == "input" and input_type == "checkbox":
+            match = re.match(r"^(.*)_\d+$", element_id)
+            if match and match.group(1) in self.tables:
+                self.add_control(match.group(1), "CheckBoxList", postback)
+            else:
+                self.add_control(element_id, "CheckBox", postback)
+        elif tag == "input" and input_type == "radio":
+            self.add_control(element_id, "RadioButton", postback)
+        elif tag == "input" and input_type in ("submit", "button", "image"):
+            self.add_control(element_id, "Button", postback)
+        elif tag == "textarea" or (tag == "input" and input_type in ("", "text")):
+            if not self.is_inner_input(element_id):
+                self.add_control(element_id, "TextBox", postback)
+
+    def handle_client_state(self, element_id, value):
+        base_id = element_id[:-len("_ClientState")]
+        row = self.controls.get(base_id)
+        if row is None:
+            return
+        row[CLIENT_STATE] = element_id
+        if row[TYPE] == "RadTextBox" and "valueWithPromptAndLiterals" in value:
+            row[TYPE] = "RadMaskedTextBox"
+
+    def is_inner_input(self, element_id):
+        """True for the input elements Telerik renders inside an already indexed control"""
+        if element_id in self.controls:
+            return True
+        for suffix in ("_Input", "_dateInput"):
+            if element_id.endswith(suffix) and element_id[:-len(suffix)] in self.controls:
+                return True
+        return element_id.endswith("_dateInput")
+
+
+def build_control_index(source_path=SOURCE_PATH):
+    """
+    Parse a saved page source into a control index
+
+    The file is memory-mapped and read once: the same pass hashes it and
+    feeds the parser in chunks.
+
+    Returns:
+        Index dict: {'version', 'source_hash', 'controls': {control_id: [type, section, postback, client_state_id]}}
+    """
+    parser = ControlIndexParser()
+    digest = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    with open(source_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for start in range(0, len(data), PARSE_CHUNK_SIZE):
+            chunk = data[start:start + PARSE_CHUNK_SIZE]
+            digest.update(chunk)
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+
+    return {
+        "version": INDEX_VERSION,
+        "source_hash": digest.hexdigest()[:16],
+        "controls": parser.controls,
+    }
+
+
+def hash_source(source_path=SOURCE_PATH):
+    """Content hash of a page source, read through a memory map"""
+    with open(source_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return hashlib.sha256(data).hexdigest()[:16]
+
+
+def get_index_cache_path(source_hash):
+    """Cache file for a control index"""
+    return os.path.join(CACHE_DIR, f"control_index_{source_hash}.json")
+
+
+def load_cached_index(path):
+    """Load a control index from disk, or None if missing/unreadable/stale"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if index.get("version") != INDEX_VERSION:
+        return None
+    return index
+
+
+def save_cached_index(path, index):
+    """Atomically write a control index to disk"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(index, file, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def get_control_index(source_path=SOURCE_PATH):
+    """
+    Return the control index for a page source
+
+    Indexes are memoized per process (keyed by file size and mtime) and cached
+    on disk keyed by the content hash, so an unchanged dump is never re-parsed.
+    """
+    stat = os.stat(source_path)
+    memo_key = (os.path.abspath(source_path), stat.st_size, stat.st_mtime_ns)
+    if memo_key in _index_memo:
+        return _index_memo[memo_key]
+
+    cache_path = get_index_cache_path(hash_source(source_path))
+    index = load_cached_index(cache_path)
+    if index is None:
+        index = build_control_index(source_path)
+        try:
+            save_cached_index(cache_path, index)
+        except OSError as e:
+            print(f"⚠️ Could not cache control index: {str(e)}")
+
+    _index_memo[memo_key] = index
+    return index
+
+
+def get_indexed_control_id(control_id, control):
+    """Map a registry control ID (inner input) to the ID the index uses"""
+    suffix = INPUT_SUFFIXES.get(control)
+    if suffix and control_id.endswith(suffix):
+        return control_id[:-len(suffix)]
+    return control_id
+
+
+def lookup_control(index, control_id, control):
+    """Index row for a registry control, or None if the page has no such control"""
+    return index["controls"].get(get_indexed_control_id(control_id, control))
+
+
+def validate_mappings(index, registry=FIELD_REGISTRY):
+    """
+    Check every registry entry against the control index
+
+    Returns:
+        List of problem dicts: {'key', 'control_id', 'problem', 'expected', 'actual'}
+        where problem is 'missing', 'type' or 'section'
+    """
+    problems = []
+    for section, entries in registry.items():
+        for entry in entries:
+            key = f"{section}.{entry['field']}"
+            row = lookup_control(index, entry["control_id"], entry["control"])
+            if row is None:
+                problems.append({'key': key, 'control_id': entry["control_id"], 'problem': 'missing',
+                                 'expected': entry["control"], 'actual': None})
+                continue
+            if row[TYPE] != entry["control"]:
+                problems.append({'key': key, 'control_id': entry["control_id"], 'problem': 'type',
+                                 'expected': entry["control"], 'actual': row[TYPE]})
+            if row[SECTION] != section:
+                problems.append({'key': key, 'control_id': entry["control_id"], 'problem': 'section',
+                                 'expected': section, 'actual': row[SECTION]})
+    return problems
+
+
+def get_unmapped_controls(index, registry=FIELD_REGISTRY, section=None):
+    """
+    Indexed input controls no registry entry points at
+
+    Returns:
+        List of (control_id, type, section) tuples in page order
+    """
+    mapped = {
+        get_indexed_control_id(entry["control_id"], entry["control"])
+        for entries in registry.values() for entry in entries
+    }
+    return [
+        (control_id, row[TYPE], row[SECTION])
+        for control_id, row in index["controls"].items()
+        if control_id not in mapped
+        and row[SECTION] is not None
+        and row[TYPE] not in ("Button", "RadButton")
+        and (section is None or row[SECTION] == section)
+    ]
+
+
+def print_index_summary(index):
+    """Print control counts per section and type"""
+    controls = index["controls"]
+    print(f"📇 Control index {index['source_hash']}: {len(controls)} controls")
+    counts = {}
+    for row in controls.values():
+        counts.setdefault(row[SECTION] or "(outside form)", {}).setdefault(row[TYPE], 0)
+        counts[row[SECTION] or "(outside form)"][row[TYPE]] += 1
+    for section, types in counts.items():
+        summary = ", ".join(f"{control_type}={count}" for control_type, count in sorted(types.items()))
+        print(f"  {section}: {summary}")
+
+
+def print_validation_report(problems):
+    """Print registry/page mismatches"""
+    if not problems:
+        print("✅ All field mappings match the page source")
+        return
+    print(f"❌ {len(problems)} field mapping problem(s):")
+    for problem in problems:
+        print(f"  {problem['key']}: {problem['problem']} (expected {problem['expected']!r}, "
+              f"got {problem['actual']!r}) -> {problem['control_id']}")
+
+
+def print_unmapped_controls(unmapped):
+    """Print registry stubs for unmapped controls, ready to paste into field_mappings.py"""
+    current_section = None
+    for control_id, control_type, section in unmapped:
+        if section != current_section:
+            current_section = section
+            print(f"    # {section}")
+        suffix = INPUT_SUFFIXES.get(control_type, "")
+        print(f'    field("?", "{control_id[len(PREFIX):] if control_id.startswith(PREFIX) else control_id}{suffix}", '
+              f'"{control_type}"),')
+
+
+def main():
+    """Index the page source, validate the registry against it and report"""
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    source_path = args[0] if args else SOURCE_PATH
+
+    index = get_control_index(source_path)
+    print_index_summary(index)
+    problems = validate_mappings(index)
+    print_validation_report(problems)
+    if "--unmapped" in sys.argv:
+        print_unmapped_controls(get_unmapped_controls(index))
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
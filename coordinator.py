@@ -0,0 +1,466 @@
+"""
+Multi-node coordinator for the durable job queue
+One coordinator process owns the queue database (jobs.db) and serves it over TCP to
+worker nodes on any number of hosts; nodes never touch the database file.
+
+- Protocol: one JSON object per line each way, {"op": ...} -> {"ok": true, ...}
+  (or {"ok": false, "error": ...}).
+- A node sends a heartbeat every HEARTBEAT_INTERVAL seconds, which also extends the
+  leases of the jobs its workers hold and renews their concurrency slots. A node silent for NODE_TIMEOUT seconds is
+  declared dead: its jobs become visible to the other nodes right away and its
+  concurrency slots are freed. Job leases remain the backstop if the coordinator
+  itself restarts.
+- The adaptive concurrency limits (concurrency.py) are kept by the coordinator, so
+  they hold for the whole fleet. Job starts per account are also rate limited
+  (ACCOUNT_RATE per minute, bursts of ACCOUNT_BURST).
+
+Usage:
+    python coordinator.py serve [--port 7700] [--rate JOBS_PER_MINUTE] [--queue jobs.db]
+    python coordinator.py node [--connect HOST:PORT] [--workers N]
+    python coordinator.py enqueue [--connect HOST:PORT] job1.json [job2.json ...]
+    python coordinator.py status [--connect HOST:PORT]
+
+Several nodes may run on one machine (each with its own worker processes), so the
+whole fleet can be run and tested locally.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import threading
+import socketserver
+
+from job_queue import JobQueue, QUEUE_PATH, queue_worker_main, get_worker_owner, STATUSES
+from concurrency import ConcurrencyLimiter, print_limits
+
+DEFAULT_ADDRESS = "127.0.0.1:7700"
+
+HEARTBEAT_INTERVAL = 5
+
+# A node without a heartbeat for this many seconds is dead
+NODE_TIMEOUT = 20
+
+# Job starts per account per minute, fleet-wide, and the burst allowed on top
+ACCOUNT_RATE = 30
+ACCOUNT_BURST = 5
+
+# Client side: attempts and delay when the coordinator connection drops
+RECONNECT_ATTEMPTS = 5
+RECONNECT_DELAY = 2
+
+# Pause before a node restarts a worker that crashed soon after the previous one
+RESPAWN_DELAY = 30
+
+
+class CoordinatorError(Exception):
+    """The coordinator rejected a request"""
+
+
+def parse_address(address):
+    """(host, port) from 'HOST:PORT'"""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def get_node_id():
+    """Node name (unique across hosts and restarts)"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Coordinator:
+    """Queue, concurrency limits, node liveness and per-account rate limits of the fleet"""
+
+    def __init__(self, queue_path=QUEUE_PATH, rate=ACCOUNT_RATE):
+        self.queue = JobQueue(queue_path)
+        self.limiter = ConcurrencyLimiter(self.queue)
+        self.rate = rate
+        self.nodes = {}         # node id -> {'workers', 'last_seen', 'owners'}
+        self.owner_keys = {}    # owner -> limiter keys of its last acquire
+        self.buckets = {}       # account key -> [tokens, refilled_at]
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def handle(self, request):
+        """Run one request; returns the response fields"""
+        handler = getattr(self, f"op_{request.pop('op', '')}", None)
+        if handler is None:
+            raise CoordinatorError("Unknown op")
+        return handler(**request) or {}
+
+    def op_hello(self, node, workers=0):
+        with self.lock:
+            known = self.nodes.setdefault(node, {'owners': set()})
+            known.update(workers=workers, last_seen=time.time())
+        print(f"🤝 Node {node} joined with {workers} worker(s)")
+        return {'heartbeat_interval': HEARTBEAT_INTERVAL}
+
+    def op_heartbeat(self, node):
+        """Keep the node alive and extend its workers' leases"""
+        with self.lock:
+            known = self.nodes.get(node)
+            if known is None:
+                return {'known': False}
+            known['last_seen'] = time.time()
+            owners = list(known['owners'])
+        for owner in owners:
+            self.queue.extend_owner(owner)
+            self.limiter.renew(owner)
+        return {'known': True}
+
+    def op_leave(self, node):
+        self.drop_node(node, "left")
+
+    def op_acquire(self, owner, keys):
+        with self.lock:
+            self.owner_keys[owner] = keys
+        return {'acquired': self.limiter.try_acquire(owner, keys)}
+
+    def op_claim(self, owner, node=None, office=None):
+        """Lease the next job for owner (None while the account's start rate is used up)"""
+        with self.lock:
+            if node in self.nodes:
+                self.nodes[node]['owners'].add(owner)
+            accounts = [key for key in self.owner_keys.get(owner, ()) if key.startswith("account:")]
+            if not all(self.has_token(key) for key in accounts):
+                return {'job': None}
+            # Take the start tokens before claiming, so concurrent claims cannot spend the same one
+            for key in accounts:
+                self.buckets[key][0] -= 1
+        job = None
+        try:
+            # A worker holds one job at a time: a lease it still has is from a lost response
+            self.queue.release_owner(owner)
+            job = self.queue.claim(owner, office=office)
+        finally:
+            if job is None:
+                with self.lock:
+                    for key in accounts:
+                        self.buckets[key][0] = min(ACCOUNT_BURST, self.buckets[key][0] + 1)
+        return {'job': job}
+
+    def op_claim_save(self, owner, job_id):
+        return {'won': self.queue.claim_save(job_id, owner)}
+
+    def op_extend_lease(self, owner, job_id):
+        extended = self.queue.extend_lease(job_id, owner)
+        if extended:
+            self.limiter.renew(owner)
+        return {'extended': extended}
+
+    def op_complete(self, owner, job_id, result):
+        return {'completed': self.queue.complete(job_id, owner, result)}
+
+    def op_fail(self, owner, job_id, error, result=None):
+        return {'status': self.queue.fail(job_id, owner, error, result)}
+
+    def op_release(self, owner, dead=False):
+        """Free owner's concurrency slots (and its jobs when the worker is dead)"""
+        self.limiter.release(owner)
+        if dead:
+            with self.lock:
+                for known in self.nodes.values():
+                    known['owners'].discard(owner)
+            return {'released': self.queue.release_owner(owner)}
+
+    def op_record(self, keys, samples):
+        self.limiter.record(keys, [tuple(sample) for sample in samples])
+
+    def op_adjust(self, key):
+        return {'limit': self.limiter.adjust(key)}
+
+    def op_enqueue(self, payloads, idempotency_keys=None):
+        added = self.queue.enqueue_many(payloads, idempotency_keys)
+        return {'jobs': [dict(job, created=created) for job, created in added]}
+
+    def op_status(self):
+        now = time.time()
+        with self.lock:
+            nodes = {node: {'workers': known['workers'], 'owners': len(known['owners']),
+                            'last_seen': now - known['last_seen']} for node, known in self.nodes.items()}
+        return {'jobs': self.queue.counts(), 'nodes': nodes, 'limits': self.limiter.get_limits()}
+
+    def has_token(self, key):
+        """Refill the account's start bucket; True when a job may start now (lock held)"""
+        now = time.time()
+        tokens, refilled_at = self.buckets.get(key, (ACCOUNT_BURST, now))
+        tokens = min(ACCOUNT_BURST, tokens + (now - refilled_at) * self.rate / 60)
+        self.buckets[key] = [tokens, now]
+        return tokens >= 1
+
+    def drop_node(self, node, why):
+        """Forget a node; release its workers' jobs and slots"""
+        with self.lock:
+            known = self.nodes.pop(node, None)
+        if known is None:
+            return
+        released = 0
+        for owner in known['owners']:
+            released += self.queue.release_owner(owner)
+            self.limiter.release(owner)
+            with self.lock:
+                self.owner_keys.pop(owner, None)
+        print(f"{'👋' if why == 'left' else '💀'} Node {node} {why}, released {released} job(s)")
+
+    def reap(self):
+        """Reaper thread: drop nodes that stopped sending heartbeats"""
+        while not self.stopping.wait(1):
+            now = time.time()
+            with self.lock:
+                silent = [node for node, known in self.nodes.items() if now - known['last_seen'] > NODE_TIMEOUT]
+            for node in silent:
+                self.drop_node(node, f"missed heartbeats for {NODE_TIMEOUT}s")
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+    """One client connection: a request per line, a response per line"""
+
+    def handle(self):
+        coordinator = self.server.coordinator
+        for line in self.rfile:
+            try:
+                response = dict(coordinator.handle(json.loads(line)), ok=True)
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {str(e)}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+
+    def finish(self):
+        super().finish()
+        self.server.coordinator.queue.close()
+
+
+class CoordinatorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, coordinator):
+        super().__init__(address, CoordinatorHandler)
+        self.coordinator = coordinator
+
+
+class CoordinatorClient:
+    """Line-JSON connection to the coordinator; reconnects when the connection drops"""
+
+    def __init__(self, address=DEFAULT_ADDRESS):
+        self.address = parse_address(address)
+        self.sock = None
+        self.file = None
+
+    def connect(self):
+        self.sock = socket.create_connection(self.address, timeout=60)
+        self.file = self.sock.makefile("rwb")
+
+    def close(self):
+        if self.sock is not None:
+            try:
+                self.file.close()
+                self.sock.close()
+            except OSError:
+                pass
+        self.sock = self.file = None
+
+    def call(self, op, **fields):
+        """Send one request and return the response fields"""
+        request = (json.dumps(dict(fields, op=op)) + "\n").encode()
+        for attempt in range(RECONNECT_ATTEMPTS):
+            try:
+                if self.file is None:
+                    self.connect()
+                self.file.write(request)
+                self.file.flush()
+                line = self.file.readline()
+                if not line:
+                    raise ConnectionError("Coordinator closed the connection")
+                break
+            except OSError as e:
+                self.close()
+                print(f"⚠️ Coordinator unreachable ({type(e).__name__}: {str(e)}), attempt {attempt + 1}")
+                time.sleep(RECONNECT_DELAY)
+        else:
+            raise ConnectionError(f"Coordinator {self.address[0]}:{self.address[1]} unreachable")
+        response = json.loads(line)
+        if not response.pop('ok'):
+            raise CoordinatorError(response['error'])
+        return response
+
+
+class RemoteQueue:
+    """The part of JobQueue a queue worker uses, served by the coordinator"""
+
+    def __init__(self, address, node=None):
+        self.client = CoordinatorClient(address)
+        self.node = node
+
+    def claim(self, owner, office=None):
+        return self.client.call('claim', owner=owner, node=self.node, office=office)['job']
+
+    def claim_save(self, job_id, owner):
+        return self.client.call('claim_save', owner=owner, job_id=job_id)['won']
+
+    def extend_lease(self, job_id, owner):
+        return self.client.call('extend_lease', owner=owner, job_id=job_id)['extended']
+
+    def complete(self, job_id, owner, result):
+        return self.client.call('complete', owner=owner, job_id=job_id, result=result)['completed']
+
+    def fail(self, job_id, owner, error, result=None):
+        return self.client.call('fail', owner=owner, job_id=job_id, error=error, result=result)['status']
+
+    def close(self):
+        self.client.close()
+
+
+class RemoteLimiter:
+    """The part of ConcurrencyLimiter a queue worker uses, served by the coordinator"""
+
+    def __init__(self, client):
+        self.client = client
+
+    def try_acquire(self, owner, keys):
+        return self.client.call('acquire', owner=owner, keys=keys)['acquired']
+
+    def release(self, owner):
+        self.client.call('release', owner=owner)
+
+    def renew(self, owner):
+        """Nothing to do: the coordinator renews slots with the lease (extend_lease, heartbeats)"""
+
+    def record(self, keys, samples):
+        if samples:
+            self.client.call('record', keys=keys, samples=samples)
+
+    def adjust(self, key):
+        return self.client.call('adjust', key=key)['limit']
+
+
+def serve(port, rate=ACCOUNT_RATE, queue_path=QUEUE_PATH):
+    """Run the coordinator until interrupted"""
+    coordinator = Coordinator(queue_path, rate)
+    server = CoordinatorServer(("0.0.0.0", port), coordinator)
+    reaper = threading.Thread(target=coordinator.reap, name="coordinator-reaper", daemon=True)
+    reaper.start()
+    print(f"🧭 Coordinator on port {port} ({queue_path}), {rate} job start(s)/min per account")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("🛑 Coordinator stopping")
+    finally:
+        coordinator.stopping.set()
+        server.server_close()
+
+
+def run_node(address, workers=None):
+    """
+    Run a worker node: start queue workers against the coordinator, send heartbeats,
+    restart crashed workers (releasing their jobs)
+    """
+    import multiprocessing
+    from worker_pool import get_pool_size
+
+    client = CoordinatorClient(address)
+    node = get_node_id()
+    count = get_pool_size(workers)
+    client.call('hello', node=node, workers=count)
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    processes = {}
+    last_crash = 0
+
+    def start_worker(worker_id):
+        process = context.Process(
+            target=queue_worker_main, args=(worker_id,),
+            kwargs={'stop_event': stop_event, 'coordinator': address, 'node': node},
+            name=f"servpro-node-worker-{worker_id}", daemon=True,
+        )
+        process.start()
+        processes[worker_id] = process
+
+    print(f"🖥️ Node {node}: {count} worker(s) for coordinator {address}")
+    for worker_id in range(count):
+        start_worker(worker_id)
+    try:
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            try:
+                if not client.call('heartbeat', node=node)['known']:
+                    # The coordinator restarted or declared this node dead
+                    client.call('hello', node=node, workers=count)
+            except ConnectionError as e:
+                print(f"❌ Heartbeat failed: {str(e)}")
+            for worker_id, process in list(processes.items()):
+                if process.is_alive():
+                    continue
+                if time.time() - last_crash < RESPAWN_DELAY:
+                    continue
+                last_crash = time.time()
+                owner = get_worker_owner(worker_id, process.pid)
+                try:
+                    released = client.call('release', owner=owner, dead=True)['released']
+                except ConnectionError:
+                    released = 0
+                print(f"❌ Worker {worker_id} died (exit code {process.exitcode}), released {released} job(s)")
+                start_worker(worker_id)
+    except KeyboardInterrupt:
+        print("🛑 Node stopping, workers finish their current job")
+    finally:
+        stop_event.set()
+        for process in processes.values():
+            process.join(timeout=60)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        try:
+            client.call('leave', node=node)
+        except (ConnectionError, CoordinatorError):
+            pass
+        client.close()
+
+
+def print_status(status):
+    jobs = status['jobs']
+    print(f"📊 Queue: {', '.join(f'{name}={jobs.get(name, 0)}' for name in STATUSES)}")
+    for node, known in sorted(status['nodes'].items()):
+        print(f"🖥️ {node}: {known['workers']} worker(s), {known['owners']} claiming, "
+              f"last heartbeat {known['last_seen']:.0f}s ago")
+    print_limits(status['limits'])
+
+
+def main():
+    """Command line front end (see module docstring)"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 2
+    command, args = args[0], args[1:]
+    options = {'--port': 7700, '--rate': ACCOUNT_RATE, '--workers': None, '--connect': DEFAULT_ADDRESS,
+               '--queue': QUEUE_PATH}
+    files = []
+    while args:
+        arg = args.pop(0)
+        if arg in options and args:
+            value = args.pop(0)
+            options[arg] = value if arg in ('--connect', '--queue') else int(value)
+        else:
+            files.append(arg)
+
+    if command == "serve":
+        serve(options['--port'], options['--rate'], options['--queue'])
+    elif command == "node":
+        run_node(options['--connect'], options['--workers'])
+    elif command == "enqueue":
+        from worker_pool import load_payloads
+        client = CoordinatorClient(options['--connect'])
+        for job in client.call('enqueue', payloads=load_payloads(files))['jobs']:
+            print(f"{'➕ Queued' if job['created'] else '♻️ Already queued'} {job['id']} "
+                  f"({job['idempotency_key']}, {job['status']})")
+    elif command == "status":
+        print_status(CoordinatorClient(options['--connect']).call('status'))
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
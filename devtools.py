@@ -0,0 +1,243 @@
+"""
+DevTools connection of a session's tab, for what Selenium cannot do itself
+Selenium sends CDP commands (execute_cdp_cmd) but cannot receive CDP events, so
+intercepting requests (CDP Fetch domain) needs a WebSocket of its own to Chrome's
+debugger port. Each session gets one FetchInterceptor for the tab it fills: Chrome pauses
+the requests its handlers ask for, request_blocking.py fails the blocked ones and
+asset_cache.py answers bundles from disk; every other request continues unchanged.
+"""
+
+import os
+import json
+import base64
+import socket
+import struct
+import threading
+from collections import deque
+from urllib.parse import urlparse
+
+# Seconds a DevTools command may take
+DEVTOOLS_TIMEOUT = 30
+
+
+class DevToolsConnection:
+    """Minimal WebSocket client for one DevTools target (text frames, client-side masking)"""
+
+    def __init__(self, ws_url, timeout=DEVTOOLS_TIMEOUT):
+        parsed = urlparse(ws_url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        self.sock.sendall((f"GET {parsed.path} HTTP/1.1\r\nHost: {parsed.netloc}\r\nUpgrade: websocket\r\n"
+                           f"Connection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                           f"Sec-WebSocket-Version: 13\r\n\r\n").encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("DevTools closed the connection during the handshake")
+            response += chunk
+        head, self.buffer = response.split(b"\r\n\r\n", 1)
+        status_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+        if " 101 " not in status_line:
+            raise ConnectionError(f"DevTools refused the connection: {status_line}")
+        self.next_id = 0
+        self.events = deque()
+        self.send_lock = threading.Lock()
+
+    def read_exact(self, count):
+        while len(self.buffer) < count:
+            chunk = self.sock.recv(max(65536, count - len(self.buffer)))
+            if not chunk:
+                raise ConnectionError("DevTools connection closed")
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:count], self.buffer[count:]
+        return data
+
+    def send_frame(self, opcode, payload):
+        header = bytes([0x80 | opcode])
+        length = len(payload)
+        if length < 126:
+            header += bytes([0x80 | length])
+        elif length < 65536:
+            header += bytes([0x80 | 126]) + struct.pack("!H", length)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", length)
+        mask = os.urandom(4)
+        # XOR the whole payload at once; per-byte masking is too slow for MB-sized bodies
+        repeated = (mask * (length // 4 + 1))[:length]
+        masked = (int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")).to_bytes(length, "big")
+        with self.send_lock:
+            self.sock.sendall(header + mask + masked)
+
+    def receive(self):
+        """Next message (dict); answers pings and raises ConnectionError on close"""
+        message = b""
+        while True:
+            first, second = self.read_exact(2)
+            opcode, length = first & 0x0F, second & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self.read_exact(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self.read_exact(8))[0]
+            payload = self.read_exact(length)
+            if opcode == 0x8:
+                raise ConnectionError("DevTools closed the connection")
+            if opcode == 0x9:
+                self.send_frame(0xA, payload)
+                continue
+            if opcode in (0x0, 0x1, 0x2):
+                message += payload
+                if first & 0x80:
+                    return json.loads(message)
+
+    def send(self, method, params=None):
+        """Send a command without waiting; returns its id"""
+        self.next_id += 1
+        self.send_frame(0x1, json.dumps({'id': self.next_id, 'method': method, 'params': params or {}}).encode())
+        return self.next_id
+
+    def call(self, method, params=None):
+        """Send a command and wait for its result (events arriving meanwhile are queued)"""
+        command_id = self.send(method, params)
+        while True:
+            message = self.receive()
+            if message.get('id') == command_id:
+                if 'error' in message:
+                    raise RuntimeError(f"{method}: {message['error'].get('message')}")
+                return message.get('result', {})
+            if 'method' in message:
+                self.events.append(message)
+
+    def next_event(self):
+        return self.events.popleft() if self.events else self.receive()
+
+    def close(self):
+        try:
+            self.sock.close()
+        except OSError:
+            pass
+
+
+def get_target_ws_url(driver):
+    """DevTools WebSocket URL of the driver's current tab"""
+    import urllib.request
+
+    address = driver.capabilities.get('goog:chromeOptions', {}).get('debuggerAddress')
+    if not address:
+        raise RuntimeError("The session exposes no DevTools address")
+    with urllib.request.urlopen(f"http://{address}/json/list", timeout=DEVTOOLS_TIMEOUT) as response:
+        targets = json.loads(response.read())
+    # chromedriver's window handles are DevTools target IDs
+    handle = driver.current_window_handle
+    for target in targets:
+        if target.get('id') == handle and target.get('webSocketDebuggerUrl'):
+            return target['webSocketDebuggerUrl']
+    raise RuntimeError(f"No DevTools target for window {handle}")
+
+
+class FetchInterceptor:
+    """
+    One tab's paused requests, handed to the handlers that asked for them
+
+    A handler is called as handler(interceptor, params) for every Fetch.requestPaused
+    event and returns True when it answered the request (continue, fulfill or fail);
+    a request no handler answers continues unchanged.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.patterns = []
+        self.handlers = []
+        self.thread = threading.Thread(target=self.run, name="devtools-fetch", daemon=True)
+
+    def add_handler(self, patterns, handler):
+        """
+        Pause requests for a handler
+
+        Args:
+            patterns: CDP Fetch RequestPattern dicts ('urlPattern', 'requestStage')
+            handler: Called as handler(interceptor, params)
+        """
+        self.patterns.extend(patterns)
+        self.handlers.append(handler)
+
+    def start(self):
+        """Enable interception for every handler's patterns; False (connection closed) if that fails"""
+        if not self.handlers:
+            self.connection.close()
+            return False
+        try:
+            self.connection.call("Fetch.enable", {'patterns': self.patterns})
+        except (OSError, ValueError, RuntimeError) as e:
+            print(f"⚠️ Request interception unavailable: {type(e).__name__}: {str(e)}")
+            self.connection.close()
+            return False
+        # Events are read by the thread from now on; no more calls from this one
+        self.connection.sock.settimeout(None)
+        self.thread.start()
+        return True
+
+    def run(self):
+        try:
+            while True:
+                message = self.connection.next_event()
+                if message.get('method') == "Fetch.requestPaused":
+                    self.handle(message['params'])
+        except (OSError, ValueError):
+            pass    # browser or connection gone: Chrome drops the interception with it
+        finally:
+            self.connection.close()
+
+    def handle(self, params):
+        try:
+            for handler in self.handlers:
+                if handler(self, params):
+                    return
+        except RuntimeError as e:
+            print(f"⚠️ Request interception: {params['request']['url']}: {str(e)}")
+        self.continue_request(params['requestId'])
+
+    def continue_request(self, request_id):
+        self.connection.send("Fetch.continueRequest", {'requestId': request_id})
+
+    def fulfill(self, request_id, headers, body):
+        """Answer a paused request with a 200 response (headers: list of (name, value))"""
+        self.connection.send("Fetch.fulfillRequest", {
+            'requestId': request_id,
+            'responseCode': 200,
+            'responseHeaders': [{'name': name, 'value': value} for name, value in headers],
+            'body': base64.b64encode(body).decode(),
+        })
+
+    def fail(self, request_id, reason="BlockedByClient"):
+        self.connection.send("Fetch.failRequest", {'requestId': request_id, 'errorReason': reason})
+
+    def get_response_body(self, request_id):
+        """Body of a request paused at the response stage (bytes)"""
+        result = self.connection.call("Fetch.getResponseBody", {'requestId': request_id})
+        return base64.b64decode(result['body']) if result.get('base64Encoded') else result['body'].encode('utf-8')
+
+    def stop(self):
+        self.connection.close()
+
+
+def open_interceptor(driver):
+    """
+    FetchInterceptor for the driver's current tab (not started; add handlers first)
+
+    Returns:
+        The interceptor (also set as driver.interceptor), or None when DevTools is unreachable
+    """
+    try:
+        interceptor = FetchInterceptor(DevToolsConnection(get_target_ws_url(driver)))
+    except Exception as e:
+        print(f"⚠️ DevTools unavailable: {type(e).__name__}: {str(e)}")
+        return None
+    driver.interceptor = interceptor
+    return interceptor
+
+
+def close_interceptor(driver):
+    interceptor = getattr(driver, 'interceptor', None)
+    if interceptor is not None:
+        interceptor.stop()
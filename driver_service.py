@@ -0,0 +1,343 @@
+"""
+Shared chromedriver service for every browser on a host
+Starting a chromedriver per browser costs a process (and its memory) per browser and a
+chromedriver launch on every session start. Instead one long-lived chromedriver listens on
+SHARED_CHROMEDRIVER_PORT and every session on the host - all workers, all nodes - is a
+remote session on it (setup_driver() falls back to a dedicated chromedriver if the shared
+one cannot be used).
+
+The chromedriver is started detached, so it outlives the worker that started it and is
+not part of any worker's process tree. Its /status endpoint is checked before every new
+session. A chromedriver that is gone (process exited, port closed) is restarted at once;
+one that is running but slow to answer - busy with dozens of sessions - is left alone
+until HUNG_CHECKS failed checks spread over HUNG_AFTER seconds, because a restart ends
+every browser on the host. A session start that fails because the chromedriver went away
+is retried once on the new one. Sessions that lived on the old chromedriver fail their next command and their
+workers open new sessions as after any session error.
+
+Every browser is tagged with a --servpro-session switch so its process tree can be found
+although its chromedriver is not our child: RSS measurement (worker_pool.get_driver_rss)
+and the session watchdog (session_watchdog.py) use the browser PIDs recorded here.
+
+Usage:
+    python driver_service.py status     # health, PID and memory of the shared chromedriver
+    python driver_service.py start
+    python driver_service.py stop       # also ends every session on it
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import tempfile
+import threading
+import subprocess
+import urllib.request
+
+from worker_pool import kill_process_tree, find_pids_with_arg, get_process_cmdline, get_process_tree_rss, MB
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Port of the host's shared chromedriver
+SHARED_CHROMEDRIVER_PORT = int(os.environ.get("SERVPRO_CHROMEDRIVER_PORT", "9515"))
+
+# SERVPRO_SHARED_CHROMEDRIVER=0 gives every browser its own chromedriver again
+SHARED_CHROMEDRIVER = os.environ.get("SERVPRO_SHARED_CHROMEDRIVER", "1") != "0"
+
+# Seconds a /status health check (or port probe) may take; a busy chromedriver gets a second try
+HEALTH_TIMEOUT = 5
+HEALTH_RETRY_DELAY = 1
+
+# A running chromedriver whose /status keeps failing is restarted only after this many
+# failed checks (host-wide) spread over at least HUNG_AFTER seconds without a good one
+HUNG_CHECKS = 3
+HUNG_AFTER = 120
+
+# Seconds a freshly started chromedriver has to answer /status
+START_TIMEOUT = 20
+
+# The chromedriver is started through a short-lived launcher so it is nobody's child:
+# a worker's watchdog kills the worker's process tree and must not take it along
+LAUNCHER_SCRIPT = """
+import os, subprocess, sys
+if os.name == "posix":
+    detach = {'start_new_session': True}
+else:
+    detach = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.DETACHED_PROCESS}
+process = subprocess.Popen(sys.argv[1:], stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, **detach)
+print(process.pid)
+"""
+
+# Chrome switch that tags a browser with its session marker (Chrome ignores unknown switches)
+SESSION_SWITCH = "--servpro-session"
+
+_session_browsers = {}      # session ID -> browser PID, sessions opened by this process
+_lock = threading.Lock()
+_start_lock = threading.Lock()
+_driver_class = None
+
+
+def get_shared_driver_class():
+    """
+    webdriver.Remote with webdriver.Chrome's CDP command, for sessions on the shared chromedriver
+
+    Selenium is imported on first use, so the status/stop commands (and the session
+    watchdog) do not pay for it.
+    """
+    global _driver_class
+    if _driver_class is None:
+        from selenium import webdriver
+
+        class SharedChromeDriver(webdriver.Remote):
+            def execute_cdp_cmd(self, cmd, cmd_args):
+                return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+        _driver_class = SharedChromeDriver
+    return _driver_class
+
+
+def get_service_url(port=SHARED_CHROMEDRIVER_PORT):
+    return f"http://127.0.0.1:{port}"
+
+
+def get_state_path(port, suffix):
+    """Host-wide file next to the shared chromedriver (PID file, start lock)"""
+    return os.path.join(tempfile.gettempdir(), f"servpro-chromedriver-{port}.{suffix}")
+
+
+def check_service(port=SHARED_CHROMEDRIVER_PORT, attempts=2):
+    """True if the chromedriver on the port answers /status and is ready for sessions"""
+    for attempt in range(attempts):
+        try:
+            with urllib.request.urlopen(f"{get_service_url(port)}/status", timeout=HEALTH_TIMEOUT) as response:
+                if json.loads(response.read()).get('value', {}).get('ready'):
+                    return True
+        except Exception:
+            pass
+        if attempt < attempts - 1:
+            time.sleep(HEALTH_RETRY_DELAY)
+    return False
+
+
+def is_port_open(port=SHARED_CHROMEDRIVER_PORT):
+    """True if something listens on the port (a connect that times out is a full backlog: busy, not closed)"""
+    try:
+        socket.create_connection(("127.0.0.1", port), timeout=HEALTH_TIMEOUT).close()
+        return True
+    except socket.timeout:
+        return True
+    except OSError:
+        return False
+
+
+def record_failed_check(port=SHARED_CHROMEDRIVER_PORT):
+    """
+    Count a failed health check of a running chromedriver (host-wide, call under the start lock)
+
+    Returns:
+        Tuple of (failed checks in a row, time of the first one)
+    """
+    path = get_state_path(port, "health")
+    try:
+        with open(path, "r") as file:
+            count, since = json.load(file)
+    except (OSError, ValueError):
+        count, since = 0, time.time()
+    count += 1
+    with open(path, "w") as file:
+        json.dump([count, since], file)
+    return count, since
+
+
+def clear_failed_checks(port=SHARED_CHROMEDRIVER_PORT):
+    try:
+        os.remove(get_state_path(port, "health"))
+    except OSError:
+        pass
+
+
+def read_service_pid(port=SHARED_CHROMEDRIVER_PORT):
+    """PID of the shared chromedriver we started, or None if it is not running"""
+    try:
+        with open(get_state_path(port, "pid"), "r") as file:
+            pid = int(file.read().strip())
+    except (OSError, ValueError):
+        return None
+    # The PID may have been reused since (argv[1] for a chromedriver started through a wrapper)
+    if not any("chromedriver" in arg.lower() for arg in get_process_cmdline(pid)[:2]):
+        return None
+    return pid
+
+
+def stop_service(port=SHARED_CHROMEDRIVER_PORT):
+    """Kill the shared chromedriver and its browsers; returns the number of processes killed"""
+    pid = read_service_pid(port)
+    killed = kill_process_tree(pid) if pid is not None else 0
+    try:
+        os.remove(get_state_path(port, "pid"))
+    except OSError:
+        pass
+    return killed
+
+
+def start_service(driver_path, port=SHARED_CHROMEDRIVER_PORT):
+    """Launch a detached chromedriver on the port and wait until it is ready"""
+    launcher = subprocess.run([sys.executable, "-c", LAUNCHER_SCRIPT, driver_path, f"--port={port}"],
+                              capture_output=True, text=True, timeout=START_TIMEOUT)
+    if launcher.returncode != 0:
+        raise Exception(f"Could not launch ChromeDriver: {launcher.stderr.strip()}")
+    pid = int(launcher.stdout.strip())
+    with open(get_state_path(port, "pid"), "w") as file:
+        file.write(str(pid))
+
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        if check_service(port, attempts=1):
+            print(f"🚗 Shared ChromeDriver running on port {port} (PID {pid})")
+            return pid
+        if not get_process_cmdline(pid):
+            raise Exception(f"ChromeDriver exited right after starting (port {port} in use?)")
+        time.sleep(0.2)
+    kill_process_tree(pid)
+    raise Exception(f"ChromeDriver did not become ready on port {port} within {START_TIMEOUT}s")
+
+
+def ensure_service(get_driver_path, port=SHARED_CHROMEDRIVER_PORT):
+    """
+    Health-check the shared chromedriver, starting it when it is gone
+
+    A chromedriver that is running (PID alive, port open) but fails its checks is only
+    restarted after HUNG_CHECKS failed checks over HUNG_AFTER seconds (see module docstring);
+    until then its URL is returned as is.
+
+    Args:
+        get_driver_path: Callable returning the chromedriver executable (called only to start one)
+        port: Port of the shared chromedriver
+
+    Returns:
+        URL of the shared chromedriver
+    """
+    if check_service(port):
+        clear_failed_checks(port)
+        return get_service_url(port)
+
+    # One process restarts it; the others wait on the lock and find it healthy
+    with _start_lock, open(get_state_path(port, "lock"), "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        # Another process may have restarted it meanwhile
+        if check_service(port, attempts=1):
+            clear_failed_checks(port)
+            return get_service_url(port)
+        pid = read_service_pid(port)
+        if is_port_open(port):
+            count, since = record_failed_check(port)
+            if pid is None or count < HUNG_CHECKS or time.time() - since < HUNG_AFTER:
+                # Slow, not dead (or not ours to restart): its sessions carry on
+                print(f"🐢 Shared ChromeDriver on port {port} is slow to answer "
+                      f"({count} failed check(s) in {time.time() - since:.0f}s), not restarting it")
+                return get_service_url(port)
+            print(f"♻️ Shared ChromeDriver on port {port} failed {count} checks over "
+                  f"{time.time() - since:.0f}s, restarting it")
+        killed = stop_service(port)
+        clear_failed_checks(port)
+        if killed:
+            print(f"♻️ Shared ChromeDriver on port {port} was restarted ({killed} process(es) killed)")
+        start_service(get_driver_path(), port)
+    return get_service_url(port)
+
+
+def open_shared_session(chrome_options, get_driver_path, port=SHARED_CHROMEDRIVER_PORT):
+    """
+    Open a browser session on the host's shared chromedriver
+
+    Args:
+        chrome_options: Chrome Options for the session
+        get_driver_path: Callable returning the chromedriver executable (see ensure_service)
+        port: Port of the shared chromedriver
+
+    Returns:
+        Remote session (get_shared_driver_class) with browser_pid set (None if the browser
+        could not be found)
+    """
+    marker = f"{SESSION_SWITCH}={uuid.uuid4().hex}"
+    chrome_options.add_argument(marker)
+    for attempt in range(2):
+        url = ensure_service(get_driver_path, port)
+        try:
+            from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+            connection = ChromiumRemoteConnection(url, vendor_prefix="goog", browser_name="chrome",
+                                                  ignore_proxy=True)
+            driver = get_shared_driver_class()(command_executor=connection, options=chrome_options)
+            break
+        except Exception:
+            # Retry once if the chromedriver went away under us; other errors are the session's own
+            if attempt or check_service(port):
+                raise
+
+    pids = find_pids_with_arg(marker)
+    # The browser process starts before its children
+    driver.browser_pid = pids[0] if pids else None
+    with _lock:
+        _session_browsers[driver.session_id] = driver.browser_pid
+    return driver
+
+
+def forget_shared_session(driver):
+    """Drop the browser PID of a session that was closed"""
+    with _lock:
+        _session_browsers.pop(getattr(driver, 'session_id', None), None)
+
+
+def kill_session_browsers():
+    """
+    Kill the browsers of every shared-chromedriver session this process opened
+
+    The chromedriver itself keeps running for the other processes' sessions; the killed
+    sessions' pending commands fail with "chrome not reachable".
+
+    Returns:
+        Number of processes killed
+    """
+    with _lock:
+        pids = [pid for pid in _session_browsers.values() if pid is not None]
+    return sum(kill_process_tree(pid) for pid in pids)
+
+
+def print_service_status(port=SHARED_CHROMEDRIVER_PORT):
+    """Print health, PID and memory of the shared chromedriver"""
+    healthy = check_service(port)
+    pid = read_service_pid(port)
+    print(f"🚗 Shared ChromeDriver {get_service_url(port)}: {'healthy' if healthy else 'not answering'}")
+    if pid is not None:
+        print(f"   PID {pid}, {get_process_tree_rss(pid) / MB:.0f} MB with its browsers")
+
+
+def main():
+    """Command line front end (see module docstring)"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 2
+    command = args[0]
+    if command == "status":
+        print_service_status()
+    elif command == "start":
+        from servpro_login import get_chromedriver_path
+        print(f"🚗 {ensure_service(get_chromedriver_path)}")
+    elif command == "stop":
+        print(f"🛑 Stopped the shared ChromeDriver ({stop_service()} process(es) killed)")
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,152 +1,254 @@
 """
 Field mappings for the form automation
 Maps JSON schema fields to form element IDs/selectors
+
+FIELD_REGISTRY is the single declarative source of truth: one entry per form
+control with its Telerik control type, the customer type it applies to, whether
+changing it triggers a (partial) postback and which fields it depends on.
+form_plan.py compiles it together with json.txt into per-customer-type fill plans.
 """
 
-# General Information Fields
-GENERAL_INFO_FIELDS = {
-    "receivedBy": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBox_ReceivedBy_Input",
-    "jobName": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_JobNameRadTextBox",
-    "reportedBy": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_DropDown_ReportedBY_Input",
-    "referredBy": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_DropDown_ReferredBy_Input",
-    "jobSize": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_JobSizeComboBox_Input",
-    "officeName": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBoxOffice_Input",
-    "dateOfLoss": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_DatePicker_DateOffLoss_dateInput",
-    "lossCategory": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBox_LossCategory_Input",
-    "environmentalCode": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBoxEnvironmentalCode_Input",
-    "catReference": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_RadComboBox_Catastrophe_Input",
-    "priority": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBoxPriority_Input",
-    "lossType": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBox_LossType_Input",
-    "secondaryLossType": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_comboBox_SecondryLossType_Input",
-    "sourceOfLoss": "ctl00_ContentPlaceHolder1_JobParentInformation_GenaralInfo_SourceOfLossComboBox_Input"
-}
+PREFIX = "ctl00_ContentPlaceHolder1_JobParentInformation_"
 
-# Customer Information Fields
-CUSTOMER_INFO_FIELDS = {
-    "customerType": {
-        "Individual": "ctl00_ContentPlaceHolder1_JobParentInformation_RadioButton_IndividualCustomer",
-        "Company": "ctl00_ContentPlaceHolder1_JobParentInformation_RadioButton_CompanyCustomer"
-    },
-    "customer": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_Customer_Input",
-    "title": "ctl00_ContentPlaceHolder1_JobParentInformation_ctl17_TitleDropDownTree",
-    "firstName": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_FirstName",
-    "lastName": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_LastName",
-    "email": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_Email",
-    "secondaryEmail": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_SecondaryEmail",
-    "address": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_Address_Input",
-    "zipCode": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_Zip",
-    "city": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_City",
-    "countyRegion": "ctl00_ContentPlaceHolder1_JobParentInformation_comboBox_CustomerCounty_Input",
-    "country": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_Country_Input",
-    "stateProvince": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_State_Input"
-}
 
-# Phone Number Fields
-PHONE_FIELDS = {
-    "mainPhoneNumber": {
-        "number": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_MainPhone",
-        "type": {
-            "Business": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_BusinessPhone_Input",
-            "Mobile": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_MobilePhone_Input",
-            "Home": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_HomePhone_Input",
-            "Fax": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_FaxPhone_Input",
-            "Other": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_OtherPhone_Input"
-        }
+def field(path, control_id, control, customer_type=None, postback=False, depends_on=()):
+    """Declare one registry entry"""
+    return {
+        "field": path,
+        "control_id": PREFIX + control_id,
+        "control": control,
+        "customer_type": customer_type,
+        "postback": postback,
+        "depends_on": tuple(depends_on),
     }
-}
 
-# Job Address Fields
-JOB_ADDRESS_FIELDS = {
-    "isSameAsCustomerAddress": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_SameAsIndividualLossAddress",
-    "firstName": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_JobAddressFirstName",
-    "lastName": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_JobAddressLastName",
-    "address": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_AddressLoss_Input",
-    "zipCode": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_JobAddressZip",
-    "city": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_JobAddressCity",
-    "countyRegion": "ctl00_ContentPlaceHolder1_JobParentInformation_comboBox_JobAddressCounty_Input",
-    "country": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_JobAddressCountry_Input",
-    "stateProvince": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_JobAddressState_Input"
-}
 
-# Internal Participants Fields
-INTERNAL_PARTICIPANTS_FIELDS = {
-    "estimator": "ctl00_ContentPlaceHolder1_JobParentInformation_EstimatorDropDown_Input",
-    "coordinator": "ctl00_ContentPlaceHolder1_JobParentInformation_CoordinatorDropDown_Input",
-    "supervisor": "ctl00_ContentPlaceHolder1_JobParentInformation_SupervisorDropDown_Input",
-    "foreman": "ctl00_ContentPlaceHolder1_JobParentInformation_ForemanDropDown_Input",
-    "accounting": "ctl00_ContentPlaceHolder1_JobParentInformation_AccountingDropDown_Input",
-    "marketing": "ctl00_ContentPlaceHolder1_JobParentInformation_MarketingDropDown_Input",
-    "dispatcher": "ctl00_ContentPlaceHolder1_JobParentInformation_DispatcherDropDown_Input",
-    "naAdministrator": "ctl00_ContentPlaceHolder1_JobParentInformation_NAAdministratorDropDown_Input",
-    "naFieldAccountsManager": "ctl00_ContentPlaceHolder1_JobParentInformation_NAFieldAccountsManagerDropDown_Input"
-}
+def company_job_phone_fields():
+    """Company job address phone number/extension pairs"""
+    fields = []
+    for phone_type in ["MainPhone", "BusinessPhone", "FaxPhone", "OtherPhone"]:
+        fields.append(field(f"company{phone_type}Loss.number", f"TextBox_Company{phone_type}Loss",
+                            "RadMaskedTextBox", "Company"))
+        fields.append(field(f"company{phone_type}Loss.extension", f"TextBox_Company{phone_type}LossExtension",
+                            "RadTextBox", "Company"))
+    return fields
 
-# External Participants Fields
-EXTERNAL_PARTICIPANTS_FIELDS = {
-    "brokerAgent": "ctl00_ContentPlaceHolder1_JobParentInformation_BrokerAgentDropDown_Input",
-    "brokerAgentContact": "ctl00_ContentPlaceHolder1_JobParentInformation_BrokerAgentContactDropDown_Input",
-    "insuranceCarrier": "ctl00_ContentPlaceHolder1_JobParentInformation_InsuranceCarrierDropDown_Input",
-    "primaryAdjuster": "ctl00_ContentPlaceHolder1_JobParentInformation_PrimaryAdjusterDropDown_Input",
-    "primaryFieldAdjuster": "ctl00_ContentPlaceHolder1_JobParentInformation_PrimaryFieldAdjusterDropDown_Input",
-    "propertyManagement": "ctl00_ContentPlaceHolder1_JobParentInformation_PropertyManagementDropDown_Input",
-    "propertyManagementContact": "ctl00_ContentPlaceHolder1_JobParentInformation_PropertyManagementContactDropDown_Input",
-    "contractorCompany": "ctl00_ContentPlaceHolder1_JobParentInformation_ContractorCompanyDropDown_Input",
-    "contractorContact": "ctl00_ContentPlaceHolder1_JobParentInformation_ContractorContactDropDown_Input",
-    "independentAdjustingFirm": "ctl00_ContentPlaceHolder1_JobParentInformation_IndependentAdjustingFirmDropDown_Input",
-    "independentAdjusterContact": "ctl00_ContentPlaceHolder1_JobParentInformation_IndependentAdjusterContactDropDown_Input",
-    "publicAdjustingFirm": "ctl00_ContentPlaceHolder1_JobParentInformation_PublicAdjustingFirmDropDown_Input",
-    "publicAdjusterContact": "ctl00_ContentPlaceHolder1_JobParentInformation_PublicAdjusterContactDropDown_Input",
-    "primaryMortgage": "ctl00_ContentPlaceHolder1_JobParentInformation_PrimaryMortgageDropDown_Input",
-    "secondaryMortgage": "ctl00_ContentPlaceHolder1_JobParentInformation_SecondaryMortgageDropDown_Input",
-    "tpaCompany": "ctl00_ContentPlaceHolder1_JobParentInformation_TPACompanyDropDown_Input",
-    "tpa": "ctl00_ContentPlaceHolder1_JobParentInformation_TPADropDown_Input",
-    "billToCompany": "ctl00_ContentPlaceHolder1_JobParentInformation_BillToCompanyDropDown_Input",
-    "billToContact": "ctl00_ContentPlaceHolder1_JobParentInformation_BillToContactDropDown_Input",
-    "secondaryContact": "ctl00_ContentPlaceHolder1_JobParentInformation_SecondaryContactDropDown_Input",
-    "businessContact": "ctl00_ContentPlaceHolder1_JobParentInformation_BusinessContactDropDown_Input"
-}
 
-# Policy Information Fields
-POLICY_INFO_FIELDS = {
-    "claimNumber": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_ClaimNumber",
-    "fileNumber": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_FileNumber",
-    "policyNumber": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_PolicyNumber",
-    "yearBuilt": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_YearBuilt",
-    "policyStartDate": "ctl00_ContentPlaceHolder1_JobParentInformation_DatePicker_PolicyStartDate_dateInput",
-    "policyExpirationDate": "ctl00_ContentPlaceHolder1_JobParentInformation_DatePicker_PolicyExpirationDate_dateInput"
+# Form sections in fill order. Section keys match the payload (see form_data_*_example.json).
+FIELD_REGISTRY = {
+    "generalInformation": [
+        field("receivedBy", "GenaralInfo_comboBox_ReceivedBy_Input", "RadComboBox"),
+        field("jobName", "GenaralInfo_JobNameRadTextBox", "RadTextBox"),
+        field("reportedBy", "GenaralInfo_DropDown_ReportedBY_Input", "RadComboBox"),
+        field("referredBy", "GenaralInfo_DropDown_ReferredBy_Input", "RadComboBox"),
+        field("jobSize", "GenaralInfo_JobSizeComboBox_Input", "RadComboBox"),
+        field("officeName", "GenaralInfo_comboBoxOffice_Input", "RadComboBox", postback=True),
+        field("dateOfLoss", "GenaralInfo_DatePicker_DateOffLoss_dateInput", "RadDatePicker"),
+        field("lossCategory", "GenaralInfo_comboBox_LossCategory_Input", "RadComboBox"),
+        field("environmentalCode", "GenaralInfo_comboBoxEnvironmentalCode_Input", "RadComboBox"),
+        field("catReference", "GenaralInfo_RadComboBox_Catastrophe_Input", "RadComboBox"),
+        field("priority", "GenaralInfo_comboBoxPriority_Input", "RadComboBox"),
+        field("lossType", "GenaralInfo_comboBox_LossType_Input", "RadComboBox", postback=True),
+        field("secondaryLossType", "GenaralInfo_comboBox_SecondryLossType_Input", "RadComboBox",
+              depends_on=["generalInformation.lossType"]),
+        field("sourceOfLoss", "GenaralInfo_SourceOfLossComboBox_Input", "RadComboBox"),
+    ],
+    "customerInformation": [
+        # Individual customer (TR_Customer)
+        field("customerType", "RadioButton_IndividualCustomer", "RadioButton", "Individual"),
+        field("isSameAsJobAddress", "CheckBox_SameAsIndividualLossAddress", "CheckBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("customer", "DropDown_Customer_Input", "RadComboBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("title", "ctl17_TitleDropDownTree", "RadDropDownTree", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("firstName", "TextBox_FirstName", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("lastName", "TextBox_LastName", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("email", "TextBox_Email", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("secondaryEmail", "TextBox_SecondaryEmail", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("address", "TextBox_Address_Input", "RadSearchBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("zipCode", "TextBox_Zip", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("city", "TextBox_City", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("country", "DropDown_Country_Input", "RadComboBox", "Individual", postback=True,
+              depends_on=["customerInformation.customerType"]),
+        field("stateProvince", "DropDown_State_Input", "RadComboBox", "Individual", postback=True,
+              depends_on=["customerInformation.country"]),
+        field("countyRegion", "comboBox_CustomerCounty_Input", "RadComboBox", "Individual",
+              depends_on=["customerInformation.stateProvince"]),
+        field("mainPhoneNumber.number", "TextBox_MainPhone", "RadMaskedTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        field("mainPhoneNumber.extension", "TextBox_MainPhoneExt", "RadTextBox", "Individual",
+              depends_on=["customerInformation.customerType"]),
+        # Company customer (TR_CompanyCustomer)
+        field("customerType", "RadioButton_CompanyCustomer", "RadioButton", "Company"),
+        field("isSameAsJobAddress", "CheckBox_CompanySameAsLossAddress", "CheckBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyCustomer", "DropDown_CompanyCustomer_Input", "RadComboBox", "Company", postback=True,
+              depends_on=["customerInformation.customerType"]),
+        field("companyName", "TextBox_CompanyName", "RadTextBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyEmail", "TextBox_CompanyEmail", "RadTextBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyAddress", "TextBox_CompanyAddress_Input", "RadSearchBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyZipCode", "TextBox_CompanyZip", "RadTextBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyCity", "TextBox_CompanyCity", "RadTextBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyCountry", "DropDown_CompanyCountry_Input", "RadComboBox", "Company", postback=True,
+              depends_on=["customerInformation.customerType"]),
+        field("companyStateProvince", "DropDown_CompanyState_Input", "RadComboBox", "Company", postback=True,
+              depends_on=["customerInformation.companyCountry"]),
+        field("companyCountyRegion", "RadComboBox_CompanyCounty_Input", "RadComboBox", "Company",
+              depends_on=["customerInformation.companyStateProvince"]),
+        field("companyCustomerContact", "DropDown_CompanyCustomerContact_Input", "RadComboBox", "Company",
+              depends_on=["customerInformation.companyCustomer"]),
+        field("companyMainPhoneNumber.number", "TextBox_CompanyMainPhone", "RadMaskedTextBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+        field("companyMainPhoneNumber.extension", "TextBox_CompanyMainPhoneExtension", "RadTextBox", "Company",
+              depends_on=["customerInformation.customerType"]),
+    ],
+    "jobAddressInformation": [
+        # Individual job address (TR_IndividualLossAddress)
+        field("isSameAsCustomerAddress", "CheckBox_SameIndividualAddress", "CheckBox", "Individual"),
+        field("firstName", "TextBox_FirstNameLoss", "RadTextBox", "Individual"),
+        field("lastName", "TextBox_LastNameLoss", "RadTextBox", "Individual"),
+        field("address", "TextBox_AddressLoss_Input", "RadSearchBox", "Individual"),
+        field("zipCode", "TextBox_ZipLoss", "RadTextBox", "Individual"),
+        field("city", "TextBox_CityLoss", "RadTextBox", "Individual"),
+        field("country", "DropDown_CountryLoss_Input", "RadComboBox", "Individual", postback=True),
+        field("stateProvince", "DropDown_StateLoss_Input", "RadComboBox", "Individual", postback=True,
+              depends_on=["jobAddressInformation.country"]),
+        field("countyRegion", "comboBox_CustomerLossCounty_Input", "RadComboBox", "Individual",
+              depends_on=["jobAddressInformation.stateProvince"]),
+        field("mainPhoneNumber.number", "TextBox_MainPhoneLoss", "RadMaskedTextBox", "Individual"),
+        field("mainPhoneNumber.extension", "TextBox_MainPhoneLossExtension", "RadTextBox", "Individual"),
+        # Company job address (TR_CompanyLossAddress)
+        field("isSameAsCustomerAddress", "checkBox_SameCompanyAddress", "CheckBox", "Company"),
+        field("companyContactSelection.existingContact", "DropDown_CompanyFirstNameLoss_Input",
+              "RadComboBox", "Company", postback=True),
+        field("companyContactSelection.newContactFirstName", "TextBox_CompanyContactFirstName",
+              "RadTextBox", "Company"),
+        field("companyContactSelection.newContactLastName", "TextBox_CompanyContactLastName",
+              "RadTextBox", "Company"),
+        field("companyJobAddress", "TextBox_CompanyAddressLoss_Input", "RadSearchBox", "Company"),
+        field("companyJobZipCode", "TextBox_CompanyZipLoss", "RadTextBox", "Company"),
+        field("companyJobCity", "TextBox_CompanyCityLoss", "RadTextBox", "Company"),
+        field("companyJobCountry", "DropDown_CompanyCountryLoss_Input", "RadComboBox", "Company", postback=True),
+        field("companyJobStateProvince", "DropDown_CompanyStateLoss_Input", "RadComboBox", "Company", postback=True,
+              depends_on=["jobAddressInformation.companyJobCountry"]),
+        field("companyJobCountyRegion", "RadComboBox_CompanyLossCounty_Input", "RadComboBox", "Company",
+              depends_on=["jobAddressInformation.companyJobStateProvince"]),
+    ] + company_job_phone_fields(),
+    "internalParticipants": [
+        field(name, f"InternalParticpantsControl_InternalParticipantsList_ctl{index:02d}_EstimatorComboBox_Input",
+              "RadComboBox", depends_on=["generalInformation.officeName"])
+        for index, name in enumerate([
+            "estimator", "coordinator", "supervisor", "foreman", "accounting",
+            "marketing", "dispatcher", "naAdministrator", "naFieldAccountsManager"
+        ])
+    ],
+    "externalParticipants": [
+        field("brokerAgent", "ExternalParticipants_SystemCompanyParticipantCombobox_2_Input",
+              "RadComboBox", postback=True),
+        field("brokerAgentContact", "ExternalParticipants_SystemIndividualParticipantCombobox_4_Input",
+              "RadComboBox", depends_on=["externalParticipants.brokerAgent"]),
+        field("insuranceCarrier", "ExternalParticipants_SystemCompanyParticipantCombobox_3_Input",
+              "RadComboBox", postback=True),
+        field("primaryAdjuster", "ExternalParticipants_SystemIndividualParticipantCombobox_3_Input",
+              "RadComboBox", depends_on=["externalParticipants.insuranceCarrier"]),
+        field("primaryFieldAdjuster", "ExternalParticipants_SystemIndividualParticipantCombobox_34_Input",
+              "RadComboBox", depends_on=["externalParticipants.insuranceCarrier"]),
+        field("propertyManagement", "ExternalParticipants_SystemCompanyParticipantCombobox_5_Input",
+              "RadComboBox", postback=True),
+        field("propertyManagementContact", "ExternalParticipants_SystemIndividualParticipantCombobox_9_Input",
+              "RadComboBox", depends_on=["externalParticipants.propertyManagement"]),
+        field("contractorCompany", "ExternalParticipants_SystemCompanyParticipantCombobox_24_Input",
+              "RadComboBox", postback=True),
+        field("contractorContact", "ExternalParticipants_SystemIndividualParticipantCombobox_33_Input",
+              "RadComboBox", depends_on=["externalParticipants.contractorCompany"]),
+        field("independentAdjustingFirm", "ExternalParticipants_SystemCompanyParticipantCombobox_1_Input",
+              "RadComboBox", postback=True),
+        field("independentAdjusterContact", "ExternalParticipants_SystemIndividualParticipantCombobox_6_Input",
+              "RadComboBox", depends_on=["externalParticipants.independentAdjustingFirm"]),
+        field("publicAdjustingFirm", "ExternalParticipants_SystemCompanyParticipantCombobox_10_Input",
+              "RadComboBox", postback=True),
+        field("publicAdjusterContact", "ExternalParticipants_SystemIndividualParticipantCombobox_8_Input",
+              "RadComboBox", depends_on=["externalParticipants.publicAdjustingFirm"]),
+        field("primaryMortgage", "ExternalParticipants_SystemCompanyParticipantCombobox_14_Input", "RadComboBox"),
+        field("secondaryMortgage", "ExternalParticipants_SystemCompanyParticipantCombobox_25_Input", "RadComboBox"),
+        field("tpaCompany", "ExternalParticipants_SystemCompanyParticipantCombobox_23_Input",
+              "RadComboBox", postback=True),
+        field("tpa", "ExternalParticipants_SystemIndividualParticipantCombobox_32_Input",
+              "RadComboBox", depends_on=["externalParticipants.tpaCompany"]),
+        field("billToCompany", "ExternalParticipants_SystemCompanyParticipantCombobox_26_Input",
+              "RadComboBox", postback=True),
+        field("billToContact", "ExternalParticipants_SystemIndividualParticipantCombobox_35_Input",
+              "RadComboBox", depends_on=["externalParticipants.billToCompany"]),
+        field("secondaryContact", "ExternalParticipants_CustomIndividualParticipantCombobox_1675_Input", "RadComboBox"),
+        field("businessContact", "ExternalParticipants_CustomIndividualParticipantCombobox_1717_Input", "RadComboBox"),
+    ],
+    "policyInformation": [
+        field("claimNumber", "TextBox_ClaimNumber", "RadTextBox"),
+        field("fileNumber", "TextBox_ExternalFileNumber", "RadTextBox"),
+        field("policyNumber", "TextBox_PolicyNumber", "RadTextBox"),
+        field("yearBuilt", "TextBox_Year", "RadTextBox"),
+        field("policyStartDate", "DatePicker_PolicyStartDate_dateInput", "RadDatePicker"),
+        field("policyExpirationDate", "DatePicker_PolicyExpirationDate_dateInput", "RadDatePicker"),
+    ],
+    "division": [
+        field("servicesSelected", "CheckBox_RequiredServices", "CheckBoxList"),
+    ],
+    "paymentServices": [
+        field("deductibleRequired", "DropDown_DeductibleRequired_Input", "RadComboBox"),
+        field("amount", "TextBox_Amount", "RadTextBox"),
+        field("collectWhen", "DropDown_CollectWhen_Input", "RadComboBox"),
+        field("dwellingLimits", "textBox_Dwelling", "RadTextBox"),
+        field("contentsLimits", "textBox_Contents", "RadTextBox"),
+        field("otherStructuresLimits", "textBox_OtherStructures", "RadTextBox"),
+        field("selfPay", "SelfPayJobCheckBox", "CheckBox"),
+    ],
+    "lossDescriptionSection": [
+        field("lossDescription", "TextBox_LossDescription", "RadTextBox"),
+        field("specialInstructions", "TextBox_SpecialIns", "RadTextBox"),
+        field("roomsAffected", "ChosenRoomAffectedRadListBox", "RadListBox"),
+    ],
 }
 
-# Division Fields
-DIVISION_FIELDS = {
-    "servicesSelected": {
-        "Temporary repairs": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_TemporaryRepairs",
-        "Water Mitigation": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_WaterMitigation",
-        "Reconstruction": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_Reconstruction",
-        "Structure": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_Structure",
-        "Contents": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_Contents",
-        "Roofing": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_Roofing",
-        "General Cleaning": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_GeneralCleaning",
-        "Mold": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_Mold"
+
+def get_section_field_ids(section, customer_type=None):
+    """Flat {field path: control ID} view of one registry section"""
+    return {
+        entry["field"]: entry["control_id"]
+        for entry in FIELD_REGISTRY[section]
+        if entry["customer_type"] in (None, customer_type or "Individual")
     }
-}
 
-# Payment Services Fields
-PAYMENT_SERVICES_FIELDS = {
-    "deductibleRequired": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_DeductibleRequired_Input",
-    "amount": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_Amount",
-    "collectWhen": "ctl00_ContentPlaceHolder1_JobParentInformation_DropDown_CollectWhen_Input",
-    "dwellingLimits": "ctl00_ContentPlaceHolder1_JobParentInformation_textBox_Dwelling",
-    "contentsLimits": "ctl00_ContentPlaceHolder1_JobParentInformation_textBox_Contents",
-    "otherStructuresLimits": "ctl00_ContentPlaceHolder1_JobParentInformation_textBox_OtherStructures",
-    "selfPay": "ctl00_ContentPlaceHolder1_JobParentInformation_CheckBox_SelfPay"
-}
 
-# Loss Description & Special Instruction Fields
-LOSS_DESCRIPTION_FIELDS = {
-    "lossDescription": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_LossDescription",
-    "specialInstructions": "ctl00_ContentPlaceHolder1_JobParentInformation_TextBox_SpecialInstructions",
-    "roomsAffected": "ctl00_ContentPlaceHolder1_JobParentInformation_ListBox_RoomsAffected"
+# Flat per-section views kept for existing imports
+GENERAL_INFO_FIELDS = get_section_field_ids("generalInformation")
+CUSTOMER_INFO_FIELDS = get_section_field_ids("customerInformation", "Individual")
+COMPANY_CUSTOMER_INFO_FIELDS = get_section_field_ids("customerInformation", "Company")
+PHONE_FIELDS = {
+    path: control_id
+    for path, control_id in {**CUSTOMER_INFO_FIELDS, **COMPANY_CUSTOMER_INFO_FIELDS}.items()
+    if "PhoneNumber." in path
 }
+JOB_ADDRESS_FIELDS = get_section_field_ids("jobAddressInformation", "Individual")
+COMPANY_JOB_ADDRESS_FIELDS = get_section_field_ids("jobAddressInformation", "Company")
+INTERNAL_PARTICIPANTS_FIELDS = get_section_field_ids("internalParticipants")
+EXTERNAL_PARTICIPANTS_FIELDS = get_section_field_ids("externalParticipants")
+POLICY_INFO_FIELDS = get_section_field_ids("policyInformation")
+DIVISION_FIELDS = get_section_field_ids("division")
+PAYMENT_SERVICES_FIELDS = get_section_field_ids("paymentServices")
+LOSS_DESCRIPTION_FIELDS = get_section_field_ids("lossDescriptionSection")
 
 # Save Button
 SAVE_BUTTON = "ctl00_ContentPlaceHolder1_JobParentInformation_Button_SaveAndGoToSlideBoardBottom"
@@ -163,4 +265,4 @@ ALL_FIELD_MAPPINGS = {
     "division": DIVISION_FIELDS,
     "paymentServices": PAYMENT_SERVICES_FIELDS,
     "lossDescriptionAndSpecialInstruction": LOSS_DESCRIPTION_FIELDS
-} 
\ No newline at end of file
+}
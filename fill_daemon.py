@@ -0,0 +1,387 @@
+"""
+Resident fill daemon with warm browser sessions and a thin command line client
+A one-off `python servpro_login.py` run pays interpreter start, the Selenium import,
+chromedriver resolution, a browser launch and the login before the first field is
+filled. The daemon pays all of that once: it keeps a few logged-in sessions parked on
+the CreateJob page and fills payloads sent to it over a Unix socket.
+
+- Protocol: one JSON object per line each way, like coordinator.py. {"op": "fill",
+  "payload": {...}} is answered with {"event": {...}} lines (progress.py events of
+  the fill) and a final {"ok": true, "result": {...}} (see worker_pool.run_job).
+- After a job its session is taken back to a fresh CreateJob page in the background,
+  so the next request starts filling right away. A session whose job errored is
+  replaced; sessions are recycled like the pool's (session_recycling.py).
+- Idle sessions are refreshed every KEEPALIVE_INTERVAL seconds so the portal does not
+  log them out.
+
+The client side of this module only imports the standard library, so a fill from the
+command line costs a socket round trip plus the fill itself.
+
+Usage:
+    python fill_daemon.py serve [--sessions N] [--socket PATH]
+    python fill_daemon.py fill job1.json [job2.json ...] [--socket PATH]
+    python fill_daemon.py status [--socket PATH]
+    python fill_daemon.py stop [--socket PATH]
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import socket
+import tempfile
+import threading
+import socketserver
+
+DEFAULT_SESSIONS = 2
+
+# Unix socket the daemon listens on (SERVPRO_FILL_SOCKET overrides)
+SOCKET_PATH = os.environ.get("SERVPRO_FILL_SOCKET", os.path.join(tempfile.gettempdir(), "servpro-fill.sock"))
+
+# Idle sessions are taken back to the CreateJob page this often (portal session timeout is 20 min)
+KEEPALIVE_INTERVAL = 10 * 60
+
+# How long a request waits for a free session
+SESSION_WAIT = 15 * 60
+
+
+class DaemonError(Exception):
+    """The daemon rejected a request"""
+
+
+class FillDaemon:
+    """Warm sessions of the daemon and the jobs running on them"""
+
+    def __init__(self, sessions=DEFAULT_SESSIONS):
+        # Selenium is only imported by the daemon, never by the client
+        import servpro_login
+        from session_recycling import SessionRecycler
+        from request_blocking import enable_traffic_accounting
+
+        # The daemon reports each job's traffic (see worker_pool.run_job)
+        enable_traffic_accounting()
+        self.servpro_login = servpro_login
+        self.slots = [
+            {
+                'name': f"daemon-{number}",
+                'driver': None,
+                'fresh': False,
+                'used_at': 0,
+                'recycler': SessionRecycler(f"daemon-{number}", servpro_login.open_job_creation_session,
+                                            servpro_login.quit_session),
+            }
+            for number in range(sessions)
+        ]
+        self.idle = queue.Queue()
+        self.listeners = {}     # job id -> callback(event) of the client waiting for it
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+        self.counts = {}
+        self.stopping = threading.Event()
+
+    def start(self):
+        """Open every session in parallel; a slot whose login failed retries on its first job"""
+        for slot in self.slots:
+            threading.Thread(target=self.warm_up, args=(slot,), name=f"warm-{slot['name']}", daemon=True).start()
+        threading.Thread(target=self.keep_alive, name="daemon-keepalive", daemon=True).start()
+
+    def warm_up(self, slot):
+        """Put a slot on a fresh CreateJob page and hand it back to the idle queue"""
+        try:
+            self.open_page(slot)
+            slot['fresh'] = True
+            print(f"🔥 {slot['name']}: ready on the CreateJob page")
+        except Exception as e:
+            print(f"⚠️ {slot['name']}: could not warm up: {type(e).__name__}: {str(e)}")
+            self.drop_session(slot)
+        slot['used_at'] = time.time()
+        self.idle.put(slot)
+
+    def open_page(self, slot):
+        """Open the slot's session, or take its browser back to a fresh CreateJob page"""
+        if slot['driver'] is None:
+            slot['driver'] = self.servpro_login.open_job_creation_session()
+            slot['recycler'].track(slot['driver'])
+        elif not self.servpro_login.navigate_to_job_creation(slot['driver']):
+            raise Exception("Could not navigate to the Job Creation page")
+
+    def drop_session(self, slot):
+        if slot['driver'] is not None:
+            self.servpro_login.quit_session(slot['driver'])
+        slot['driver'] = None
+        slot['fresh'] = False
+
+    def keep_alive(self):
+        """Refresh sessions that sat idle for KEEPALIVE_INTERVAL"""
+        while not self.stopping.wait(60):
+            for _ in range(len(self.slots)):
+                try:
+                    slot = self.idle.get_nowait()
+                except queue.Empty:
+                    break
+                if time.time() - slot['used_at'] < KEEPALIVE_INTERVAL:
+                    self.idle.put(slot)
+                    continue
+                self.warm_up(slot)
+
+    def fill(self, payload, on_event=None):
+        """
+        Fill one payload on a warm session
+
+        Args:
+            payload: Form data dict
+            on_event: Optional callback receiving the job's progress events
+
+        Returns:
+            Result dict (see worker_pool.run_job)
+        """
+        from worker_pool import run_job
+        from progress import set_progress_context
+
+        job_id = self.servpro_login.get_job_id(payload)
+        with self.lock:
+            if job_id in self.listeners:
+                raise DaemonError(f"Job {job_id} is already being filled")
+            self.listeners[job_id] = on_event
+        try:
+            try:
+                slot = self.idle.get(timeout=SESSION_WAIT)
+            except queue.Empty:
+                raise DaemonError(f"No session became free within {SESSION_WAIT}s")
+
+            set_progress_context(job_id=job_id, worker=slot['name'])
+            if not slot['fresh']:
+                # Cold slot (failed warm-up or refresh): pay the start now
+                try:
+                    self.open_page(slot)
+                except Exception:
+                    self.drop_session(slot)
+                    self.idle.put(slot)
+                    raise
+            slot['fresh'] = False
+            result = run_job(self.servpro_login, slot['driver'], 0, payload, job_id=job_id)
+        finally:
+            with self.lock:
+                self.listeners.pop(job_id, None)
+
+        with self.lock:
+            self.counts[result['status']] = self.counts.get(result['status'], 0) + 1
+        # The client gets its answer now; the session gets ready for the next one meanwhile
+        threading.Thread(target=self.finish_job, args=(slot, result), name=f"refresh-{slot['name']}",
+                         daemon=True).start()
+        return result
+
+    def finish_job(self, slot, result):
+        """Recycle or refresh a slot after its job and hand it back"""
+        if result['status'] == 'error':
+            # The session may be unusable
+            self.drop_session(slot)
+        else:
+            replacement = slot['recycler'].after_job(slot['driver'])
+            if replacement is not None:
+                # Pre-warmed: already on a fresh CreateJob page
+                self.servpro_login.quit_session(slot['driver'])
+                slot['driver'], slot['fresh'], slot['used_at'] = replacement, True, time.time()
+                self.idle.put(slot)
+                return
+        self.warm_up(slot)
+
+    def on_event(self, event):
+        """Progress sink: route an event to the client waiting for its job"""
+        with self.lock:
+            listener = self.listeners.get(event.get('job_id'))
+        if listener is not None:
+            listener(event)
+
+    def get_status(self):
+        return {
+            'sessions': len(self.slots),
+            'idle': self.idle.qsize(),
+            'warm': sum(1 for slot in self.slots if slot['driver'] is not None),
+            'running': sorted(self.listeners),
+            'jobs': dict(self.counts),
+            'uptime': round(time.time() - self.started_at),
+        }
+
+    def close(self):
+        self.stopping.set()
+        for slot in self.slots:
+            slot['recycler'].close()
+            self.drop_session(slot)
+
+
+class FillHandler(socketserver.StreamRequestHandler):
+    """One client connection: a request per line, events and a response per request"""
+
+    def handle(self):
+        daemon = self.server.daemon
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get('op')
+                if op == "fill":
+                    result = daemon.fill(request['payload'], self.send if request.get('events') else None)
+                    response = {'ok': True, 'result': result}
+                elif op == "status":
+                    response = dict(daemon.get_status(), ok=True)
+                elif op == "stop":
+                    response = {'ok': True}
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                else:
+                    raise DaemonError("Unknown op")
+            except Exception as e:
+                response = {'ok': False, 'error': f"{type(e).__name__}: {str(e)}"}
+            self.send(response)
+
+    def send(self, message):
+        if 'kind' in message:
+            message = {'event': message}
+        try:
+            self.wfile.write((json.dumps(message, default=str) + "\n").encode())
+            self.wfile.flush()
+        except OSError:
+            pass
+
+
+def serve(sessions=DEFAULT_SESSIONS, path=SOCKET_PATH):
+    """Run the daemon until interrupted or stopped by a client"""
+    from progress import set_progress_sink
+
+    if os.path.exists(path):
+        try:
+            call(path, 'status')
+            print(f"❌ A fill daemon is already listening on {path}")
+            return 1
+        except OSError:
+            os.remove(path)     # left over from a daemon that died
+
+    daemon = FillDaemon(sessions)
+    set_progress_sink(daemon.on_event)
+    server = socketserver.ThreadingUnixStreamServer(path, FillHandler)
+    server.daemon_threads = True
+    server.daemon = daemon
+    # The socket triggers fills on the logged-in account: owner only
+    os.chmod(path, 0o600)
+    daemon.start()
+    print(f"🛎️ Fill daemon on {path} with {sessions} session(s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("🛑 Fill daemon stopping")
+        server.server_close()
+        daemon.close()
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return 0
+
+
+def call(path, op, on_event=None, **fields):
+    """
+    Send one request to the daemon and return its response fields
+
+    Raises:
+        OSError: The daemon is not running
+        DaemonError: The daemon rejected the request
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        file = sock.makefile("rwb")
+        file.write((json.dumps(dict(fields, op=op, events=on_event is not None)) + "\n").encode())
+        file.flush()
+        for line in file:
+            message = json.loads(line)
+            if 'event' in message:
+                if on_event is not None:
+                    on_event(message['event'])
+                continue
+            if not message.pop('ok'):
+                raise DaemonError(message['error'])
+            return message
+    raise ConnectionError("Fill daemon closed the connection")
+
+
+def print_event(event):
+    """One line per section and per failed field while a job fills"""
+    if event['kind'] == 'section_finished':
+        print(f"  ✅ {event['section']}")
+    elif event['kind'] == 'field_failed':
+        print(f"  ⚠️ {event['field']}: {event['status']}")
+
+
+def print_result(result):
+    status = result['status']
+    icon = {'ok': '✅', 'failed': '⚠️'}.get(status, '❌')
+    print(f"{icon} Job {result['job_id']}: {status} in {result['duration']:.1f}s")
+    if result['report']:
+        print(f"   {result['report']['passed']}/{result['report']['checked']} fields confirmed")
+        for key, failure in result['report']['failed'].items():
+            print(f"   ❌ {key}: {failure['status']} (expected {failure['expected']!r}, got {failure['actual']!r})")
+    if result['error']:
+        print(f"   {result['error'].strip().splitlines()[-1]}")
+    traffic = result.get('traffic')
+    if traffic:
+        print(f"   📦 {traffic['bytes_loaded'] / 1024:.0f} KB loaded, {traffic['blocked']} request(s) blocked "
+              f"(~{traffic['bytes_saved'] / 1024:.0f} KB saved)")
+        if traffic.get('cached'):
+            print(f"   📚 {traffic['cached']} bundle(s), {traffic['bytes_cached'] / 1024:.0f} KB from the asset cache")
+
+
+def main():
+    """Command line front end (see module docstring)"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 2
+    command, args = args[0], args[1:]
+    options = {'--sessions': DEFAULT_SESSIONS, '--socket': SOCKET_PATH}
+    files = []
+    while args:
+        arg = args.pop(0)
+        if arg in options and args:
+            value = args.pop(0)
+            options[arg] = value if arg == '--socket' else int(value)
+        else:
+            files.append(arg)
+
+    if command == "serve":
+        return serve(options['--sessions'], options['--socket'])
+
+    try:
+        if command == "fill":
+            from worker_pool import load_payloads
+            failed = 0
+            for payload in load_payloads(files):
+                result = call(options['--socket'], 'fill', on_event=print_event, payload=payload)['result']
+                print_result(result)
+                failed += result['status'] != 'ok'
+            return 1 if failed else 0
+        elif command == "status":
+            status = call(options['--socket'], 'status')
+            print(f"🛎️ {status['warm']}/{status['sessions']} session(s) warm, {status['idle']} idle, "
+                  f"up {status['uptime'] / 60:.0f} min")
+            print(f"   Jobs: {', '.join(f'{k}={v}' for k, v in sorted(status['jobs'].items())) or 'none'}")
+            for job_id in status['running']:
+                print(f"   ⏳ {job_id}")
+        elif command == "stop":
+            call(options['--socket'], 'stop')
+            print("🛑 Fill daemon stopping")
+        else:
+            print(__doc__)
+            return 2
+    except OSError as e:
+        print(f"❌ No fill daemon on {options['--socket']} ({type(e).__name__}); "
+              f"start one with: python fill_daemon.py serve")
+        return 1
+    except DaemonError as e:
+        print(f"❌ {str(e)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Per-job section checkpoints for the SERVPRO job creation form
+Records which form sections were verified complete so a failed fill can resume
+instead of starting over from login
+"""
+
+import os
+import json
+import time
+import hashlib
+
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkpoints")
+
+
+def get_job_id(form_data):
+    """Derive a stable job ID from the payload contents"""
+    canonical = json.dumps(form_data, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def get_checkpoint_path(job_id):
+    """Return the checkpoint file path for a job"""
+    return os.path.join(CHECKPOINT_DIR, f"{job_id}.json")
+
+
+def load_checkpoint(job_id):
+    """Load a job checkpoint, or None if the job has no usable checkpoint"""
+    try:
+        with open(get_checkpoint_path(job_id), 'r') as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"⚠️ Ignoring unreadable checkpoint for job {job_id}: {str(e)}")
+        return None
+
+
+def save_checkpoint(job_id, checkpoint):
+    """Atomically write a job checkpoint"""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    checkpoint['job_id'] = job_id
+    checkpoint['updated_at'] = time.time()
+    path = get_checkpoint_path(job_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as file:
+        json.dump(checkpoint, file, indent=2)
+    os.replace(tmp_path, path)
+    return checkpoint
+
+
+def new_checkpoint(job_id):
+    """Create and persist an empty checkpoint for a job"""
+    return save_checkpoint(job_id, {'completed_sections': [], 'attempts': 0})
+
+
+def mark_section_complete(job_id, section):
+    """Record a section as verified complete"""
+    checkpoint = load_checkpoint(job_id) or {'completed_sections': [], 'attempts': 0}
+    if section not in checkpoint['completed_sections']:
+        checkpoint['completed_sections'].append(section)
+    return save_checkpoint(job_id, checkpoint)
+
+
+def mark_section_incomplete(job_id, section):
+    """Drop a section from the verified list (e.g. after the live form lost it)"""
+    checkpoint = load_checkpoint(job_id)
+    if checkpoint and section in checkpoint['completed_sections']:
+        checkpoint['completed_sections'].remove(section)
+        save_checkpoint(job_id, checkpoint)
+    return checkpoint
+
+
+def record_attempt(job_id, error=None):
+    """Count a fill attempt and remember the last error"""
+    checkpoint = load_checkpoint(job_id) or {'completed_sections': [], 'attempts': 0}
+    checkpoint['attempts'] = checkpoint.get('attempts', 0) + 1
+    checkpoint['last_error'] = str(error) if error else None
+    return save_checkpoint(job_id, checkpoint)
+
+
+def clear_checkpoint(job_id):
+    """Remove a job checkpoint"""
+    try:
+        os.remove(get_checkpoint_path(job_id))
+    except FileNotFoundError:
+        pass
+
+
+def draft_survived(checkpoint, report):
+    """
+    Decide whether the live form still holds a previously checkpointed draft
+
+    The draft is considered lost unless most fields of the checkpointed sections
+    read back correctly. A fresh CreateJob page after a browser restart already
+    matches a few payload values through page defaults (Country is "USA"), so a
+    single matching field proves nothing.
+    """
+    completed = set(checkpoint.get('completed_sections', []))
+    if not completed:
+        return False
+    section_statuses = [
+        status for key, status in report['fields'].items()
+        if key.split('.', 1)[0] in completed
+    ]
+    if not section_statuses:
+        # Nothing checkpointed had any fields to check, so nothing was lost either
+        return True
+    passed = sum(1 for status in section_statuses if status == 'ok')
+    return passed * 2 > len(section_statuses)
+
+
+def get_failed_sections(report):
+    """Return the set of section keys that still have failed fields"""
+    return {key.split('.', 1)[0] for key in report['failed']}
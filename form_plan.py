@@ -0,0 +1,312 @@
+"""
+Form plan compiler for the SERVPRO job creation form
+Merges the declarative FIELD_REGISTRY (field_mappings.py) with the json.txt schema
+into an immutable, precomputed fill plan per customer type, cached on disk
+
+When a control index (control_index.py) is passed in, postback flags detected in
+the page source are merged into the plan and controls missing from the page are reported.
+"""
+
+import os
+import json
+import hashlib
+from collections import namedtuple
+
+from field_mappings import FIELD_REGISTRY
+from control_index import lookup_control, POSTBACK
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCHEMA_PATH = os.path.join(BASE_DIR, "json.txt")
+CACHE_DIR = os.path.join(BASE_DIR, ".form_cache")
+
+# Bump when the plan layout or compile rules change so stale cache files are ignored
+PLAN_VERSION = 2
+
+CUSTOMER_TYPES = ("Individual", "Company")
+
+# Payload section keys that differ from the schema's property names
+SCHEMA_SECTION_ALIASES = {
+    "lossDescriptionSection": "lossDescriptionAndSpecialInstruction",
+}
+
+# Telerik/ASP.NET control type -> fill strategy (also the verification readback kind)
+CONTROL_STRATEGIES = {
+    "RadComboBox": "combo",
+    "RadDropDownTree": "tree",
+    "RadTextBox": "text",
+    "RadSearchBox": "text",
+    "RadDatePicker": "date",
+    "RadMaskedTextBox": "phone",
+    "CheckBox": "checkbox",
+    "RadioButton": "radio",
+    "CheckBoxList": "services",
+    "RadListBox": "rooms",
+}
+
+PlanAction = namedtuple("PlanAction", [
+    "order",          # position in the fill sequence
+    "section",        # payload section key
+    "field",          # dotted field path inside the section
+    "control_id",     # client ID of the control (input element for Telerik inputs)
+    "control",        # Telerik/ASP.NET control type
+    "strategy",       # fill strategy, see CONTROL_STRATEGIES
+    "postback",       # True when changing the control triggers a (partial) postback
+    "depends_on",     # tuple of "section.field" keys that must be filled first
+    "title",          # schema title (or the field path)
+    "value_type",     # schema type ("string", "integer", "boolean", ...)
+    "enum",           # tuple of allowed values or None
+    "const",          # schema const or None
+    "required",       # required by the schema
+])
+
+_plan_memo = {}
+_validator_memo = {}
+
+
+def load_schema(schema_path=SCHEMA_PATH):
+    """Load the JSON schema from json.txt"""
+    with open(schema_path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def get_schema_node(schema, section, field_path):
+    """
+    Find the schema node for a section field
+
+    Returns:
+        Tuple of (node dict or {}, required flag)
+    """
+    section_node = schema.get("properties", {}).get(SCHEMA_SECTION_ALIASES.get(section, section), {})
+    node = section_node
+    required = False
+    for key in field_path.split("."):
+        required = key in node.get("required", [])
+        node = node.get("properties", {}).get(key)
+        if node is None:
+            return {}, False
+    return node, required
+
+
+def get_payload_value(data, field_path):
+    """Look up a dotted field path (e.g. 'mainPhoneNumber.number') in a section dict"""
+    value = data
+    for key in field_path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def get_customer_type(form_data):
+    """Customer type for a payload (Individual unless the customer section says otherwise)"""
+    for section in ("customerInformation", "jobAddressInformation"):
+        customer_type = (form_data.get(section) or {}).get("customerType")
+        if customer_type in CUSTOMER_TYPES:
+            return customer_type
+    return "Individual"
+
+
+def validate_payload(form_data, schema_path=SCHEMA_PATH):
+    """
+    Validate a payload against the json.txt schema
+
+    Payload section keys are mapped to the schema's names (SCHEMA_SECTION_ALIASES) first.
+
+    Returns:
+        List of error strings ("section.field: message"), empty when the payload is valid
+    """
+    # jsonschema is only needed by the job service, not by the fill path
+    from jsonschema import Draft7Validator
+
+    if not isinstance(form_data, dict):
+        return ["payload: must be a JSON object"]
+
+    validator = _validator_memo.get(schema_path)
+    if validator is None:
+        validator = _validator_memo[schema_path] = Draft7Validator(load_schema(schema_path))
+
+    aliased = {SCHEMA_SECTION_ALIASES.get(key, key): value for key, value in form_data.items()}
+    errors = []
+    for error in sorted(validator.iter_errors(aliased), key=lambda e: list(map(str, e.absolute_path))):
+        path = ".".join(str(part) for part in error.absolute_path) or "payload"
+        errors.append(f"{path}: {error.message}")
+    return errors
+
+
+def order_by_dependencies(entries):
+    """Stable topological sort: declaration order, but dependencies always come first"""
+    by_key = {}
+    for entry in entries:
+        by_key.setdefault(f"{entry['section']}.{entry['field']}", entry)
+
+    ordered = []
+    placed = set()
+    visiting = set()
+
+    def place(entry):
+        key = f"{entry['section']}.{entry['field']}"
+        if key in placed:
+            return
+        if key in visiting:
+            raise ValueError(f"Dependency cycle in field registry at {key}")
+        visiting.add(key)
+        for dependency in entry["depends_on"]:
+            if dependency in by_key:
+                place(by_key[dependency])
+        visiting.discard(key)
+        placed.add(key)
+        ordered.append(entry)
+
+    for entry in entries:
+        place(entry)
+    return ordered
+
+
+def get_registry_digest(schema_path=SCHEMA_PATH, control_index=None):
+    """Hash of everything a compiled plan depends on"""
+    digest = hashlib.sha256()
+    digest.update(str(PLAN_VERSION).encode("utf-8"))
+    digest.update(json.dumps(FIELD_REGISTRY, sort_keys=True).encode("utf-8"))
+    with open(schema_path, "rb") as file:
+        digest.update(file.read())
+    if control_index is not None:
+        digest.update(control_index["source_hash"].encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def get_indexed_postback(control_index, entry):
+    """Postback flag for a registry entry from the control index (False if not indexed)"""
+    row = lookup_control(control_index, entry["control_id"], entry["control"])
+    if row is None:
+        print(f"⚠️ {entry['section']}.{entry['field']} not found in page source: {entry['control_id']}")
+        return False
+    return bool(row[POSTBACK])
+
+
+def compile_form_plan(customer_type="Individual", schema_path=SCHEMA_PATH, control_index=None):
+    """
+    Compile the registry and schema into a fill plan for one customer type
+
+    Args:
+        customer_type: "Individual" or "Company"
+        schema_path: Path to the JSON schema (json.txt)
+        control_index: Optional index from control_index.get_control_index()
+
+    Returns:
+        Tuple of PlanAction in fill order
+    """
+    schema = load_schema(schema_path)
+
+    entries = []
+    for section, section_entries in FIELD_REGISTRY.items():
+        for entry in section_entries:
+            if entry["customer_type"] not in (None, customer_type):
+                continue
+            entries.append(dict(entry, section=section))
+
+    actions = []
+    for order, entry in enumerate(order_by_dependencies(entries)):
+        node, required = get_schema_node(schema, entry["section"], entry["field"])
+        control = entry["control"]
+        postback = entry["postback"]
+        if control_index is not None:
+            postback = postback or get_indexed_postback(control_index, entry)
+        enum = node.get("enum") or (node.get("items") or {}).get("enum")
+        actions.append(PlanAction(
+            order=order,
+            section=entry["section"],
+            field=entry["field"],
+            control_id=entry["control_id"],
+            control=control,
+            strategy=CONTROL_STRATEGIES[control],
+            postback=postback,
+            depends_on=entry["depends_on"],
+            title=node.get("title", entry["field"]),
+            value_type=node.get("type"),
+            enum=tuple(enum) if enum else None,
+            const=node.get("const"),
+            required=required,
+        ))
+    return tuple(actions)
+
+
+def get_plan_cache_path(customer_type, digest):
+    """Cache file for a compiled plan"""
+    return os.path.join(CACHE_DIR, f"form_plan_{customer_type.lower()}_{digest}.json")
+
+
+def load_cached_plan(path):
+    """Load a compiled plan from disk, or None if missing/unreadable"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            rows = json.load(file)
+    except (OSError, json.JSONDecodeError):
+        return None
+    return tuple(
+        PlanAction(**dict(row, depends_on=tuple(row["depends_on"]),
+                          enum=tuple(row["enum"]) if row["enum"] is not None else None))
+        for row in rows
+    )
+
+
+def save_cached_plan(path, plan):
+    """Atomically write a compiled plan to disk"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump([action._asdict() for action in plan], file)
+    os.replace(tmp_path, path)
+
+
+def get_form_plan(customer_type="Individual", schema_path=SCHEMA_PATH, control_index=None):
+    """
+    Return the compiled plan for a customer type
+
+    Plans are memoized per process and cached on disk keyed by a hash of the
+    registry, the schema and (if given) the control index's page source. The
+    registry and schema are only hashed on a memo miss, since the plan is looked up
+    many times per job.
+    """
+    if customer_type not in CUSTOMER_TYPES:
+        customer_type = "Individual"
+    memo_key = (customer_type, schema_path, control_index["source_hash"] if control_index is not None else None)
+    if memo_key in _plan_memo:
+        return _plan_memo[memo_key]
+
+    digest = get_registry_digest(schema_path, control_index)
+    cache_path = get_plan_cache_path(customer_type, digest)
+    plan = load_cached_plan(cache_path)
+    if plan is None:
+        plan = compile_form_plan(customer_type, schema_path, control_index)
+        try:
+            save_cached_plan(cache_path, plan)
+        except OSError as e:
+            print(f"⚠️ Could not cache form plan: {str(e)}")
+
+    _plan_memo[memo_key] = plan
+    return plan
+
+
+def get_section_actions(plan, section):
+    """Plan actions belonging to one section, in fill order"""
+    return tuple(action for action in plan if action.section == section)
+
+
+def iter_plan_values(plan, form_data, sections=None):
+    """
+    Yield (action, value) for every plan action the payload provides a value for
+
+    Missing values (None) and empty strings are skipped, matching the fillers' behavior of
+    leaving blanks untouched. False and 0 are values: an explicit false unchecks a checkbox
+    left checked on a reused or resumed page.
+    """
+    for action in plan:
+        if sections is not None and action.section not in sections:
+            continue
+        section_data = form_data.get(action.section)
+        if not isinstance(section_data, dict):
+            continue
+        value = get_payload_value(section_data, action.field)
+        if value is None or value == "":
+            continue
+        yield action, value
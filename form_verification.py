@@ -0,0 +1,315 @@
+"""
+Post-fill verification for the SERVPRO job creation form
+Reads back the effective value of every mapped control in one script call
+and diffs it against the JSON payload
+"""
+
+import re
+
+from form_plan import get_form_plan, get_customer_type, iter_plan_values
+from control_drift import get_quarantined_fields
+
+# Readback kinds are the plan's fill strategies:
+#   text     - RadTextBox / RadSearchBox input (value from the Telerik client object)
+#   combo    - RadComboBox (selected item + ClientState, which is what the server reads)
+#   tree     - RadDropDownTree (selected entry text)
+#   date     - RadDatePicker (selected date)
+#   phone    - RadMaskedTextBox
+#   checkbox - plain ASP.NET checkbox
+#   services - the Division checkbox table
+#   rooms    - the chosen rooms RadListBox
+# Radio buttons are not read back; the customer type shows up in which panel's fields hold values.
+UNVERIFIED_STRATEGIES = ('radio',)
+
+
+# Single batched readback: arguments[0] is a list of [control_id, kind] pairs,
+# the result maps control_id -> observed state
+READBACK_SCRIPT = """
+var targets = arguments[0];
+var out = {};
+function findControl(id) {
+    try { return (typeof $find === 'function') ? $find(id) : null; } catch (e) { return null; }
+}
+function clientState(id) {
+    var el = document.getElementById(id + '_ClientState');
+    if (!el || !el.value) { return null; }
+    try { return JSON.parse(el.value); } catch (e) { return el.value; }
+}
+for (var i = 0; i < targets.length; i++) {
+    var id = targets[i][0], kind = targets[i][1], r = {found: false};
+    try {
+        if (kind === 'combo') {
+            var baseId = id.replace(/_Input$/, '');
+            var combo = findControl(baseId);
+            var input = document.getElementById(id);
+            r.found = !!(combo || input);
+            r.text = input ? input.value : null;
+            if (combo) {
+                r.text = combo.get_text();
+                var item = combo.get_selectedItem ? combo.get_selectedItem() : null;
+                r.selectedText = item ? item.get_text() : null;
+                r.selectedValue = item ? item.get_value() : null;
+            }
+            r.clientState = clientState(baseId);
+        } else if (kind === 'tree') {
+            var ddt = findControl(id);
+            var fake = document.querySelector('#' + id + ' .rddtFakeInput');
+            r.found = !!(ddt || fake);
+            r.text = (fake && fake.className.indexOf('rddtEmptyMessage') < 0) ? fake.textContent.trim() : null;
+            if (ddt) {
+                r.text = ddt.get_selectedText() || null;
+                r.value = ddt.get_selectedValue();
+            }
+        } else if (kind === 'date') {
+            var pickerId = id.replace(/_dateInput$/, '');
+            var picker = findControl(pickerId);
+            var dateInput = document.getElementById(id);
+            r.found = !!(picker || dateInput);
+            r.text = dateInput ? dateInput.value : null;
+            var d = picker && picker.get_selectedDate ? picker.get_selectedDate() : null;
+            if (d) {
+                r.value = ('0' + (d.getMonth() + 1)).slice(-2) + '/' + ('0' + d.getDate()).slice(-2) + '/' + d.getFullYear();
+            }
+        } else if (kind === 'text' || kind === 'phone') {
+            var box = findControl(id);
+            var el = document.getElementById(id);
+            r.found = !!(box || el);
+            r.text = el ? el.value : null;
+            r.value = (box && box.get_value) ? box.get_value() : r.text;
+        } else if (kind === 'checkbox') {
+            var cb = document.getElementById(id);
+            r.found = !!cb;
+            r.value = cb ? cb.checked : null;
+        } else if (kind === 'services') {
+            var table = document.getElementById(id);
+            r.found = !!table;
+            r.value = [];
+            if (table) {
+                var boxes = table.querySelectorAll('input[type=checkbox]');
+                for (var j = 0; j < boxes.length; j++) {
+                    if (!boxes[j].checked) { continue; }
+                    var label = table.querySelector('label[for="' + boxes[j].id + '"]');
+                    r.value.push(label ? label.textContent.trim() : boxes[j].value);
+                }
+            }
+        } else if (kind === 'rooms') {
+            var listBox = findControl(id);
+            var container = document.getElementById(id);
+            r.found = !!(listBox || container);
+            r.value = [];
+            if (listBox && listBox.get_items) {
+                var items = listBox.get_items();
+                for (var k = 0; k < items.get_count(); k++) { r.value.push(items.getItem(k).get_text()); }
+            } else if (container) {
+                var spans = container.querySelectorAll('.rlbText');
+                for (var m = 0; m < spans.length; m++) { r.value.push(spans[m].textContent.trim()); }
+            }
+        }
+    } catch (e) {
+        r.error = String(e);
+    }
+    out[id] = r;
+}
+return out;
+"""
+
+
+def build_verification_targets(form_data, sections=None):
+    """
+    Build the list of controls to verify for a payload
+
+    Only fields the fillers would actually touch (present and not an empty string) are included.
+
+    Returns:
+        List of dicts with section, field, control_id, kind, expected value and the
+        plan action (used to refill the field)
+    """
+    plan = get_form_plan(get_customer_type(form_data))
+    return [
+        {
+            'section': action.section,
+            'field': action.field,
+            'control_id': action.control_id,
+            'kind': action.strategy,
+            'expected': value,
+            'action': action,
+        }
+        for action, value in iter_plan_values(plan, form_data, sections)
+        if action.strategy not in UNVERIFIED_STRATEGIES
+    ]
+
+
+def read_back_form_state(driver, targets):
+    """Read the live state of all target controls with a single execute_script call"""
+    if not targets:
+        return {}
+    return driver.execute_script(READBACK_SCRIPT, [[t['control_id'], t['kind']] for t in targets]) or {}
+
+
+def normalize_text(value):
+    """Normalize a value for case/whitespace-insensitive comparison"""
+    if value is None:
+        return ''
+    return re.sub(r'\s+', ' ', str(value)).strip().lower()
+
+
+def normalize_date(value):
+    """Normalize M/D/YYYY style dates to MM/DD/YYYY"""
+    match = re.match(r'^\s*(\d{1,2})/(\d{1,2})/(\d{4})', str(value or ''))
+    if not match:
+        return normalize_text(value)
+    month, day, year = match.groups()
+    return f"{int(month):02d}/{int(day):02d}/{year}"
+
+
+def normalize_phone(value):
+    """Compare phone numbers on their last 10 digits (mask and country code ignored)"""
+    return ''.join(filter(str.isdigit, str(value or '')))[-10:]
+
+
+def service_matches(service, label):
+    """Same loose matching rule fill_division_services uses for service labels"""
+    return service.lower() in label.lower() or label.lower() in service.lower()
+
+
+def compare_target(target, state):
+    """
+    Compare one target against its readback state
+
+    Returns:
+        Tuple of (status, actual) where status is 'ok', 'missing', 'mismatch' or 'unselected'
+    """
+    kind = target['kind']
+    expected = target['expected']
+
+    if not state or not state.get('found'):
+        return 'missing', None
+    if state.get('error'):
+        return 'mismatch', state['error']
+
+    if kind == 'combo':
+        client_state = state.get('clientState')
+        committed_text = client_state.get('text') if isinstance(client_state, dict) else None
+        committed_value = client_state.get('value') if isinstance(client_state, dict) else None
+        actual = state.get('selectedText') or committed_text or state.get('text')
+        if normalize_text(state.get('selectedText')) == normalize_text(expected):
+            return 'ok', actual
+        # ClientState text alone is just what was typed (set_text); the server needs an item value
+        if committed_value and normalize_text(committed_text) == normalize_text(expected):
+            return 'ok', actual
+        if normalize_text(committed_text) == normalize_text(expected) or \
+                normalize_text(state.get('text')) == normalize_text(expected):
+            # Text is in the input but no item is selected - the server will ignore it
+            return 'unselected', actual
+        return 'mismatch', actual
+
+    if kind == 'tree':
+        actual = state.get('text')
+        return ('ok' if normalize_text(actual) == normalize_text(expected) else 'mismatch'), actual
+
+    if kind == 'date':
+        actual = state.get('value') or state.get('text')
+        return ('ok' if state.get('value') and normalize_date(actual) == normalize_date(expected) else 'mismatch'), actual
+
+    if kind == 'phone':
+        actual = state.get('value') or state.get('text')
+        return ('ok' if normalize_phone(actual) == normalize_phone(expected) else 'mismatch'), actual
+
+    if kind == 'checkbox':
+        actual = bool(state.get('value'))
+        return ('ok' if actual == bool(expected) else 'mismatch'), actual
+
+    if kind == 'services':
+        actual = state.get('value') or []
+        missing = [s for s in expected if not any(service_matches(s, label) for label in actual)]
+        return ('ok' if not missing else 'mismatch'), actual
+
+    if kind == 'rooms':
+        actual = state.get('value') or []
+        chosen = {normalize_text(room) for room in actual}
+        missing = [room for room in expected if normalize_text(room) not in chosen]
+        return ('ok' if not missing else 'mismatch'), actual
+
+    actual = state.get('value')
+    return ('ok' if normalize_text(actual) == normalize_text(expected) else 'mismatch'), actual
+
+
+def diff_form_state(targets, states):
+    """
+    Diff readback states against the expected payload values
+
+    Returns:
+        Report dict: {'checked': n, 'passed': n, 'fields': {key: status},
+                      'failed': {key: {...}}, 'retry': [targets]}
+    """
+    report = {'checked': 0, 'passed': 0, 'fields': {}, 'failed': {}, 'retry': []}
+    for target in targets:
+        key = f"{target['section']}.{target['field']}"
+        status, actual = compare_target(target, states.get(target['control_id']))
+        report['checked'] += 1
+        report['fields'][key] = status
+        if status == 'ok':
+            report['passed'] += 1
+        else:
+            report['failed'][key] = {
+                'status': status,
+                'expected': target['expected'],
+                'actual': actual,
+            }
+            report['retry'].append(target)
+    return report
+
+
+def verify_form(driver, form_data, sections=None):
+    """
+    Verify the live form against the payload with one batched readback
+
+    Args:
+        driver: Selenium WebDriver instance
+        form_data: Dictionary containing form data
+        sections: Optional iterable of section keys to restrict the check to
+
+    Returns:
+        Verification report (see diff_form_state), plus 'quarantined' field keys
+        skipped because of control drift (see control_drift.py)
+    """
+    quarantined = get_quarantined_fields(driver)
+    targets = [
+        target for target in build_verification_targets(form_data, sections)
+        if f"{target['section']}.{target['field']}" not in quarantined
+    ]
+    states = read_back_form_state(driver, targets)
+    report = diff_form_state(targets, states)
+    # Quarantined fields were never filled; list them instead of failing them
+    report['quarantined'] = sorted(
+        key for key in quarantined if sections is None or key.split('.', 1)[0] in sections
+    )
+    return report
+
+
+def reverify_targets(driver, targets):
+    """Re-read and diff only the given targets (e.g. the ones that were retried)"""
+    states = read_back_form_state(driver, targets)
+    return diff_form_state(targets, states)
+
+
+def merge_reverify_report(report, retry_report):
+    """Fold a re-verification of the failed subset back into the full report"""
+    for key, status in retry_report['fields'].items():
+        report['fields'][key] = status
+        if status == 'ok':
+            report['failed'].pop(key, None)
+        else:
+            report['failed'][key] = retry_report['failed'][key]
+    report['passed'] = sum(1 for status in report['fields'].values() if status == 'ok')
+    report['retry'] = retry_report['retry']
+    return report
+
+
+def print_verification_report(report):
+    """Print a compact summary of a verification report"""
+    print(f"🔎 Verification: {report['passed']}/{report['checked']} fields confirmed")
+    for key, failure in report['failed'].items():
+        print(f"  ❌ {key}: {failure['status']} (expected {failure['expected']!r}, got {failure['actual']!r})")
+    for key in report.get('quarantined', []):
+        print(f"  🚧 {key}: quarantined (control drifted, not filled)")
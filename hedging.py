@@ -0,0 +1,60 @@
+"""
+Hedged execution for jobs stuck on a bad session
+A job whose current attempt has run longer than the HEDGE_PERCENTILE of recent fill
+durations is handed to an idle worker as a hedge: a second copy of the same job,
+filled on that worker's own session while the first copy keeps going. At most one
+hedge runs per job, and only workers that found no other job to claim take one.
+
+Both copies race to the save gate (JobQueue.claim_save), a one-time claim on the
+job's row - one row per idempotency key. The first copy there saves and stores the
+result. The other one stops before saving: at the gate, or earlier at its next
+progress event, when its lease extension finds the job taken (job_queue.LeaseKeeper).
+A hung session therefore costs a p95 of latency instead of a lease timeout, and a
+job is never saved twice.
+"""
+
+from scheduler import percentile
+
+# Hedge an attempt that has been running longer than this percentile of fill durations
+HEDGE_PERCENTILE = 95
+
+# Fills finished within this many seconds feed the percentile
+HEDGE_WINDOW = 24 * 60 * 60
+
+# No hedging until this many fills have finished in the window
+HEDGE_MIN_SAMPLES = 20
+
+# Never hedge an attempt younger than this, however fast fills usually are
+HEDGE_MIN_SECONDS = 120
+
+# Seconds the computed threshold is reused before the durations are read again
+HEDGE_REFRESH = 60
+
+
+def get_hedge_after(durations):
+    """
+    Running time after which an attempt gets a hedge
+
+    Args:
+        durations: Sorted fill durations (seconds) of recently finished jobs
+
+    Returns:
+        Seconds, or None while there are fewer than HEDGE_MIN_SAMPLES durations
+    """
+    if len(durations) < HEDGE_MIN_SAMPLES:
+        return None
+    return max(HEDGE_MIN_SECONDS, percentile(durations, HEDGE_PERCENTILE))
+
+
+def get_hedge_checkpoint_id(job_id):
+    """Checkpoint ID of a hedge copy, so it never resumes from the first copy's browser state"""
+    return f"{job_id}-hedge"
+
+
+def print_hedge_summary(hedge_after, samples):
+    """Print the current hedging threshold"""
+    if hedge_after is None:
+        print(f"🪁 Hedging off: {samples} of {HEDGE_MIN_SAMPLES} finished fills needed")
+    else:
+        print(f"🪁 Hedging attempts running longer than {hedge_after:.0f}s "
+              f"(p{HEDGE_PERCENTILE} of {samples} fills)")
@@ -0,0 +1,869 @@
+"""
+Durable job queue for SERVPRO job creation
+SQLite in WAL mode, shared by the job service and any number of worker processes.
+
+- Every job has an idempotency key (by default the payload hash from
+  form_checkpoint.get_job_id), so submitting the same payload twice returns the
+  existing job instead of creating a second SERVPRO job.
+- Workers claim jobs with a lease. A leased job is invisible to other workers until
+  its lease expires (visibility timeout); a worker that crashes mid-job therefore
+  only delays the job, it does not lose it. A worker extends its lease as the fill
+  makes progress, and abandons the fill if the lease was lost to another worker.
+- Failed attempts are retried with exponential backoff up to max_attempts, then the
+  job is moved to the dead-letter state for a human to look at (requeue_dead).
+- Jobs are claimed earliest-deadline-first; the deadline comes from the payload's
+  priority and date of loss (see scheduler.py). A worker whose session last filled a
+  job for some office prefers that office's jobs (warm item caches, see
+  office_cache.py) unless another job is overdue or due AFFINITY_SLACK seconds sooner.
+- An attempt running far longer than usual gets a hedge: an idle worker fills a
+  second copy of the job and the first copy to reach the save gate wins (see hedging.py).
+- Before claiming, a worker takes a slot of its account's and the host's adaptive
+  concurrency limit (see concurrency.py), so the fleet never has more jobs in
+  flight than the server currently handles well.
+
+Usage:
+    python job_queue.py enqueue job1.json [job2.json ...]
+    python job_queue.py work [--workers N]
+    python job_queue.py status
+    python job_queue.py stats          # wait-time percentiles, concurrency limits, hedging
+    python job_queue.py dead
+    python job_queue.py requeue JOB_ID
+    python job_queue.py check-plan     # claim queries must not sort the queue (exit 1 if they do)
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+
+from form_checkpoint import get_job_id, clear_checkpoint
+from progress import emit, set_progress_sink, set_progress_context
+from cancellation import JobCancelled, run_with_cancel_event
+from office_cache import get_job_office, get_cache_stats
+from concurrency import ConcurrencyLimiter, LatencyRecorder, get_limit_keys, print_limits
+from scheduler import get_due_at, summarize_waits, print_wait_summary, WAIT_STATS_WINDOW
+from hedging import get_hedge_after, get_hedge_checkpoint_id, print_hedge_summary, HEDGE_WINDOW, HEDGE_REFRESH
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+QUEUE_PATH = os.path.join(BASE_DIR, "jobs.db")
+
+# Seconds a claimed job stays invisible to other workers without progress from its fill
+LEASE_SECONDS = 900
+
+# Minimum seconds between lease extensions of a running fill
+LEASE_EXTEND_INTERVAL = 60
+
+MAX_ATTEMPTS = 3
+
+# Delay before retry n is RETRY_BACKOFF * 2 ** (n - 1) seconds
+RETRY_BACKOFF = 30
+
+# Seconds between sweeps that dead-letter expired leases with no attempts left
+DEAD_SWEEP_INTERVAL = 30
+
+# Idle sleep of a worker that found nothing to claim
+POLL_INTERVAL = 0.5
+
+# Pause before a worker retries opening its browser session
+SESSION_RETRY_DELAY = 30
+
+# How much later a job of the session's own office may be due than the queue head
+# and still be claimed first
+AFFINITY_SLACK = 600
+
+# queued: waiting (or waiting for a retry); leased: claimed by a worker;
+# done: finished with a result; dead: out of attempts
+STATUSES = ("queued", "leased", "done", "dead")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    last_error TEXT
+);
+"""
+
+# Columns added after the first release: name -> definition (see JobQueue.migrate)
+ADDED_COLUMNS = {
+    "priority": "TEXT NOT NULL DEFAULT 'Medium'",
+    "due_at": "REAL NOT NULL DEFAULT 0",
+    "first_claimed_at": "REAL",
+    "office": "TEXT",
+    "leased_at": "REAL",
+    "hedge_owner": "TEXT",
+    "saved_by": "TEXT",
+}
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, due_at);
+CREATE INDEX IF NOT EXISTS jobs_office ON jobs (status, office, due_at);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (status, updated_at);
+CREATE INDEX IF NOT EXISTS jobs_owner ON jobs (lease_owner) WHERE lease_owner IS NOT NULL;
+"""
+
+# The visible job with the earliest deadline: one indexed LIMIT 1 per status instead of
+# sorting every visible job. The queued side must walk jobs_due in deadline order; left
+# to itself SQLite picks jobs_ready for the available_at filter and sorts every visible
+# queued job inside the write transaction (see check_claim_plan)
+CLAIM_SQL = (
+    "SELECT id, due_at FROM (SELECT id, due_at FROM jobs INDEXED BY jobs_due WHERE status = 'queued' "
+    "AND available_at <= ? ORDER BY due_at LIMIT 1) UNION ALL "
+    "SELECT id, due_at FROM (SELECT id, due_at FROM jobs WHERE status = 'leased' "
+    "AND available_at <= ? AND attempts < max_attempts ORDER BY available_at LIMIT 1) ORDER BY due_at LIMIT 1"
+)
+
+# Earliest-due queued job of one office (pinned to jobs_office in deadline order, as above)
+AFFINITY_SQL = (
+    "SELECT id, due_at FROM jobs INDEXED BY jobs_office WHERE status = 'queued' AND office = ? AND available_at <= ? "
+    "ORDER BY due_at LIMIT 1"
+)
+
+JOB_COLUMNS = ("id", "idempotency_key", "status", "priority", "office", "attempts", "max_attempts", "due_at",
+               "available_at", "lease_owner", "hedge_owner", "created_at", "first_claimed_at", "updated_at",
+               "result", "last_error")
+
+
+def get_worker_owner(worker_id, pid=None):
+    """Lease owner name for a worker process (unique across hosts and restarts)"""
+    return f"{socket.gethostname()}:{pid or os.getpid()}:{worker_id}"
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue
+
+    Safe to use from several threads (one connection per thread) and several
+    processes (each opens the same file). Read-then-write operations use BEGIN
+    IMMEDIATE so claims never race; single-statement writes run in autocommit,
+    which is just as atomic and saves two round trips. WAL mode keeps readers from
+    blocking writers.
+    """
+
+    def __init__(self, path=QUEUE_PATH, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.local = threading.local()
+        self.hedge_after = None
+        self.hedge_samples = 0
+        self.hedge_checked_at = 0
+        self.swept_at = 0
+        self.migrate()
+
+    def migrate(self):
+        """Create the table, add columns missing from older queue files, create indexes"""
+        db = self.connection()
+        db.executescript(SCHEMA)
+        existing = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+        for column, definition in ADDED_COLUMNS.items():
+            if column not in existing:
+                db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+                if column == "due_at":
+                    db.execute("UPDATE jobs SET due_at = created_at")
+                if column == "office":
+                    db.execute("UPDATE jobs SET office = json_extract(payload, '$.generalInformation.officeName')")
+        db.executescript(INDEXES)
+
+    def connection(self):
+        """This thread's connection"""
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            # WAL + NORMAL: durable across process crashes, one fsync per checkpoint
+            db.execute("PRAGMA synchronous=NORMAL")
+            # Keep the indexes of a deep backlog in memory (default cache is 2 MB)
+            db.execute("PRAGMA cache_size=-32000")
+            self.local.db = db
+        return db
+
+    def transaction(self):
+        return _Transaction(self.connection())
+
+    def write(self, sql, params):
+        """Run a single-statement write in autocommit (atomic on its own; no BEGIN / COMMIT round trips)"""
+        return self.connection().execute(sql, params)
+
+    def close(self):
+        db = getattr(self.local, "db", None)
+        if db is not None:
+            db.close()
+            self.local.db = None
+
+    def enqueue(self, payload, idempotency_key=None):
+        """
+        Add one job unless a job with the same idempotency key exists
+
+        Returns:
+            Tuple of (job dict, created flag)
+        """
+        return self.enqueue_many([payload], [idempotency_key])[0]
+
+    def enqueue_many(self, payloads, idempotency_keys=None):
+        """Add several jobs in one transaction; returns a list of (job dict, created flag)"""
+        keys = idempotency_keys or [None] * len(payloads)
+        now = time.time()
+        added = []
+        with self.transaction() as db:
+            for payload, key in zip(payloads, keys):
+                key = key or get_job_id(payload)
+                priority, due_at = get_due_at(payload, now)
+                cursor = db.execute(
+                    "INSERT INTO jobs (id, idempotency_key, payload, status, priority, office, due_at, "
+                    "max_attempts, available_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(idempotency_key) DO NOTHING",
+                    (uuid.uuid4().hex, key, json.dumps(payload), priority, get_job_office(payload), due_at,
+                     self.max_attempts, now, now, now),
+                )
+                row = db.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (key,)).fetchone()
+                added.append((row_to_job(row), cursor.rowcount == 1))
+        return added
+
+    def claim(self, owner, office=None, lease_seconds=LEASE_SECONDS, hedge=True):
+        """
+        Lease the visible job with the earliest deadline
+
+        Queued jobs (past any retry backoff) and leased jobs whose lease has expired
+        are both visible; an expired job that has used up its attempts is dead-lettered
+        instead (swept every DEAD_SWEEP_INTERVAL seconds, invisible meanwhile).
+        With nothing visible, the worker gets a hedge of a slow running job (see claim_hedge).
+
+        Args:
+            owner: Lease owner (see get_worker_owner)
+            office: Office the worker's session is primed for; its oldest-due queued job
+                wins unless the queue head is overdue or due more than AFFINITY_SLACK sooner
+            lease_seconds: Lease length
+            hedge: Fall back to claim_hedge when nothing is visible
+
+        Returns:
+            Job dict including 'payload' and 'hedge', or None when nothing is ready
+        """
+        now = time.time()
+        if now - self.swept_at >= DEAD_SWEEP_INTERVAL:
+            self.write(
+                "UPDATE jobs SET status = 'dead', lease_owner = NULL, hedge_owner = NULL, updated_at = ?, "
+                "last_error = COALESCE(last_error, 'Lease expired') "
+                "WHERE status = 'leased' AND available_at <= ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            self.swept_at = now
+        with self.transaction() as db:
+            row = db.execute(CLAIM_SQL, (now, now)).fetchone()
+            if row is not None and office is not None and row["due_at"] > now:
+                affine = db.execute(AFFINITY_SQL, (office, now)).fetchone()
+                if affine is not None and affine["due_at"] - row["due_at"] <= AFFINITY_SLACK:
+                    row = affine
+            if row is not None:
+                db.execute(
+                    "UPDATE jobs SET status = 'leased', lease_owner = ?, hedge_owner = NULL, saved_by = NULL, "
+                    "available_at = ?, leased_at = ?, attempts = attempts + 1, "
+                    "first_claimed_at = COALESCE(first_claimed_at, ?), updated_at = ? WHERE id = ?",
+                    (owner, now + lease_seconds, now, now, now, row["id"]),
+                )
+                row = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        if row is None:
+            return self.claim_hedge(owner) if hedge else None
+        return dict(row_to_job(row, with_payload=True), hedge=False)
+
+    def get_hedge_after(self):
+        """Running time after which an attempt gets a hedge (None: hedging off); re-read every HEDGE_REFRESH s"""
+        now = time.time()
+        if now - self.hedge_checked_at >= HEDGE_REFRESH:
+            rows = self.connection().execute(
+                "SELECT json_extract(result, '$.duration') AS seconds FROM jobs "
+                "WHERE status = 'done' AND updated_at >= ? AND seconds IS NOT NULL",
+                (now - HEDGE_WINDOW,),
+            ).fetchall()
+            self.hedge_after = get_hedge_after(sorted(row[0] for row in rows))
+            self.hedge_samples = len(rows)
+            self.hedge_checked_at = now
+        return self.hedge_after
+
+    def claim_hedge(self, owner):
+        """
+        Become the hedge of the leased job whose attempt has run longest past get_hedge_after()
+
+        The first owner keeps its lease; the job has no hedge yet, nothing has passed its
+        save gate and its lease has not expired (then it is claimed normally).
+
+        Returns:
+            Job dict including 'payload', with 'hedge' True, or None
+        """
+        hedge_after = self.get_hedge_after()
+        if hedge_after is None:
+            return None
+        now = time.time()
+        with self.transaction() as db:
+            row = db.execute(
+                "SELECT id FROM jobs WHERE status = 'leased' AND hedge_owner IS NULL AND saved_by IS NULL "
+                "AND lease_owner != ? AND leased_at <= ? AND available_at > ? ORDER BY leased_at LIMIT 1",
+                (owner, now - hedge_after, now),
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE jobs SET hedge_owner = ?, updated_at = ? WHERE id = ?", (owner, now, row["id"]))
+            row = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        print(f"🪁 Hedging job {row['id']}: its attempt has run {now - row['leased_at']:.0f}s (> {hedge_after:.0f}s)")
+        return dict(row_to_job(row, with_payload=True), hedge=True)
+
+    def claim_save(self, job_id, owner):
+        """
+        Save gate: the first copy of a job (leased or hedge) to get here may save it
+
+        Returns:
+            True for the winner (and again for the same owner), False for everyone else
+        """
+        now = time.time()
+        cursor = self.write(
+            "UPDATE jobs SET saved_by = ?, updated_at = ? WHERE id = ? AND status = 'leased' "
+            "AND ? IN (lease_owner, hedge_owner) AND (saved_by IS NULL OR saved_by = ?)",
+            (owner, now, job_id, owner, owner),
+        )
+        return cursor.rowcount == 1
+
+    def extend_lease(self, job_id, owner, lease_seconds=LEASE_SECONDS):
+        """Push a held lease's expiry out; False if the lease was lost (or the other copy passed the save gate)"""
+        now = time.time()
+        cursor = self.write(
+            "UPDATE jobs SET available_at = ?, updated_at = ? WHERE id = ? AND status = 'leased' "
+            "AND ? IN (lease_owner, hedge_owner) AND (saved_by IS NULL OR saved_by = ?)",
+            (now + lease_seconds, now, job_id, owner, owner),
+        )
+        return cursor.rowcount == 1
+
+    def extend_owner(self, owner, lease_seconds=LEASE_SECONDS):
+        """Push out the leases of every job held by owner (its node is alive); returns the count"""
+        now = time.time()
+        cursor = self.write(
+            "UPDATE jobs SET available_at = ?, updated_at = ? WHERE status = 'leased' "
+            "AND ? IN (lease_owner, hedge_owner)",
+            (now + lease_seconds, now, owner),
+        )
+        return cursor.rowcount
+
+    def complete(self, job_id, owner, result):
+        """Store a job's result; False if the lease was lost to another worker (or the other copy)"""
+        now = time.time()
+        cursor = self.write(
+            "UPDATE jobs SET status = 'done', result = ?, lease_owner = NULL, hedge_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND ? IN (lease_owner, hedge_owner) "
+            "AND (saved_by IS NULL OR saved_by = ?)",
+            (json.dumps(result), now, job_id, owner, owner),
+        )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, owner, error, result=None):
+        """
+        Record a failed attempt: retry later with backoff, or dead-letter the job
+
+        A failed copy of a hedged job only drops out; the other copy carries on.
+
+        Returns:
+            'queued', 'dead', 'hedged' (the other copy carries on), or None if the lease was lost
+        """
+        now = time.time()
+        with self.transaction() as db:
+            row = db.execute(
+                "SELECT attempts, max_attempts, lease_owner, hedge_owner FROM jobs "
+                "WHERE id = ? AND status = 'leased' AND ? IN (lease_owner, hedge_owner)",
+                (job_id, owner),
+            ).fetchone()
+            if row is None:
+                return None
+            if row["hedge_owner"] is not None:
+                other = row["hedge_owner"] if owner == row["lease_owner"] else row["lease_owner"]
+                db.execute(
+                    "UPDATE jobs SET lease_owner = ?, hedge_owner = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                    (other, error, now, job_id),
+                )
+                return 'hedged'
+            status = 'dead' if row["attempts"] >= row["max_attempts"] else 'queued'
+            retry_at = now + RETRY_BACKOFF * 2 ** (row["attempts"] - 1)
+            db.execute(
+                "UPDATE jobs SET status = ?, available_at = ?, lease_owner = NULL, last_error = ?, "
+                "result = ?, updated_at = ? WHERE id = ?",
+                (status, retry_at, error, json.dumps(result) if result is not None else None, now, job_id),
+            )
+        return status
+
+    def release_owner(self, owner):
+        """
+        Make every job leased by owner visible again now (its worker is known dead)
+
+        Its hedges are dropped, and a job it shares with a live hedge passes to the hedge.
+        """
+        now = time.time()
+        with self.transaction() as db:
+            db.execute(
+                "UPDATE jobs SET hedge_owner = NULL, updated_at = ? WHERE status = 'leased' AND hedge_owner = ?",
+                (now, owner),
+            )
+            handed = db.execute(
+                "UPDATE jobs SET lease_owner = hedge_owner, hedge_owner = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_owner = ? AND hedge_owner IS NOT NULL",
+                (now, owner),
+            ).rowcount
+            cursor = db.execute(
+                "UPDATE jobs SET available_at = ?, updated_at = ? WHERE status = 'leased' AND lease_owner = ?",
+                (now, now, owner),
+            )
+        return handed + cursor.rowcount
+
+    def requeue_dead(self, job_id):
+        """Give a dead-lettered job a fresh set of attempts"""
+        now = time.time()
+        cursor = self.write(
+            "UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'dead'",
+            (now, now, job_id),
+        )
+        return cursor.rowcount == 1
+
+    def get(self, job_id, with_payload=False):
+        """Job dict by ID, or None"""
+        row = self.connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row_to_job(row, with_payload) if row else None
+
+    def list_jobs(self, status, limit=100):
+        """Jobs in one status, oldest first"""
+        rows = self.connection().execute(
+            "SELECT * FROM jobs WHERE status = ? ORDER BY created_at LIMIT ?", (status, limit)
+        ).fetchall()
+        return [row_to_job(row) for row in rows]
+
+    def counts(self):
+        """Number of jobs per status"""
+        rows = self.connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def load_stats(self, window):
+        """
+        Queue load for autoscaling
+
+        Returns:
+            Dict with 'depth' (queued jobs), 'leased', 'arrivals' and 'cat_arrivals'
+            (jobs submitted in the last window seconds; CAT = catReference set),
+            'job_seconds' (mean fill duration of jobs finished in the window, or None)
+            and 'window'
+        """
+        now = time.time()
+        db = self.connection()
+        counts = self.counts()
+        arrivals, cat_arrivals = db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(COALESCE(json_extract(payload, '$.generalInformation.catReference'), '') "
+            "!= ''), 0) FROM jobs WHERE created_at >= ?",
+            (now - window,),
+        ).fetchone()
+        job_seconds = db.execute(
+            "SELECT AVG(json_extract(result, '$.duration')) FROM jobs WHERE status = 'done' AND updated_at >= ?",
+            (now - window,),
+        ).fetchone()[0]
+        return {
+            'depth': counts.get('queued', 0),
+            'leased': counts.get('leased', 0),
+            'arrivals': arrivals,
+            'cat_arrivals': cat_arrivals,
+            'job_seconds': job_seconds,
+            'window': window,
+        }
+
+    def hourly_arrivals(self, days):
+        """Jobs submitted per local hour of day (0-23) over the last `days` days"""
+        rows = self.connection().execute(
+            "SELECT CAST(strftime('%H', created_at, 'unixepoch', 'localtime') AS INTEGER), COUNT(*) "
+            "FROM jobs WHERE created_at >= ? GROUP BY 1",
+            (time.time() - days * 24 * 60 * 60,),
+        ).fetchall()
+        return {hour: count for hour, count in rows}
+
+    def wait_stats(self, window=WAIT_STATS_WINDOW):
+        """
+        Queue wait-time percentiles per priority class
+
+        Covers jobs first picked up within the last window seconds; jobs still
+        queued count with their wait so far, so a backlog shows up before it drains.
+        """
+        now = time.time()
+        rows = self.connection().execute(
+            "SELECT priority, COALESCE(first_claimed_at, ?) - created_at FROM jobs "
+            "WHERE first_claimed_at >= ? OR (status = 'queued' AND first_claimed_at IS NULL)",
+            (now, now - window),
+        ).fetchall()
+        waits = {}
+        for priority, wait in rows:
+            waits.setdefault(priority, []).append(wait)
+        return summarize_waits(waits)
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK around a block"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        return self.db
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        return False
+
+
+def check_claim_plan(job_queue):
+    """
+    Regression check of the claim queries' plans: no step may sort jobs rows
+
+    Only the outer ORDER BY of CLAIM_SQL, which merges at most one row per status, may
+    use a temp B-tree.
+
+    Returns:
+        List of problems (empty when the plans are fine)
+    """
+    db = job_queue.connection()
+    problems = []
+    for name, sql, params in (("claim", CLAIM_SQL, (0, 0)), ("affinity", AFFINITY_SQL, ("", 0))):
+        rows = db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+        details = {row[0]: row[3] for row in rows}
+        for row in rows:
+            parent = details.get(row[1], "")
+            # A sort directly in a subquery (or in a plain query) sorts jobs rows
+            if "TEMP B-TREE" in row[3] and (name == "affinity" or parent.startswith("CO-ROUTINE")):
+                problems.append(f"{name}: {row[3]} (under {parent or 'the query'})")
+    return problems
+
+
+def row_to_job(row, with_payload=False):
+    """Job dict from a jobs row (result decoded from JSON)"""
+    job = {column: row[column] for column in JOB_COLUMNS}
+    job["result"] = json.loads(job["result"]) if job["result"] else None
+    if with_payload:
+        job["payload"] = json.loads(row["payload"])
+    return job
+
+
+def record_failed_attempt(job_queue, job, owner, error, result=None):
+    """Fail one attempt and publish whether the job will be retried"""
+    status = job_queue.fail(job["id"], owner, error, result)
+    if status is None:
+        print(f"⚠️ Job {job['id']} attempt {job['attempts']} failed, but its lease was already lost")
+        emit('lease_lost', stage='fail')
+        return status
+    if status == 'hedged':
+        print(f"❌ Job {job['id']}: one copy failed, the other copy carries on")
+        emit('hedge_dropped', error=error.strip().splitlines()[-1])
+        return status
+    print(f"❌ Job {job['id']} attempt {job['attempts']} failed ({status})")
+    if status == 'queued':
+        emit('job_retrying', attempt=job['attempts'], error=error.strip().splitlines()[-1])
+    elif status == 'dead':
+        emit('job_finished', status='error', error=error.strip().splitlines()[-1])
+    return status
+
+
+def append_watchdog_reason(error, reason):
+    """Error text of an attempt, ending with the watchdog's reason when it killed the browser"""
+    if reason:
+        emit('session_killed', reason=reason)
+        return f"{error}\n{reason}".strip()
+    return error
+
+
+class LeaseKeeper:
+    """
+    Keeps the lease of the job a worker is filling alive from its progress events
+
+    Section ends and postback waits extend the lease, at most every
+    LEASE_EXTEND_INTERVAL seconds, and renew the worker's concurrency slots with it
+    (a long fill would otherwise lose them after SLOT_SECONDS). When an extension
+    finds the lease gone (it expired and another worker claimed the job) lost is set;
+    it is the fill's cancel event, so the fill stops at its next pause (see cancellation.py).
+    """
+
+    def __init__(self, job_queue, owner, limiter=None):
+        self.queue = job_queue
+        self.owner = owner
+        self.limiter = limiter
+        self.job_id = None
+        self.extended_at = 0
+        self.lost = threading.Event()
+
+    def start(self, job_id):
+        self.job_id = job_id
+        self.extended_at = time.time()
+        self.lost = threading.Event()
+
+    def stop(self):
+        self.job_id = None
+
+    def observe_event(self, event):
+        """Extend the lease on a section_finished or postback_wait progress event"""
+        if self.job_id is None or event.get('kind') not in ('section_finished', 'postback_wait'):
+            return
+        if time.time() - self.extended_at < LEASE_EXTEND_INTERVAL:
+            return
+        try:
+            extended = self.queue.extend_lease(self.job_id, self.owner)
+        except Exception as e:
+            # The lease still has time left; try again on the next event
+            print(f"⚠️ Could not extend the lease of job {self.job_id}: {type(e).__name__}: {str(e)}")
+            return
+        self.extended_at = time.time()
+        if not extended:
+            print(f"⚠️ Lease of job {self.job_id} was lost, abandoning the fill")
+            self.lost.set()
+        elif self.limiter is not None:
+            try:
+                self.limiter.renew(self.owner)
+            except Exception as e:
+                print(f"⚠️ Could not renew the concurrency slots of job {self.job_id}: {type(e).__name__}: {str(e)}")
+
+
+def queue_worker_main(worker_id, queue_path=QUEUE_PATH, stop_event=None, event_queue=None,
+                      coordinator=None, node=None):
+    """
+    Worker process: open one session, then claim and fill jobs until stop_event is set
+
+    A job whose fill raised is retried (see JobQueue.fail); a job that finished with
+    unconfirmed fields ('failed') is done - its report lists what to fix by hand.
+    Progress events (progress.py) are put on event_queue when one is given.
+    Postback and navigation latencies feed the shared concurrency limits, and the
+    same progress events keep the job's lease alive (see LeaseKeeper) and are the
+    heartbeats of the worker's SessionWatchdog, which kills a hung browser. The
+    session is recycled by job count, RSS and age (see session_recycling.py).
+    With a coordinator address (HOST:PORT) the queue and limits are those of the
+    coordinator (see coordinator.py) instead of the local queue_path.
+    """
+    # Selenium is only imported inside the worker processes
+    import servpro_login
+    from worker_pool import run_job
+    from session_watchdog import SessionWatchdog
+    from session_recycling import SessionRecycler
+    from request_blocking import enable_traffic_accounting
+
+    enable_traffic_accounting()
+    recorder = LatencyRecorder()
+    lease = None
+    watchdog = SessionWatchdog(worker_id).start()
+
+    def sink(event):
+        watchdog.beat(event)
+        recorder.observe_event(event)
+        if lease is not None:
+            lease.observe_event(event)
+        if event_queue is not None:
+            event_queue.put(event)
+
+    set_progress_sink(sink)
+    if coordinator is not None:
+        from coordinator import RemoteQueue, RemoteLimiter
+        job_queue = RemoteQueue(coordinator, node)
+        limiter = RemoteLimiter(job_queue.client)
+    else:
+        job_queue = JobQueue(queue_path)
+        limiter = ConcurrencyLimiter(job_queue)
+    limit_keys = get_limit_keys(servpro_login.USERNAME, servpro_login.JOB_CREATION_URL)
+    owner = get_worker_owner(worker_id)
+    lease = LeaseKeeper(job_queue, owner, limiter)
+    recycler = SessionRecycler(worker_id, servpro_login.open_job_creation_session, servpro_login.quit_session)
+    driver = None
+    first_job = True
+    session_office = None
+    try:
+        while stop_event is None or not stop_event.is_set():
+            # Warm the session before claiming, so urgent jobs never wait on a browser start
+            if driver is None:
+                try:
+                    watchdog.step("session")
+                    driver = recycler.take_prewarmed() or servpro_login.open_job_creation_session()
+                    recycler.track(driver)
+                    first_job = True
+                    session_office = None
+                except Exception as e:
+                    watchdog.fired()
+                    print(f"❌ Worker {worker_id} could not open a session: {type(e).__name__}: {str(e)}")
+                    if stop_event is not None:
+                        stop_event.wait(SESSION_RETRY_DELAY)
+                    else:
+                        time.sleep(SESSION_RETRY_DELAY)
+                    continue
+                finally:
+                    watchdog.idle()
+
+            if not limiter.try_acquire(owner, limit_keys):
+                time.sleep(POLL_INTERVAL)
+                continue
+            job = job_queue.claim(owner, office=session_office)
+            if job is None:
+                limiter.release(owner)
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            try:
+                lease.start(job["id"])
+                set_progress_context(job_id=job["id"], worker=worker_id)
+                emit('job_started', attempt=job['attempts'], priority=job['priority'], office=job['office'],
+                     affine=session_office is not None and job['office'] == session_office, hedge=job['hedge'])
+                try:
+                    if not first_job:
+                        started = time.time()
+                        watchdog.step("navigate")
+                        servpro_login.navigate_to_job_creation(driver)
+                        recorder.observe(time.time() - started)
+                    first_job = False
+                except Exception as e:
+                    recorder.observe(None, error=True)
+                    error = f"Session setup failed: {type(e).__name__}: {str(e)}"
+                    record_failed_attempt(job_queue, job, owner, append_watchdog_reason(error, watchdog.fired()))
+                    servpro_login.quit_session(driver)
+                    driver = None
+                    continue
+                finally:
+                    watchdog.idle()
+
+                checkpoint_id = get_job_id(job["payload"])
+                if job['hedge']:
+                    checkpoint_id = get_hedge_checkpoint_id(checkpoint_id)
+                try:
+                    watchdog.step("fill")
+                    result = run_with_cancel_event(lease.lost, run_job, servpro_login, driver, job["id"],
+                                                   job["payload"], checkpoint_id)
+                except JobCancelled:
+                    # Another worker (or the job's other copy) holds the job now; its result is theirs to store
+                    emit('lease_lost', stage='fill')
+                    watchdog.fired()
+                    if job['hedge']:
+                        clear_checkpoint(checkpoint_id)
+                    continue
+                finally:
+                    watchdog.idle()
+                result['worker'] = worker_id
+                killed = watchdog.fired()
+                if killed:
+                    result['status'] = 'error'
+                    result['error'] = append_watchdog_reason(result['error'] or '', killed)
+                if result['status'] == 'error':
+                    recorder.observe(None, error=True)
+                    record_failed_attempt(job_queue, job, owner, result['error'], result)
+                    # The session may be unusable; start the next job on a fresh browser
+                    servpro_login.quit_session(driver)
+                    driver = None
+                elif not job_queue.claim_save(job["id"], owner):
+                    # The other copy got to the save gate first: stop before saving a duplicate
+                    print(f"🪁 Job {job['id']}: its other copy was saved first, dropped this one")
+                    emit('hedge_lost', status=result['status'])
+                    clear_checkpoint(checkpoint_id)
+                else:
+                    session_office = job['office']
+                    if job_queue.complete(job["id"], owner, result):
+                        emit('job_finished', status=result['status'], duration=result['duration'])
+                        print(f"📦 Job {job['id']}: {result['status']} on worker {worker_id}")
+                    else:
+                        print(f"⚠️ Job {job['id']}: {result['status']} on worker {worker_id}, "
+                              f"but its lease was lost - result not stored")
+                        emit('lease_lost', stage='complete', status=result['status'])
+            finally:
+                lease.stop()
+                limiter.release(owner)
+                limiter.record(limit_keys, recorder.drain())
+                for key in limit_keys:
+                    limiter.adjust(key)
+
+            if driver is not None:
+                replacement = recycler.after_job(driver)
+                emit('session_stats', **recycler.get_stats())
+                if replacement is not None:
+                    servpro_login.quit_session(driver)
+                    driver, first_job, session_office = replacement, True, None
+    finally:
+        watchdog.stop()
+        recycler.close()
+        if driver is not None:
+            servpro_login.quit_session(driver)
+        limiter.release(owner)
+        job_queue.close()
+        stats = get_cache_stats()
+        print(f"🗃️ Worker {worker_id} item cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+              f"offices {', '.join(stats['offices']) or 'none'}")
+
+
+def print_queue_status(job_queue):
+    counts = job_queue.counts()
+    print(f"📊 Queue: {', '.join(f'{status}={counts.get(status, 0)}' for status in STATUSES)}")
+
+
+def main():
+    """Command line front end for the queue (see module docstring)"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 2
+    command, args = args[0], args[1:]
+    job_queue = JobQueue()
+
+    if command == "enqueue":
+        from worker_pool import load_payloads
+        for job, created in job_queue.enqueue_many(load_payloads(args)):
+            print(f"{'➕ Queued' if created else '♻️ Already queued'} {job['id']} ({job['idempotency_key']}, {job['status']})")
+    elif command == "work":
+        import multiprocessing
+        from worker_pool import get_pool_size
+        workers = int(args[args.index("--workers") + 1]) if "--workers" in args else None
+        context = multiprocessing.get_context("spawn")
+        processes = [
+            context.Process(target=queue_worker_main, args=(worker_id,), name=f"servpro-queue-worker-{worker_id}")
+            for worker_id in range(get_pool_size(workers))
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            print("🛑 Stopping workers, their leased jobs are released")
+            for worker_id, process in enumerate(processes):
+                process.terminate()
+                process.join()
+                job_queue.release_owner(get_worker_owner(worker_id, process.pid))
+    elif command == "status":
+        print_queue_status(job_queue)
+    elif command == "stats":
+        print_wait_summary(job_queue.wait_stats())
+        print_limits(ConcurrencyLimiter(job_queue).get_limits())
+        print_hedge_summary(job_queue.get_hedge_after(), job_queue.hedge_samples)
+    elif command == "dead":
+        for job in job_queue.list_jobs("dead"):
+            last_error = (job['last_error'] or '').strip().splitlines() or ['']
+            print(f"💀 {job['id']} ({job['idempotency_key']}) after {job['attempts']} attempt(s): {last_error[-1]}")
+    elif command == "requeue":
+        for job_id in args:
+            print(f"{'🔁 Requeued' if job_queue.requeue_dead(job_id) else '⚠️ Not dead-lettered:'} {job_id}")
+    elif command == "check-plan":
+        problems = check_claim_plan(job_queue)
+        for problem in problems:
+            print(f"❌ {problem}")
+        print("✅ Claim queries walk their indexes" if not problems else "⚠️ A claim query sorts the queue")
+        return 1 if problems else 0
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,429 @@
+"""
+SERVPRO job submission service
+FastAPI front end that accepts job payloads (single or bulk), validates them
+against json.txt, puts them on the durable job queue (job_queue.py) for a pool of
+browser worker processes and returns a job ID right away. Status and results
+are looked up by that ID; jobs survive a service restart.
+
+Usage:
+    uvicorn main:app --host 0.0.0.0 --port 8000
+    python main.py [--workers MAX] [--min-workers MIN] [--port PORT]
+
+The worker pool is autoscaled between MIN (default 1) and MAX (default: what the
+host's CPUs and memory allow) on queue depth, arrival rate, job latency and the
+hour-of-day forecast (see autoscaler.py).
+
+Endpoints:
+    POST /jobs                  submit one payload            -> 202 {"id", "status"}
+    POST /jobs/bulk             submit {"jobs": [payload...]} -> 202 {"jobs": [{"id", "status"}...]}
+    GET  /jobs/{id}             job status (queued / retrying / running / ok / failed / error)
+    GET  /jobs/{id}/result      job result (409 until the job has finished)
+    GET  /jobs/{id}/events      server-sent progress events of one job (ends with job_finished)
+    GET  /events                server-sent progress events of every job
+    GET  /health                worker and queue counts, browser memory per worker
+    GET  /stats                 queue wait-time percentiles per priority class
+
+Payloads that fail schema validation are rejected with 422 unless ?strict=false
+is passed, in which case the errors are returned as warnings and the job is queued.
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+import multiprocessing
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, HTTPException, Body, Header
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from form_plan import validate_payload
+from job_queue import JobQueue, QUEUE_PATH, queue_worker_main, get_worker_owner
+from worker_pool import get_pool_size
+from progress import EventHub, FINAL_KINDS
+from autoscaler import Autoscaler, AUTOSCALE_INTERVAL
+from concurrency import ConcurrencyLimiter
+
+FINISHED_STATUSES = ("ok", "failed", "error")
+
+# Minimum seconds between restarts of a worker that keeps dying (e.g. Chrome won't start)
+RESPAWN_DELAY = 30
+
+# Seconds between checks for dead worker processes
+SUPERVISE_INTERVAL = 1
+
+# Seconds between SSE keep-alive comments on an idle stream
+KEEPALIVE_INTERVAL = 15
+
+# Environment variables with the pool bounds (the maximum is capped by get_pool_size)
+WORKERS_ENV = "SERVPRO_WORKERS"
+MIN_WORKERS_ENV = "SERVPRO_MIN_WORKERS"
+
+
+def get_public_status(job):
+    """API status of a queue job: queued / retrying / running / ok / failed / error"""
+    if job['status'] == 'queued':
+        return 'retrying' if job['attempts'] else 'queued'
+    if job['status'] == 'leased':
+        return 'running'
+    if job['status'] == 'done':
+        return (job['result'] or {}).get('status', 'ok')
+    return 'error'
+
+
+class JobService:
+    """
+    Durable job queue (job_queue.py) in front of a pool of worker processes
+
+    Workers claim jobs from the queue themselves; the service only enqueues, answers
+    lookups, replaces dead workers (releasing the jobs they had leased) and resizes
+    the pool as the autoscaler says. Each worker has its own stop event so it can be
+    drained: it exits after its current job.
+    """
+
+    def __init__(self, workers=None, queue_path=QUEUE_PATH, min_workers=1):
+        self.requested_workers = workers
+        self.min_workers = min_workers
+        self.queue_path = queue_path
+        self.queue = None
+        self.limiter = None
+        self.autoscaler = None
+        self.pool_size = 0
+        self.context = None
+        self.processes = {}         # worker id -> process
+        self.stop_events = {}       # worker id -> that worker's stop event
+        self.draining = set()       # worker ids asked to exit after their current job
+        self.sessions = {}          # worker id -> last session_stats event (browser RSS, jobs, age)
+        self.next_worker_id = 0
+        self.last_crash = 0
+        self.next_scale = 0
+        self.stopping = threading.Event()
+        self.supervisor = None
+        self.event_queue = None
+        self.events = EventHub()
+        self.relay = None
+
+    def start(self, loop=None):
+        """Open the queue, start the worker processes, the supervisor and the event relay"""
+        self.queue = JobQueue(self.queue_path)
+        self.context = multiprocessing.get_context("spawn")
+        self.event_queue = self.context.Queue()
+        self.events.attach(loop)
+        self.relay = threading.Thread(target=self.relay_events, name="servpro-events", daemon=True)
+        self.relay.start()
+        max_workers = get_pool_size(self.requested_workers)
+        min_workers = min(self.min_workers, max_workers)
+        self.limiter = ConcurrencyLimiter(self.queue)
+        self.autoscaler = Autoscaler(self.queue, min_workers, max_workers, self.limiter)
+        print(f"🏭 Worker pool {min_workers}-{max_workers} on {self.queue_path}")
+        self.scale()
+        self.supervisor = threading.Thread(target=self.supervise, name="servpro-supervisor", daemon=True)
+        self.supervisor.start()
+
+    def stop(self, timeout=30):
+        """Ask the workers to exit after their current job and wait for them"""
+        self.stopping.set()
+        for stop_event in self.stop_events.values():
+            stop_event.set()
+        for worker_id, process in list(self.processes.items()):
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+                owner = get_worker_owner(worker_id, process.pid)
+                self.queue.release_owner(owner)
+                self.limiter.release(owner)
+        if self.supervisor is not None:
+            self.supervisor.join(timeout=5)
+        if self.relay is not None:
+            self.event_queue.put(None)
+            self.relay.join(timeout=5)
+
+    def start_worker(self):
+        worker_id = self.next_worker_id
+        self.next_worker_id += 1
+        stop_event = self.context.Event()
+        process = self.context.Process(
+            target=queue_worker_main, args=(worker_id, self.queue_path, stop_event, self.event_queue),
+            name=f"servpro-worker-{worker_id}", daemon=True,
+        )
+        process.start()
+        self.processes[worker_id] = process
+        self.stop_events[worker_id] = stop_event
+        return worker_id
+
+    def drain_worker(self):
+        """Ask the youngest active worker to exit after its current job"""
+        worker_id = max(self.active_workers())
+        self.stop_events[worker_id].set()
+        self.draining.add(worker_id)
+        return worker_id
+
+    def active_workers(self):
+        """IDs of workers that are not draining"""
+        return [worker_id for worker_id in list(self.processes) if worker_id not in self.draining]
+
+    def live_workers(self):
+        return sum(1 for process in list(self.processes.values()) if process.is_alive())
+
+    def scale(self):
+        """Resize the pool to the autoscaler's target"""
+        active = len(self.active_workers())
+        target = self.autoscaler.get_target(active)
+        if target != self.pool_size:
+            print(f"📈 Worker pool {self.pool_size} -> {target} ({self.autoscaler.reason})")
+        self.pool_size = target
+
+        if target > active:
+            # A worker crashed recently (e.g. Chrome won't start): don't restart in a tight loop
+            if time.time() - self.last_crash > RESPAWN_DELAY:
+                for _ in range(target - active):
+                    self.start_worker()
+        else:
+            for _ in range(active - target):
+                print(f"🫗 Draining worker {self.drain_worker()}")
+
+    def submit(self, payload, idempotency_key=None):
+        """Queue one payload; returns (job, created flag)"""
+        return self.queue.enqueue(payload, idempotency_key)
+
+    def submit_many(self, payloads):
+        """Queue several payloads in one transaction; returns a list of (job, created flag)"""
+        return self.queue.enqueue_many(payloads)
+
+    def get(self, job_id):
+        """Queue job by ID, or None"""
+        return self.queue.get(job_id)
+
+    def counts(self):
+        """Number of jobs per queue status"""
+        return self.queue.counts()
+
+    def relay_events(self):
+        """Relay thread: hand worker progress events to the event hub"""
+        while True:
+            try:
+                event = self.event_queue.get()
+            except (EOFError, OSError):
+                break
+            if event is None:
+                break
+            if event['kind'] == 'session_stats':
+                self.sessions[event.get('worker')] = {
+                    key: event[key] for key in ('rss_mb', 'jobs', 'age', 'recycled')
+                }
+            self.events.publish_threadsafe(event)
+
+    def supervise(self):
+        """Supervisor thread: reap exited workers, release dead workers' leases, autoscale"""
+        while not self.stopping.wait(SUPERVISE_INTERVAL):
+            replace = False
+            for worker_id, process in list(self.processes.items()):
+                if process.is_alive():
+                    continue
+                del self.processes[worker_id]
+                del self.stop_events[worker_id]
+                self.sessions.pop(worker_id, None)
+                if worker_id in self.draining:
+                    self.draining.discard(worker_id)
+                    print(f"👋 Worker {worker_id} drained")
+                    continue
+                owner = get_worker_owner(worker_id, process.pid)
+                released = self.queue.release_owner(owner)
+                self.limiter.release(owner)
+                print(f"❌ Worker {worker_id} died (exit code {process.exitcode}), released {released} job(s)")
+                replace = True
+                if time.time() - self.last_crash > RESPAWN_DELAY:
+                    # Let the first crash in a while be replaced right away
+                    self.next_scale = 0
+                self.last_crash = time.time()
+
+            if replace or time.time() >= self.next_scale:
+                self.next_scale = time.time() + AUTOSCALE_INTERVAL
+                self.scale()
+
+
+service = JobService(
+    int(os.environ[WORKERS_ENV]) if os.environ.get(WORKERS_ENV) else None,
+    min_workers=int(os.environ.get(MIN_WORKERS_ENV) or 1),
+)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    service.start(asyncio.get_running_loop())
+    try:
+        yield
+    finally:
+        service.stop()
+
+
+app = FastAPI(title="SERVPRO Job Service", lifespan=lifespan)
+
+
+class BulkSubmission(BaseModel):
+    jobs: List[Dict[str, Any]]
+
+
+def public_job(job, created=True, warnings=None):
+    """Queue job as returned by the API (result only via /result)"""
+    public = {
+        'id': job['id'],
+        'job_key': job['idempotency_key'],
+        'status': get_public_status(job),
+        'priority': job['priority'],
+        'due_at': job['due_at'],
+        'attempts': job['attempts'],
+        'submitted_at': job['created_at'],
+        'updated_at': job['updated_at'],
+        'last_error': job['last_error'],
+    }
+    if not created:
+        public['duplicate'] = True
+    if warnings:
+        public['warnings'] = warnings
+    return public
+
+
+def check_payload(payload, strict):
+    """Schema errors for a payload; raises 422 when strict and invalid"""
+    errors = validate_payload(payload)
+    if errors and strict:
+        raise HTTPException(status_code=422, detail={'errors': errors})
+    return errors
+
+
+@app.post("/jobs", status_code=202)
+def submit_job(payload: Dict[str, Any] = Body(...), strict: bool = True,
+               idempotency_key: Optional[str] = Header(None)):
+    """Validate and queue one job payload (a repeated payload or Idempotency-Key returns the existing job)"""
+    warnings = check_payload(payload, strict)
+    job, created = service.submit(payload, idempotency_key)
+    return public_job(job, created, warnings)
+
+
+@app.post("/jobs/bulk", status_code=202)
+def submit_jobs(submission: BulkSubmission, strict: bool = True):
+    """Validate and queue several payloads; with strict validation nothing is queued if any is invalid"""
+    checked = [validate_payload(payload) for payload in submission.jobs]
+    invalid = {index: errors for index, errors in enumerate(checked) if errors}
+    if invalid and strict:
+        raise HTTPException(status_code=422, detail={'errors': invalid})
+    added = service.submit_many(submission.jobs)
+    return {'jobs': [public_job(job, created, errors) for (job, created), errors in zip(added, checked)]}
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    """Status of one job"""
+    job = service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return public_job(job)
+
+
+@app.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    """Result of a finished job (same shape as worker_pool results)"""
+    job = service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    status = get_public_status(job)
+    if status not in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job is {status}")
+    return {'id': job_id, 'status': status, 'result': job['result'], 'last_error': job['last_error']}
+
+
+def format_sse(event):
+    return f"id: {event.get('seq', '')}\nevent: {event['kind']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+async def stream_events(subscription, job=None):
+    """SSE body for one subscription; a job stream ends with the job's final event"""
+    try:
+        if job is not None and get_public_status(job) in FINISHED_STATUSES and not subscription.queue.qsize():
+            # Finished before this service saw any of its events (e.g. before a restart)
+            yield format_sse({'kind': 'job_finished', 'job_id': job['id'], 'status': get_public_status(job),
+                              'time': job['updated_at']})
+            return
+        while not service.stopping.is_set():
+            event = await subscription.get(KEEPALIVE_INTERVAL)
+            if subscription.dropped:
+                yield format_sse({'kind': 'dropped', 'count': subscription.dropped, 'time': time.time()})
+                subscription.dropped = 0
+            if event is None:
+                if job is not None:
+                    job = service.get(job['id'])
+                    if get_public_status(job) in FINISHED_STATUSES:
+                        # Dead-lettered by lease expiry: no worker published its end
+                        yield format_sse({'kind': 'job_finished', 'job_id': job['id'],
+                                          'status': get_public_status(job), 'time': job['updated_at']})
+                        return
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+            if job is not None and event['kind'] in FINAL_KINDS:
+                return
+    finally:
+        service.events.unsubscribe(subscription)
+
+
+@app.get("/jobs/{job_id}/events")
+async def get_job_events(job_id: str):
+    """Server-sent progress events of one job"""
+    job = service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    subscription = service.events.subscribe(job_id)
+    return StreamingResponse(stream_events(subscription, job), media_type="text/event-stream",
+                             headers={'Cache-Control': 'no-cache'})
+
+
+@app.get("/events")
+async def get_events():
+    """Server-sent progress events of every job"""
+    return StreamingResponse(stream_events(service.events.subscribe()), media_type="text/event-stream",
+                             headers={'Cache-Control': 'no-cache'})
+
+
+@app.get("/health")
+def health():
+    """Worker and queue counts, and the browser memory of each worker's session"""
+    sessions = dict(service.sessions)
+    return {'workers': service.live_workers(), 'target_workers': service.pool_size,
+            'draining': len(service.draining), 'scaling_reason': service.autoscaler.reason,
+            'jobs': service.counts(), 'browser_rss_mb': sum(stats['rss_mb'] for stats in sessions.values()),
+            'sessions': sessions}
+
+
+@app.get("/stats")
+def stats():
+    """Queue wait-time percentiles (seconds) per priority class and the adaptive concurrency limits"""
+    return {'wait': service.queue.wait_stats(), 'concurrency': service.limiter.get_limits()}
+
+
+def main():
+    """Run the service with uvicorn"""
+    args = sys.argv[1:]
+    options = {'--workers': None, '--min-workers': None, '--port': 8000}
+    for option in list(options):
+        if option in args:
+            position = args.index(option)
+            options[option] = int(args[position + 1])
+            del args[position:position + 2]
+    if options['--workers']:
+        service.requested_workers = options['--workers']
+    if options['--min-workers']:
+        service.min_workers = options['--min-workers']
+
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=options['--port'])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Per-office combobox item cache
+Participant lists and other office-dependent RadComboBoxes (registry entries that
+depend on generalInformation.officeName) hold different items per office. Item
+texts read from the page are cached per office for the life of the worker
+process, so a session that keeps filling jobs for the same office (see the office
+affinity in job_queue.JobQueue.claim) resolves payload values to exact item texts
+without re-reading the lists. Combos without dependencies share one cache entry for
+every office; combos that depend on other fields (state -> county, ...) are not cached.
+
+The fill code selects a resolved item directly ($find(...).findItemByText), which
+commits the selection to ClientState without typing into the combo.
+"""
+
+import threading
+
+from field_mappings import FIELD_REGISTRY
+
+OFFICE_FIELD = "generalInformation.officeName"
+
+_combo_entries = [entry for entries in FIELD_REGISTRY.values() for entry in entries
+                  if entry["control"] == "RadComboBox"]
+
+# RadComboBox input IDs whose items depend on the selected office only
+OFFICE_DEPENDENT_CONTROLS = frozenset(
+    entry["control_id"] for entry in _combo_entries if list(entry["depends_on"]) == [OFFICE_FIELD]
+)
+
+# RadComboBox input IDs whose items never change
+STATIC_CONTROLS = frozenset(entry["control_id"] for entry in _combo_entries if not entry["depends_on"])
+
+COMBO_ITEMS_SCRIPT = """
+var combo = $find(arguments[0]);
+if (!combo) { return null; }
+var items = combo.get_items();
+var texts = [];
+for (var i = 0; i < items.get_count(); i++) { texts.push(items.getItem(i).get_text()); }
+return texts;
+"""
+
+_items = {}             # (office or None, control_id) -> tuple of item texts
+_stats = {'hits': 0, 'misses': 0}
+_local = threading.local()
+
+
+def get_job_office(payload):
+    """generalInformation.officeName of a payload, or None"""
+    return (payload.get("generalInformation") or {}).get("officeName") or None
+
+
+def set_session_office(office):
+    """Office the current thread's session is filling for (None when unknown)"""
+    _local.office = office
+
+
+def get_session_office():
+    return getattr(_local, 'office', None)
+
+
+def read_combo_items(driver, control_id):
+    """Item texts of a RadComboBox as loaded in the page (None if the control is missing)"""
+    try:
+        items = driver.execute_script(COMBO_ITEMS_SCRIPT, control_id.replace('_Input', ''))
+    except Exception:
+        return None
+    return tuple(items) if items is not None else None
+
+
+def get_combo_items(driver, control_id):
+    """Cached item texts of a combobox for the session's office (None when not cacheable)"""
+    dependent = control_id in OFFICE_DEPENDENT_CONTROLS
+    office = get_session_office()
+    if (dependent and office is None) or (not dependent and control_id not in STATIC_CONTROLS):
+        return None
+
+    key = (office if dependent else None, control_id)
+    if key in _items:
+        _stats['hits'] += 1
+        return _items[key]
+    _stats['misses'] += 1
+    items = read_combo_items(driver, control_id)
+    if items:
+        # Empty lists are not cached: load-on-demand combos only have items once opened
+        _items[key] = items
+    return items
+
+
+def resolve_item_text(driver, control_id, value):
+    """
+    Exact item text for a payload value
+
+    Returns:
+        The item text matching value (exactly, or ignoring case and surrounding
+        whitespace), or None when the combo has no such item loaded
+    """
+    items = get_combo_items(driver, control_id)
+    if not items:
+        return None
+    if value in items:
+        return value
+    wanted = str(value).strip().casefold()
+    for text in items:
+        if text.strip().casefold() == wanted:
+            return text
+    return None
+
+
+def get_cache_stats():
+    """Hit/miss counters and the offices with cached items"""
+    offices = sorted({office for office, _ in _items if office is not None})
+    return dict(_stats, entries=len(_items), offices=offices)
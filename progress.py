@@ -0,0 +1,139 @@
+"""
+Progress events for job fills
+The fill code calls emit() at section boundaries, postback waits, field failures
+and job start/finish. Nothing happens unless a sink is installed: the job service's
+workers install one that forwards events to the service process, where an EventHub
+fans them out to server-sent-event subscribers (per job and fleet-wide).
+
+Event dicts always carry 'kind' and 'time'; the job context set with
+set_progress_context() (job id, worker) is merged into every event.
+
+Kinds:
+    job_started      job claimed by a worker ('attempt', 'hedge' for a second copy, see hedging.py)
+    section_started  'section'
+    section_finished 'section', 'checkpointed'
+    postback_wait    'seconds', 'timed_out'
+    field_failed     'field', 'status', 'expected', 'actual'
+    job_retrying     attempt failed, will be retried ('error')
+    lease_lost       another worker took over the job ('stage': fill / complete / fail)
+    hedge_lost       the job's other copy passed the save gate first; this copy stopped unsaved
+    traffic          after each job: 'bytes_loaded', 'requests', 'blocked' requests, estimated 'bytes_saved',
+                     bundles 'cached' and 'bytes_cached' (asset_cache.py)
+    session_stats    after each job: the session's browser 'rss_mb', 'jobs', 'age' and 'recycled' count
+    session_killed   the worker's watchdog killed its hung browser ('reason'); the attempt failed
+    hedge_dropped    one copy of a hedged job failed, the other carries on ('error')
+    job_finished     final 'status' (ok / failed / error)
+"""
+
+import time
+import asyncio
+import threading
+from collections import OrderedDict, deque
+
+# Events buffered per subscriber; the oldest are dropped when a slow client falls behind
+SUBSCRIBER_BUFFER = 256
+
+# Recent events replayed to a client that subscribes to a job mid-run
+JOB_HISTORY = 200
+
+# Jobs whose history is kept (oldest forgotten first)
+MAX_TRACKED_JOBS = 1000
+
+FINAL_KINDS = ("job_finished",)
+
+_sink = None
+_local = threading.local()
+
+
+def set_progress_sink(sink):
+    """Install sink(event) for this process (None to turn events off)"""
+    global _sink
+    _sink = sink
+
+
+def set_progress_context(**context):
+    """Fields merged into every event emitted from the current thread (e.g. job_id, worker)"""
+    _local.context = context
+
+
+def emit(kind, **fields):
+    """Publish one progress event; never raises into the fill code"""
+    if _sink is None:
+        return
+    event = dict(getattr(_local, 'context', {}), kind=kind, time=time.time(), **fields)
+    try:
+        _sink(event)
+    except Exception:
+        pass
+
+
+class Subscription:
+    """Bounded event buffer of one subscriber"""
+
+    def __init__(self, job_id=None, maxsize=SUBSCRIBER_BUFFER):
+        self.job_id = job_id
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+
+    def put(self, event):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout=None):
+        """Next event, or None after timeout seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventHub:
+    """
+    Fans progress events out to subscribers on one asyncio event loop
+
+    publish_threadsafe() may be called from any thread; subscribers only ever
+    touch their queues from the loop.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self.subscriptions = set()
+        self.history = OrderedDict()    # job id -> deque of recent events
+        self.sequence = 0
+
+    def attach(self, loop):
+        self.loop = loop
+
+    def publish_threadsafe(self, event):
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self.publish, event)
+
+    def publish(self, event):
+        """Record and deliver one event (loop thread)"""
+        self.sequence += 1
+        event['seq'] = self.sequence
+        job_id = event.get('job_id')
+        if job_id:
+            history = self.history.get(job_id)
+            if history is None:
+                history = self.history[job_id] = deque(maxlen=JOB_HISTORY)
+                while len(self.history) > MAX_TRACKED_JOBS:
+                    self.history.popitem(last=False)
+            history.append(event)
+        for subscription in self.subscriptions:
+            if subscription.job_id in (None, job_id):
+                subscription.put(event)
+
+    def subscribe(self, job_id=None):
+        """New subscription (to one job, or the whole fleet); a job subscription replays its history"""
+        subscription = Subscription(job_id)
+        if job_id:
+            for event in self.history.get(job_id, ()):
+                subscription.put(event)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions.discard(subscription)
@@ -0,0 +1,337 @@
+"""
+Headless mode and network request blocking for browser sessions
+CreateJob.aspx pulls images, web fonts and third-party scripts (analytics, tag managers)
+that the fill never needs. With blocking on, every session's FetchInterceptor
+(devtools.py) pauses the requests matching a block pattern and fails them before they
+leave the browser, which makes page loads and postbacks lighter and leaves more memory
+for more browsers.
+
+- Categories (BLOCK_CATEGORIES) are chosen with SERVPRO_BLOCK (comma separated,
+  default all of them; empty turns blocking off). SERVPRO_HEADLESS=1 runs Chrome
+  headless.
+- The allow-list (SERVPRO_ALLOW, comma separated URLs or URL patterns with '*') is
+  checked per request and always wins: a paused request whose URL matches an entry
+  continues, e.g. '*servpro.ngsapps.net/*' keeps the portal's own images loading.
+- Without a DevTools connection the session falls back to Chrome's
+  Network.setBlockedURLs, which has no exceptions; with an allow-list set, that
+  session blocks nothing rather than something allow-listed.
+- Traffic is read per job from chromedriver's performance log: bytes loaded, requests
+  blocked, and the bytes those would have cost. Only processes that read it (workers
+  and the fill daemon, see enable_traffic_accounting) turn the log on; elsewhere
+  chromedriver would buffer network events for the life of the session. Sizes of blockable resources are
+  learned whenever they load (blocking off or allow-listed) and kept in
+  .form_cache/resource_sizes.json; unknown ones count with the category's
+  DEFAULT_SIZES estimate.
+
+Blocking applies to the tab that was current when the session started (the tab a
+worker fills in); tabs opened later by tab_pool.py / browser_contexts.py are not blocked.
+
+Usage:
+    python request_blocking.py patterns     # block list and allow-list for the current settings
+"""
+
+import os
+import sys
+import json
+import fnmatch
+import threading
+
+from control_index import CACHE_DIR
+
+HEADLESS = os.environ.get("SERVPRO_HEADLESS", "0") == "1"
+
+# CDP URL patterns per category ('*' matches anything; patterns match the whole URL)
+BLOCK_CATEGORIES = {
+    "images": ("*.png", "*.png?*", "*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.gif", "*.gif?*",
+               "*.webp", "*.webp?*", "*.ico", "*.ico?*", "*.bmp", "*.bmp?*"),
+    "fonts": ("*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*",
+              "*.eot", "*.eot?*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"),
+    "media": ("*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.mp3", "*.mp3?*"),
+    "analytics": ("*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+                  "*hotjar.com*", "*clarity.ms*", "*nr-data.net*", "*newrelic.com*",
+                  "*connect.facebook.net*", "*bat.bing.com*"),
+}
+
+# Estimated bytes of a blocked request whose real size was never seen
+DEFAULT_SIZES = {"images": 6 * 1024, "fonts": 40 * 1024, "media": 500 * 1024, "analytics": 30 * 1024}
+
+SIZES_PATH = os.path.join(CACHE_DIR, "resource_sizes.json")
+
+_sizes = None
+_sizes_lock = threading.Lock()
+
+# Sessions started by this process get a performance log (see enable_traffic_accounting)
+_traffic_accounting = False
+
+
+def to_fetch_pattern(pattern):
+    """CDP Fetch pattern for a block pattern ('?' is a wildcard there, a literal '?' here)"""
+    return pattern.replace("?", "\\?")
+
+
+def get_block_settings():
+    """(categories, allow-list) from SERVPRO_BLOCK / SERVPRO_ALLOW"""
+    categories = os.environ.get("SERVPRO_BLOCK", ",".join(BLOCK_CATEGORIES))
+    allow = os.environ.get("SERVPRO_ALLOW", "")
+    return ([name.strip() for name in categories.split(",") if name.strip() in BLOCK_CATEGORIES],
+            [entry.strip() for entry in allow.split(",") if entry.strip()])
+
+
+def get_blocked_patterns(categories=None):
+    """URL patterns of the categories (defaults to SERVPRO_BLOCK)"""
+    categories = get_block_settings()[0] if categories is None else categories
+    return [pattern for category in categories for pattern in BLOCK_CATEGORIES[category]]
+
+
+def match_pattern(url, pattern):
+    """True when a URL matches a block or allow pattern ('*' is the only wildcard)"""
+    return fnmatch.fnmatchcase(url, pattern.replace("?", "[?]"))
+
+
+def get_category(url, categories=None):
+    """Block category a URL falls in (among categories, default all), or None"""
+    for category in BLOCK_CATEGORIES if categories is None else categories:
+        if any(match_pattern(url, pattern) for pattern in BLOCK_CATEGORIES[category]):
+            return category
+    return None
+
+
+def is_allowed(url, allow):
+    """True when a URL matches an allow-list entry (an exact URL or a '*' pattern)"""
+    return any(match_pattern(url, entry) for entry in allow)
+
+
+class RequestBlocker:
+    """Fails a tab's requests in the blocked categories unless allow-listed (see devtools.FetchInterceptor)"""
+
+    def __init__(self, categories, allow):
+        self.categories = categories
+        self.allow = allow
+        self.blocked = []
+        self.lock = threading.Lock()
+
+    def get_patterns(self):
+        return [{'urlPattern': to_fetch_pattern(pattern), 'requestStage': "Request"}
+                for pattern in get_blocked_patterns(self.categories)]
+
+    def __call__(self, interceptor, params):
+        if 'responseStatusCode' in params or 'responseErrorReason' in params:
+            return False
+        url = params['request']['url']
+        if get_category(url, self.categories) is None or is_allowed(url, self.allow):
+            return False
+        interceptor.fail(params['requestId'], "BlockedByClient")
+        with self.lock:
+            self.blocked.append(url)
+        return True
+
+    def take_blocked(self):
+        """URLs blocked since the last call"""
+        with self.lock:
+            blocked, self.blocked = self.blocked, []
+        return blocked
+
+
+def enable_traffic_accounting():
+    """Give sessions started by this process a performance log; only for processes that call read_traffic"""
+    global _traffic_accounting
+    _traffic_accounting = True
+
+
+def configure_options(chrome_options):
+    """Headless mode, and performance logging when traffic accounting is on, on a session's Chrome options"""
+    if HEADLESS:
+        chrome_options.add_argument("--headless=new")
+        # Headless windows default to 800x600, which collapses some form panels
+        chrome_options.add_argument("--window-size=1920,1080")
+    if not _traffic_accounting:
+        return
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    chrome_options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def enable_request_blocking(driver, interceptor):
+    """
+    Block the session's non-essential requests through its FetchInterceptor (before it starts)
+
+    Without an interceptor, falls back to Network.setBlockedURLs, unless an allow-list
+    is set (that call has no exceptions).
+
+    Returns:
+        Number of patterns in effect
+    """
+    categories, allow = get_block_settings()
+    patterns = get_blocked_patterns(categories)
+    if not patterns:
+        return 0
+    if interceptor is not None:
+        blocker = RequestBlocker(categories, allow)
+        interceptor.add_handler(blocker.get_patterns(), blocker)
+        driver.request_blocker = blocker
+    elif allow:
+        print("⚠️ Request blocking off for this session: no DevTools connection to honor the allow-list")
+        return 0
+    else:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            print(f"⚠️ Request blocking unavailable: {type(e).__name__}: {str(e)}")
+            return 0
+    print(f"🚫 Blocking {len(patterns)} URL pattern(s) ({', '.join(categories)}"
+          f"{f', {len(allow)} allow-list entries' if allow else ''})")
+    return len(patterns)
+
+
+def load_sizes():
+    global _sizes
+    if _sizes is None:
+        try:
+            with open(SIZES_PATH, "r", encoding="utf-8") as file:
+                _sizes = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            _sizes = {}
+    return _sizes
+
+
+def save_sizes(learned):
+    """Merge newly seen resource sizes into the host-wide table"""
+    with _sizes_lock:
+        sizes = load_sizes()
+        sizes.update(learned)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{SIZES_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(sizes, file, separators=(",", ":"))
+        os.replace(tmp_path, SIZES_PATH)
+
+
+def read_performance_log(driver):
+    """Drain the session's performance log; returns the CDP messages (None if logging is off)"""
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+    messages = []
+    for entry in entries:
+        try:
+            messages.append(json.loads(entry["message"])["message"])
+        except (KeyError, ValueError):
+            continue
+    return messages
+
+
+def summarize_traffic(messages, blocked_urls=None):
+    """
+    Network traffic of a batch of performance log messages
+
+    Args:
+        messages: Performance log messages (see read_performance_log)
+        blocked_urls: URLs a RequestBlocker failed; None counts the requests
+            Network.setBlockedURLs blocked according to the log instead
+
+    Returns:
+        Dict with 'bytes_loaded', 'requests', 'blocked' (requests), 'bytes_saved'
+        (estimated size of the blocked requests) and 'learned' (url -> bytes of
+        blockable resources that loaded)
+    """
+    urls = {}
+    traffic = {'bytes_loaded': 0, 'requests': 0, 'blocked': 0, 'bytes_saved': 0, 'learned': {}}
+    sizes = load_sizes()
+    for message in messages:
+        method, params = message.get("method"), message.get("params", {})
+        if method == "Network.requestWillBeSent":
+            urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+        elif method == "Network.loadingFinished":
+            size = int(params.get("encodedDataLength") or 0)
+            traffic['bytes_loaded'] += size
+            traffic['requests'] += 1
+            url = urls.get(params.get("requestId"), "")
+            if size and get_category(url) is not None:
+                traffic['learned'][url] = size
+        elif (method == "Network.loadingFailed" and params.get("blockedReason") == "inspector"
+              and blocked_urls is None):
+            url = urls.get(params.get("requestId"), "")
+            traffic['blocked'] += 1
+            traffic['bytes_saved'] += sizes.get(url) or DEFAULT_SIZES.get(get_category(url), 0)
+    for url in blocked_urls or []:
+        traffic['blocked'] += 1
+        traffic['bytes_saved'] += sizes.get(url) or DEFAULT_SIZES.get(get_category(url), 0)
+    return traffic
+
+
+def take_cache_stats(driver):
+    """Asset cache counters of the session since the last call (zeros without an asset cache)"""
+    handler = getattr(driver, 'asset_handler', None)
+    stats = handler.take_stats() if handler is not None else {}
+    return {'cached': stats.get('hits', 0), 'bytes_cached': stats.get('bytes_from_cache', 0)}
+
+
+def take_blocked_urls(driver):
+    """URLs the session's RequestBlocker failed since the last call (None without one)"""
+    blocker = getattr(driver, 'request_blocker', None)
+    return blocker.take_blocked() if blocker is not None else None
+
+
+def reset_traffic(driver):
+    """Discard traffic logged so far (e.g. the navigation before a job)"""
+    read_performance_log(driver)
+    take_blocked_urls(driver)
+    take_cache_stats(driver)
+
+
+def read_traffic(driver):
+    """
+    Traffic of the session since the last reset_traffic / read_traffic
+
+    Returns:
+        Dict with 'bytes_loaded', 'requests', 'blocked', 'bytes_saved', 'cached' and
+        'bytes_cached' (bundles served by asset_cache.py), or None when the session has
+        no performance log
+    """
+    messages = read_performance_log(driver)
+    if messages is None:
+        return None
+    traffic = summarize_traffic(messages, take_blocked_urls(driver))
+    learned = traffic.pop('learned')
+    traffic.update(take_cache_stats(driver))
+    if learned:
+        try:
+            save_sizes(learned)
+        except OSError:
+            pass
+    return traffic
+
+
+def print_traffic_summary(results):
+    """Print the network traffic of a batch of job results (see worker_pool.run_job)"""
+    traffic = [result['traffic'] for result in results if result.get('traffic')]
+    if not traffic:
+        return
+    loaded = sum(t['bytes_loaded'] for t in traffic)
+    saved = sum(t['bytes_saved'] for t in traffic)
+    print(f"📦 Network per job: {loaded / len(traffic) / 1024:.0f} KB loaded, "
+          f"{sum(t['blocked'] for t in traffic) / len(traffic):.0f} request(s) blocked, "
+          f"~{saved / len(traffic) / 1024:.0f} KB saved")
+    cached = sum(t.get('bytes_cached', 0) for t in traffic)
+    if cached:
+        print(f"📚 Asset cache per job: {sum(t.get('cached', 0) for t in traffic) / len(traffic):.0f} bundle(s), "
+              f"{cached / len(traffic) / 1024:.0f} KB served from disk")
+
+
+def main():
+    """Command line front end (see module docstring)"""
+    args = sys.argv[1:]
+    if args[:1] != ["patterns"]:
+        print(__doc__)
+        return 2
+    categories, allow = get_block_settings()
+    print(f"🚫 Categories: {', '.join(categories) or 'none'}; allow-list (checked per request): "
+          f"{', '.join(allow) or 'empty'}")
+    for pattern in get_blocked_patterns(categories):
+        print(f"   {pattern}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
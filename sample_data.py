@@ -0,0 +1,330 @@
+"""
+Sample form data for the interactive script
+Individual and Company sample payloads and the prompts that pick one or load a
+payload from a JSON file. Kept out of servpro_login.py so only the interactive path
+builds them.
+"""
+
+import json
+
+
+def create_sample_form_data():
+    """
+    Create sample form data based on the JSON schema
+    You can modify this data or load it from an external JSON file
+    
+    This function returns Individual Customer data by default.
+    Use create_sample_company_form_data() for Company Customer data.
+    """
+    return {
+        "generalInformation": {
+            "receivedBy": "Kyle McDougall",
+            "jobName": "Smith, John - Water Damage",
+            "reportedBy": "Property Owner",
+            "referredBy": "Lewis, A.D.",
+            "jobSize": "Medium",
+            "officeName": "SPSC, LLC",
+            "dateOfLoss": "12/15/2024",
+            "lossCategory": "Residential",
+            "environmentalCode": "Mitigation",
+            "catReference": "",
+            "priority": "High",
+            "lossType": "General Repairs",
+            "secondaryLossType": "Mold",
+            "sourceOfLoss": "Pipe Break"
+        },
+        "customerInformation": {
+            "customerType": "Individual",
+            "isSameAsJobAddress": False,
+            "customer": "",
+            "title": "Mr.",
+            "firstName": "John",
+            "lastName": "Smith",
+            "email": "john.smith@email.com",
+            "secondaryEmail": "john.alt@email.com",
+            "address": "123 Main Street",
+            "zipCode": "30309",
+            "city": "Atlanta",
+            "countyRegion": "Fulton County",
+            "country": "USA",
+            "stateProvince": "Georgia",
+            "mainPhoneNumber": {
+                "number": "1-404-555-1234",
+                "extension": "",
+                "type": "Mobile"
+            }
+        },
+        "jobAddressInformation": {
+            "customerType": "Individual",
+            "isSameAsCustomerAddress": False,
+            "firstName": "John",
+            "lastName": "Smith",
+            "address": "456 Loss Address Street",
+            "zipCode": "30309",
+            "city": "Atlanta",
+            "countyRegion": "Fulton County",
+            "country": "USA",
+            "stateProvince": "Georgia",
+            "mainPhoneNumber": {
+                "number": "1-404-555-5678",
+                "extension": "",
+                "type": "Home"
+            }
+        },
+        "internalParticipants": {
+            "estimator": "Kyle McDougall",
+            "coordinator": "Sarah Johnson",
+            "supervisor": "Mike Wilson",
+            "foreman": "Tom Rodriguez",
+            "accounting": "Lisa Chen",
+            "Marketing": "Adams, Sherri",
+            "Dispatcher": "Adams, Sherri",
+            "NA Administrator": "Adams, Sherri",
+            "NA Field Accounts Manager": "Adams, Sherri"
+        },
+        "externalParticipants": {
+            "brokerAgent": "ABC Insurance Brokers",
+            "brokerAgentContact": "John Smith",
+            "insuranceCarrier": "State Farm",
+            "primaryAdjuster": "Mark Davis",
+            "primaryFieldAdjuster": "Sarah Johnson",
+            "propertyManagement": "Property Management Co.",
+            "propertyManagementContact": "Mike Wilson",
+            "contractorCompany": "SERVPRO Construction",
+            "contractorContact": "Tom Rodriguez",
+            "independentAdjustingFirm": "Independent Adjusters Inc.",
+            "independentAdjusterContact": "Lisa Chen",
+            "publicAdjustingFirm": "Public Adjusters LLC",
+            "publicAdjusterContact": "David Brown",
+            "primaryMortgage": "Wells Fargo",
+            "secondaryMortgage": "Chase Bank",
+            "tpaCompany": "TPA Services Inc.",
+            "tpa": "Amanda Taylor",
+            "billToCompany": "Billing Company LLC",
+            "billToContact": "Robert Jones",
+            "secondaryContact": "Jennifer Davis",
+            "businessContact": "Michael Thompson"
+        },
+        "policyInformation": {
+            "claimNumber": "SF-2024-12345",
+            "fileNumber": "FILE-001",
+            "policyNumber": "POL-987654321",
+            "yearBuilt": 1995,
+            "policyStartDate": "01/01/2024",
+            "policyExpirationDate": "01/01/2025"
+        },
+        "division": {
+            "servicesSelected": [
+                "Water Mitigation",
+                "Structure",
+                "Mold",
+                "Reconstruction"
+            ]
+        },
+        "paymentServices": {
+            "deductibleRequired": "Yes",
+            "amount": "1000",
+            "collectWhen": "Upon Completion",
+            "dwellingLimits": "250000",
+            "contentsLimits": "125000",
+            "otherStructuresLimits": "25000",
+            "selfPay": False
+        },
+        "lossDescriptionSection": {
+            "lossDescription": "Water damage in kitchen area due to pipe burst. Extensive damage to flooring, cabinets, and drywall. Initial moisture readings indicate potential secondary damage. Emergency water extraction completed.",
+            "specialInstructions": "Please wear protective equipment when entering affected area. Customer requests minimal disruption during business hours (9 AM - 5 PM). Contact property manager before accessing basement utilities.",
+            "roomsAffected": [
+                "Kitchen",
+                "Basement",
+                "Living Room",
+                "Dining Room"
+            ]
+        }
+    }
+
+def create_sample_company_form_data():
+    """
+    Create sample form data for Company Customer scenario
+    """
+    return {
+        "generalInformation": {
+            "receivedBy": "Kyle McDougall",
+            "jobName": "ABC Construction Corp - Fire Damage",
+            "reportedBy": "Property Manager",
+            "referredBy": "Lewis, A.D.",
+            "jobSize": "Large",
+            "officeName": "SPSC, LLC",
+            "dateOfLoss": "12/15/2024",
+            "lossCategory": "Commercial",
+            "environmentalCode": "Mitigation",
+            "catReference": "",
+            "priority": "High",
+            "lossType": "General Repairs",
+            "secondaryLossType": "Smoke Damage",
+            "sourceOfLoss": "Electrical Fire"
+        },
+        "customerInformation": {
+            "customerType": "Company",
+            "isSameAsJobAddress": False,
+            "companyCustomer": "",
+            "companyName": "ABC Construction Corporation",
+            "companyEmail": "contact@abcconstruction.com",
+            "companyAddress": "789 Corporate Blvd",
+            "companyZipCode": "30309",
+            "companyCity": "Atlanta",
+            "companyCountyRegion": "Fulton County",
+            "companyCountry": "USA",
+            "companyStateProvince": "Georgia",
+            "companyCustomerContact": "Michael Johnson",
+            "companyMainPhoneNumber": {
+                "number": "1-404-555-9000",
+                "extension": "100",
+                "type": "Business"
+            }
+        },
+        "jobAddressInformation": {
+            "customerType": "Company",
+            "isSameAsCustomerAddress": False,
+            "companyContactSelection": {
+                "existingContact": "Michael Johnson",
+                "newContactFirstName": "Sarah",
+                "newContactLastName": "Wilson"
+            },
+            "companyJobAddress": "1000 Industrial Park Road",
+            "companyJobZipCode": "30309",
+            "companyJobCity": "Atlanta",
+            "companyJobCountyRegion": "Fulton County",
+            "companyJobCountry": "USA",
+            "companyJobStateProvince": "Georgia",
+            "companyMainPhoneLoss": {
+                "number": "1-404-555-8000",
+                "extension": "300",
+                "type": "Business"
+            },
+            "companyBusinessPhoneLoss": {
+                "number": "1-404-555-8001",
+                "extension": "400",
+                "type": "Business"
+            }
+        },
+        "internalParticipants": {
+            "estimator": "Kyle McDougall",
+            "coordinator": "Sarah Johnson",
+            "supervisor": "Mike Wilson",
+            "foreman": "Tom Rodriguez",
+            "accounting": "Lisa Chen",
+            "marketing": "Adams, Sherri",
+            "dispatcher": "Adams, Sherri",
+            "naAdministrator": "Adams, Sherri",
+            "naFieldAccountsManager": "Adams, Sherri"
+        },
+        "externalParticipants": {
+            "brokerAgent": "Commercial Insurance Brokers",
+            "brokerAgentContact": "Michael Thompson",
+            "insuranceCarrier": "Commercial Insurance Co.",
+            "primaryAdjuster": "David Smith",
+            "primaryFieldAdjuster": "Jennifer Davis",
+            "propertyManagement": "Corporate Property Management",
+            "propertyManagementContact": "Robert Jones",
+            "contractorCompany": "SERVPRO Construction",
+            "contractorContact": "Amanda Taylor",
+            "independentAdjustingFirm": "Commercial Adjusters Inc.",
+            "independentAdjusterContact": "Mark Wilson",
+            "publicAdjustingFirm": "Public Commercial Adjusters",
+            "publicAdjusterContact": "Lisa Brown",
+            "primaryMortgage": "Commercial Bank",
+            "secondaryMortgage": "Investment Bank",
+            "tpaCompany": "Commercial TPA Services",
+            "tpa": "James Rodriguez",
+            "billToCompany": "ABC Construction Corporation",
+            "billToContact": "Michael Johnson",
+            "secondaryContact": "Sarah Wilson",
+            "businessContact": "David Chen"
+        },
+        "policyInformation": {
+            "claimNumber": "COM-2024-98765",
+            "fileNumber": "COMM-FILE-001",
+            "policyNumber": "COMM-POL-123456789",
+            "yearBuilt": 1985,
+            "policyStartDate": "01/01/2024",
+            "policyExpirationDate": "01/01/2025"
+        },
+        "division": {
+            "servicesSelected": [
+                "Fire Damage Restoration",
+                "Smoke Damage Cleanup",
+                "Structure",
+                "Reconstruction"
+            ]
+        },
+        "paymentServices": {
+            "deductibleRequired": "Yes",
+            "amount": "5000",
+            "collectWhen": "Upon Completion",
+            "dwellingLimits": "500000",
+            "contentsLimits": "250000",
+            "otherStructuresLimits": "50000",
+            "selfPay": False
+        },
+        "lossDescriptionSection": {
+            "lossDescription": "Electrical fire in the main office building caused extensive smoke and fire damage. Multiple floors affected with damage to equipment, furniture, and building structure. Emergency fire suppression system activated successfully.",
+            "specialInstructions": "Building requires safety inspection before entry. Coordinate with facility manager for access. Work must be completed outside of business hours (after 6 PM). Special handling required for sensitive computer equipment recovery.",
+            "roomsAffected": [
+                "Office",
+                "Conference Room",
+                "Storage Room",
+                "Hallway"
+            ]
+        }
+    }
+
+def get_customer_type_choice():
+    """
+    Ask user to choose between Individual and Company customer types
+    """
+    while True:
+        choice = input("\n🏢 Choose Customer Type:\n1. Individual Customer\n2. Company Customer\nEnter choice (1 or 2): ").strip()
+        
+        if choice == '1':
+            print("📝 Using Individual Customer sample data...")
+            return create_sample_form_data()
+        elif choice == '2':
+            print("🏢 Using Company Customer sample data...")
+            return create_sample_company_form_data()
+        else:
+            print("❌ Invalid choice. Please enter 1 or 2.")
+
+def load_form_data_from_json(json_file_path):
+    """
+    Load form data from a JSON file
+    
+    Args:
+        json_file_path: Path to the JSON file containing form data
+    
+    Returns:
+        Dictionary containing form data
+    
+    Note: Use these example files as templates:
+        - form_data_individual_example.json (for Individual Customer)
+        - form_data_company_example.json (for Company Customer)
+    """
+    try:
+        with open(json_file_path, 'r') as file:
+            data = json.load(file)
+        print(f"✅ Loaded form data from {json_file_path}")
+        return data
+    except FileNotFoundError:
+        print(f"❌ JSON file not found: {json_file_path}")
+        print("📋 Available example files:")
+        print("   - form_data_individual_example.json (Individual Customer)")
+        print("   - form_data_company_example.json (Company Customer)")
+        print("Using sample data instead...")
+        return create_sample_form_data()
+    except json.JSONDecodeError as e:
+        print(f"❌ Error parsing JSON file: {str(e)}")
+        print("Using sample data instead...")
+        return create_sample_form_data()
+    except Exception as e:
+        print(f"❌ Error loading JSON file: {str(e)}")
+        print("Using sample data instead...")
+        return create_sample_form_data()
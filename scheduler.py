@@ -0,0 +1,109 @@
+"""
+Priority and deadline scheduling for queued jobs
+Every job gets a due time when it is queued: submission time plus the pickup target
+of its priority class (generalInformation.priority), tightened to the High target
+when the loss is recent (dateOfLoss within EMERGENCY_LOSS_DAYS), e.g. active water.
+Workers always claim the job that is due first (earliest deadline first).
+
+Because a job's due time is fixed at submission, waiting is its aging: a Low job
+submitted hours ago is due before a High job submitted just now, so low-priority
+work cannot starve behind a steady stream of urgent jobs.
+"""
+
+import time
+from datetime import datetime
+
+PRIORITY_CLASSES = ("High", "Medium", "Low")
+DEFAULT_PRIORITY = "Medium"
+
+# Target seconds from submission until a worker picks the job up
+PRIORITY_TARGETS = {
+    "High": 5 * 60,
+    "Medium": 60 * 60,
+    "Low": 4 * 60 * 60,
+}
+
+# Losses this many days old or newer are scheduled as High
+EMERGENCY_LOSS_DAYS = 1
+
+# Window of recently started jobs used for wait-time percentiles
+WAIT_STATS_WINDOW = 24 * 60 * 60
+
+WAIT_PERCENTILES = (50, 90, 99)
+
+
+def get_job_priority(payload):
+    """Priority class of a payload (DEFAULT_PRIORITY when missing or unknown)"""
+    priority = (payload.get("generalInformation") or {}).get("priority")
+    return priority if priority in PRIORITY_CLASSES else DEFAULT_PRIORITY
+
+
+def get_date_of_loss(payload):
+    """generalInformation.dateOfLoss (MM/DD/YYYY) as a date, or None"""
+    value = (payload.get("generalInformation") or {}).get("dateOfLoss")
+    try:
+        return datetime.strptime(value, "%m/%d/%Y").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def is_emergency(payload, now=None):
+    """True when the loss happened within EMERGENCY_LOSS_DAYS"""
+    date_of_loss = get_date_of_loss(payload)
+    if date_of_loss is None:
+        return False
+    today = datetime.fromtimestamp(now or time.time()).date()
+    return 0 <= (today - date_of_loss).days <= EMERGENCY_LOSS_DAYS
+
+
+def get_due_at(payload, submitted_at=None):
+    """
+    Deadline used to order the queue
+
+    Returns:
+        Tuple of (priority class, due timestamp)
+    """
+    submitted_at = submitted_at or time.time()
+    priority = get_job_priority(payload)
+    target = PRIORITY_TARGETS[priority]
+    if is_emergency(payload, submitted_at):
+        target = min(target, PRIORITY_TARGETS["High"])
+    return priority, submitted_at + target
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a sorted list (fraction in 0..100)"""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * fraction // 100))
+    return values[int(rank) - 1]
+
+
+def summarize_waits(waits_by_priority):
+    """
+    Wait-time percentiles per priority class
+
+    Args:
+        waits_by_priority: Dict of priority class -> list of wait seconds
+
+    Returns:
+        Dict of priority class -> {'count', 'p50', 'p90', 'p99'}
+    """
+    summary = {}
+    for priority in PRIORITY_CLASSES:
+        waits = sorted(waits_by_priority.get(priority, []))
+        summary[priority] = {'count': len(waits)}
+        for fraction in WAIT_PERCENTILES:
+            summary[priority][f"p{fraction}"] = percentile(waits, fraction)
+    return summary
+
+
+def print_wait_summary(summary):
+    """Print wait-time percentiles per priority class"""
+    print("⏱️ Queue wait (submission -> first pickup):")
+    for priority, stats in summary.items():
+        if not stats['count']:
+            print(f"  {priority:<6} no jobs")
+            continue
+        values = ", ".join(f"p{fraction} {stats[f'p{fraction}']:.1f}s" for fraction in WAIT_PERCENTILES)
+        print(f"  {priority:<6} {stats['count']} job(s): {values} (target {PRIORITY_TARGETS[priority]}s)")
@@ -0,0 +1,319 @@
+"""
+Fast-start command line tools that never load the browser stack
+servpro_login.py needs Selenium for everything it does, so importing it costs far more
+than validating a payload. These commands only import what their path needs: validate
+and dry-run load the field registry and the schema, status reads the queue, the fill
+daemon and the shared chromedriver without touching Selenium.
+
+bench-imports measures the import time of the entry point modules, each in a fresh
+interpreter (and the whole process, interpreter start included), and lists the heavy
+packages each one pulls in.
+
+bench-queue measures the job queue's throughput on a scratch queue file: several
+processes enqueue jobs one at a time, then claim, pass the save gate and complete them
+all (the queue calls a worker makes per job, without a browser), with a backlog already
+queued.
+
+Usage:
+    python servpro_cli.py validate job1.json [job2.json ...]
+    python servpro_cli.py dry-run job1.json [job2.json ...]     # the fill plan, no browser
+    python servpro_cli.py status
+    python servpro_cli.py bench-imports [--runs N]
+    python servpro_cli.py bench-queue [--processes N] [--jobs N] [--backlog N]
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import tempfile
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules timed by bench-imports ('' is a bare interpreter start)
+BENCH_MODULES = ("", "servpro_cli", "form_plan", "job_queue", "coordinator", "fill_daemon",
+                 "driver_service", "worker_pool", "servpro_login")
+
+# Packages bench-imports reports when a module pulls them in
+HEAVY_PACKAGES = ("selenium", "requests", "jsonschema", "fastapi", "psutil")
+
+BENCH_SCRIPT = """
+import sys, time, json
+started = time.perf_counter()
+error = None
+try:
+    if sys.argv[1]:
+        __import__(sys.argv[1])
+except Exception as e:
+    error = f"{type(e).__name__}: {str(e)}"
+print(json.dumps({'seconds': time.perf_counter() - started, 'error': error,
+                  'loaded': [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+# bench-queue defaults: processes, jobs enqueued and claimed, jobs queued before the run
+BENCH_QUEUE_PROCESSES = 4
+BENCH_QUEUE_JOBS = 4000
+BENCH_QUEUE_BACKLOG = 10000
+
+
+def iter_payload_files(paths):
+    """
+    Yield (label, payload) for every payload in the files (a file holds one payload or a list)
+
+    A file that cannot be read yields (label, None) after printing why.
+    """
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {type(e).__name__}: {str(e)}")
+            yield path, None
+            continue
+        if isinstance(data, list):
+            for position, payload in enumerate(data):
+                yield f"{path}[{position}]", payload
+        else:
+            yield path, data
+
+
+def validate_files(paths):
+    """Validate payload files against json.txt; returns the number of invalid payloads"""
+    from form_plan import validate_payload
+
+    total = invalid = 0
+    for label, payload in iter_payload_files(paths):
+        total += 1
+        errors = ["file: not readable JSON"] if payload is None else validate_payload(payload)
+        if errors:
+            invalid += 1
+            if payload is not None:
+                print(f"❌ {label}: {len(errors)} error(s)")
+                for error in errors:
+                    print(f"   {error}")
+    print(f"{'✅' if not invalid else '⚠️'} {total - invalid}/{total} payload(s) valid")
+    return invalid
+
+
+def dry_run_files(paths):
+    """Print the fill plan of every payload without opening a browser; returns the number of invalid payloads"""
+    from form_plan import validate_payload, get_form_plan, get_customer_type, iter_plan_values
+    from form_checkpoint import get_job_id
+    from office_cache import get_job_office
+
+    invalid = 0
+    for label, payload in iter_payload_files(paths):
+        if payload is None:
+            invalid += 1
+            continue
+        errors = validate_payload(payload)
+        customer_type = get_customer_type(payload)
+        print(f"\n🧪 {label}: job {get_job_id(payload)}, {customer_type} customer, "
+              f"office {get_job_office(payload) or '-'}")
+        if errors:
+            invalid += 1
+            print(f"   ⚠️ {len(errors)} schema error(s), first: {errors[0]}")
+        actions = list(iter_plan_values(get_form_plan(customer_type), payload))
+        for action, value in actions:
+            print(f"   {action.order:>3} {action.section}.{action.field} = {value!r} "
+                  f"-> {action.control_id} [{action.strategy}{', postback' if action.postback else ''}]")
+        print(f"   {len(actions)} control(s) would be filled, "
+              f"{sum(1 for action, value in actions if action.postback)} with a postback")
+    return invalid
+
+
+def print_status():
+    """Queue counts, fill daemon and shared chromedriver, without loading Selenium"""
+    from job_queue import JobQueue, QUEUE_PATH, print_queue_status
+    from fill_daemon import call, SOCKET_PATH
+    from driver_service import print_service_status
+
+    if os.path.exists(QUEUE_PATH):
+        job_queue = JobQueue(QUEUE_PATH)
+        print_queue_status(job_queue)
+        job_queue.close()
+    else:
+        print(f"📊 Queue: no {QUEUE_PATH} yet")
+    try:
+        status = call(SOCKET_PATH, 'status')
+        print(f"🛎️ Fill daemon: {status['warm']}/{status['sessions']} session(s) warm, {status['idle']} idle")
+    except OSError:
+        print("🛎️ Fill daemon: not running")
+    print_service_status()
+
+
+def bench_imports(runs=3, modules=BENCH_MODULES):
+    """
+    Time the import of each module in a fresh interpreter (best of runs)
+
+    Returns:
+        Dict of module -> {'seconds' (import), 'wall' (whole process), 'error', 'loaded'}
+    """
+    results = {}
+    for module in modules:
+        best = None
+        for _ in range(runs):
+            started = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", BENCH_SCRIPT, module, *HEAVY_PACKAGES],
+                                    cwd=BASE_DIR, capture_output=True, text=True).stdout
+            wall = time.perf_counter() - started
+            try:
+                result = json.loads(output.strip().splitlines()[-1])
+            except (IndexError, ValueError):
+                result = {'seconds': 0, 'error': "no output", 'loaded': []}
+            result['wall'] = wall
+            if best is None or result['wall'] < best['wall']:
+                best = result
+        results[module] = best
+    return results
+
+
+def print_import_bench(results):
+    print("⏱️ Import times (best of runs, fresh interpreter each):")
+    for module, result in results.items():
+        name = module or "(interpreter)"
+        if result['error']:
+            print(f"   {name:<16} not importable here ({result['error']})")
+            continue
+        loaded = f"  loads {', '.join(result['loaded'])}" if result['loaded'] else ""
+        print(f"   {name:<16} {result['seconds'] * 1000:7.1f} ms import, "
+              f"{result['wall'] * 1000:7.1f} ms process{loaded}")
+
+
+def get_bench_payload(index):
+    return {
+        'generalInformation': {'priority': ("High", "Medium", "Low")[index % 3],
+                               'officeName': f"Bench Office {index % 8}"},
+        'customerInformation': {'firstName': "Bench", 'lastName': f"Job {index}"},
+    }
+
+
+def bench_queue_worker(path, role, indexes, start_event, result_queue):
+    """One bench-queue process: enqueue its share of jobs, or claim and complete until none is left"""
+    from job_queue import JobQueue
+
+    job_queue = JobQueue(path)
+    owner = f"bench:{os.getpid()}"
+    start_event.wait()
+    started = time.perf_counter()
+    done = 0
+    if role == "enqueue":
+        for index in indexes:
+            job_queue.enqueue(get_bench_payload(index), f"bench-{index}")
+            done += 1
+    else:
+        office = f"Bench Office {os.getpid() % 8}"
+        while done < len(indexes):
+            job = job_queue.claim(owner, office=office, hedge=False)
+            if job is None:
+                break
+            job_queue.claim_save(job['id'], owner)
+            job_queue.complete(job['id'], owner, {'duration': 1.0})
+            done += 1
+    result_queue.put((done, time.perf_counter() - started))
+    job_queue.close()
+
+
+def run_queue_phase(path, role, processes, jobs, offset):
+    """Run one bench-queue phase in parallel processes; returns (operations, seconds)"""
+    import multiprocessing
+
+    context = multiprocessing.get_context("spawn")
+    start_event = context.Event()
+    result_queue = context.Queue()
+    workers = [
+        context.Process(target=bench_queue_worker,
+                        args=(path, role, range(offset + number, offset + jobs, processes), start_event, result_queue))
+        for number in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    # Let every process import and open the queue before the clock starts
+    time.sleep(1 + processes * 0.2)
+    started = time.perf_counter()
+    start_event.set()
+    results = []
+    while len(results) < len(workers):
+        try:
+            results.append(result_queue.get(timeout=1))
+        except queue.Empty:
+            # A process that died (e.g. could not import the queue) never reports
+            if not any(worker.is_alive() for worker in workers) and result_queue.empty():
+                break
+    seconds = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+    return sum(done for done, _ in results), seconds
+
+
+def bench_queue(processes=BENCH_QUEUE_PROCESSES, jobs=BENCH_QUEUE_JOBS, backlog=BENCH_QUEUE_BACKLOG):
+    """
+    Enqueue and claim+complete throughput of the job queue from several processes
+
+    Returns:
+        Dict with 'enqueue' and 'claim' (operations per second), 'processes', 'jobs' and 'backlog'
+    """
+    from job_queue import JobQueue, check_claim_plan
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        job_queue = JobQueue(path)
+        # The backlog is due last, so the claim phase drains the enqueued jobs on top of it
+        job_queue.enqueue_many([dict(get_bench_payload(index), generalInformation={'priority': "Low"})
+                                for index in range(jobs, jobs + backlog)],
+                               [f"bench-{index}" for index in range(jobs, jobs + backlog)])
+        problems = check_claim_plan(job_queue)
+        job_queue.close()
+        enqueued, enqueue_seconds = run_queue_phase(path, "enqueue", processes, jobs, 0)
+        claimed, claim_seconds = run_queue_phase(path, "claim", processes, jobs, 0)
+    return {
+        'processes': processes,
+        'jobs': jobs,
+        'backlog': backlog,
+        'enqueue': enqueued / enqueue_seconds,
+        'claim': claimed / claim_seconds,
+        'problems': problems,
+    }
+
+
+def print_queue_bench(results):
+    print(f"⏱️ Job queue, {results['processes']} process(es), {results['jobs']} job(s) "
+          f"over a backlog of {results['backlog']}:")
+    print(f"   enqueue                 {results['enqueue']:7.0f} /s")
+    print(f"   claim + save + complete {results['claim']:7.0f} /s")
+    for problem in results['problems']:
+        print(f"   ⚠️ claim plan: {problem}")
+
+
+def main():
+    """Command line front end (see module docstring)"""
+    args = sys.argv[1:]
+    if not args:
+        print(__doc__)
+        return 2
+    command, args = args[0], args[1:]
+
+    if command == "validate":
+        return 1 if validate_files(args) else 0
+    elif command == "dry-run":
+        return 1 if dry_run_files(args) else 0
+    elif command == "status":
+        print_status()
+    elif command == "bench-imports":
+        runs = int(args[args.index("--runs") + 1]) if "--runs" in args else 3
+        print_import_bench(bench_imports(runs))
+    elif command == "bench-queue":
+        processes = int(args[args.index("--processes") + 1]) if "--processes" in args else BENCH_QUEUE_PROCESSES
+        jobs = int(args[args.index("--jobs") + 1]) if "--jobs" in args else BENCH_QUEUE_JOBS
+        backlog = int(args[args.index("--backlog") + 1]) if "--backlog" in args else BENCH_QUEUE_BACKLOG
+        print_queue_bench(bench_queue(processes, jobs, backlog))
+    else:
+        print(__doc__)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
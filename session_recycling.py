@@ -0,0 +1,143 @@
+"""
+Browser recycling for pooled worker sessions
+Chrome grows with every CreateJob load (Telerik-heavy pages leak), so a long-lived
+session slowly gets slower and eats the host's memory. A worker's SessionRecycler
+measures the RSS of its browser process tree after every job and replaces the
+session when it has filled RECYCLE_AFTER_JOBS jobs, its RSS crossed RECYCLE_RSS_MB
+or it is older than RECYCLE_MAX_AGE.
+
+The replacement is pre-warmed: once the session is close to a limit (one job left,
+PREWARM_RSS_FRACTION of the RSS limit, PREWARM_LEAD seconds of age left) a background
+thread opens and logs in a new session while the old one keeps filling jobs. The old
+session is only retired once the new one is on the CreateJob page; if the new one
+fails to open, the old one carries on and the next job tries again.
+"""
+
+import time
+import threading
+
+from worker_pool import get_driver_rss, MB
+
+RECYCLE_AFTER_JOBS = 200
+RECYCLE_RSS_MB = 1500
+RECYCLE_MAX_AGE = 4 * 60 * 60
+
+# Start pre-warming the replacement at this share of the RSS limit
+PREWARM_RSS_FRACTION = 0.85
+
+# Start pre-warming this many seconds before the age limit
+PREWARM_LEAD = 10 * 60
+
+# How long a due recycle waits for the replacement to finish logging in
+PREWARM_TIMEOUT = 180
+
+
+class SessionRecycler:
+    """
+    Recycling state of one worker's browser session
+
+    The worker calls track(driver) for every new session and after_job(driver) after
+    every job it finished on the session; after_job returns the replacement session
+    when the old one should be retired (the worker then quits the old one).
+    """
+
+    def __init__(self, worker_id, open_session, quit_session, max_jobs=RECYCLE_AFTER_JOBS,
+                 max_rss_mb=RECYCLE_RSS_MB, max_age=RECYCLE_MAX_AGE):
+        self.worker_id = worker_id
+        self.open_session = open_session
+        self.quit_session = quit_session
+        self.max_jobs = max_jobs
+        self.max_rss = max_rss_mb * MB
+        self.max_age = max_age
+        self.started_at = time.time()
+        self.jobs = 0
+        self.rss = 0
+        self.recycled = 0
+        self.prewarm_thread = None
+        self.prewarm_started = 0
+        self.prewarmed = None
+
+    def track(self, driver):
+        """Start counting for a new session"""
+        self.started_at = time.time()
+        self.jobs = 0
+        self.rss = get_driver_rss(driver)
+
+    def get_stats(self):
+        """Memory and age of the current session (as published in session_stats events)"""
+        return {
+            'rss_mb': round(self.rss / MB),
+            'jobs': self.jobs,
+            'age': round(time.time() - self.started_at),
+            'recycled': self.recycled,
+        }
+
+    def get_reason(self, ahead=False):
+        """Why the session should be recycled now (or soon, with ahead), or None"""
+        age = time.time() - self.started_at
+        if self.jobs + (1 if ahead else 0) >= self.max_jobs:
+            return f"{self.jobs} jobs"
+        if self.rss >= self.max_rss * (PREWARM_RSS_FRACTION if ahead else 1):
+            return f"RSS {self.rss / MB:.0f} MB"
+        if age + (PREWARM_LEAD if ahead else 0) >= self.max_age:
+            return f"age {age / 3600:.1f} h"
+        return None
+
+    def after_job(self, driver):
+        """
+        Count a finished job and measure the session
+
+        Returns:
+            Pre-warmed replacement session when the current one is due, otherwise None
+        """
+        self.jobs += 1
+        self.rss = get_driver_rss(driver)
+        reason = self.get_reason()
+        if reason is None:
+            if self.get_reason(ahead=True) is not None:
+                self.prewarm()
+            return None
+
+        self.prewarm()
+        replacement = self.take_prewarmed(wait=True)
+        if replacement is None:
+            print(f"⚠️ Worker {self.worker_id}: replacement session not ready, keeping the old one ({reason})")
+            return None
+        print(f"♻️ Worker {self.worker_id}: recycled its browser after {reason} "
+              f"({self.jobs} jobs, {self.rss / MB:.0f} MB, {(time.time() - self.started_at) / 60:.0f} min)")
+        self.recycled += 1
+        self.track(replacement)
+        return replacement
+
+    def prewarm(self):
+        """Open the replacement session in the background (no-op while one is pending)"""
+        if self.prewarm_thread is not None or self.prewarmed is not None:
+            return
+        print(f"🔥 Worker {self.worker_id}: pre-warming a replacement session")
+        self.prewarm_started = time.time()
+        self.prewarm_thread = threading.Thread(target=self.run_prewarm, name=f"prewarm-{self.worker_id}",
+                                               daemon=True)
+        self.prewarm_thread.start()
+
+    def run_prewarm(self):
+        try:
+            self.prewarmed = self.open_session()
+        except Exception as e:
+            print(f"⚠️ Worker {self.worker_id}: pre-warming failed: {type(e).__name__}: {str(e)}")
+
+    def take_prewarmed(self, wait=False):
+        """The pre-warmed session, or None (with wait, until PREWARM_TIMEOUT after it was started)"""
+        thread = self.prewarm_thread
+        if thread is not None:
+            thread.join(max(0, self.prewarm_started + PREWARM_TIMEOUT - time.time()) if wait else 0)
+            if thread.is_alive():
+                return None
+            self.prewarm_thread = None
+        driver, self.prewarmed = self.prewarmed, None
+        return driver
+
+    def close(self):
+        """Quit a pre-warmed session nobody took"""
+        driver = self.take_prewarmed(wait=True)
+        if driver is not None:
+            self.quit_session(driver)
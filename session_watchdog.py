@@ -0,0 +1,102 @@
+"""
+Stuck-session watchdog for browser workers
+A wedged Chrome or chromedriver blocks a worker forever: a hung execute_script never
+returns, so the worker's driver.quit() never runs and the pool silently loses a
+browser. Every worker process therefore runs a SessionWatchdog thread that follows
+it through the pipeline steps (session start, navigation, fill), each with a budget
+in STEP_BUDGETS. Progress events (progress.py) are heartbeats that restart the
+current step's budget.
+
+When a step runs past its budget without a heartbeat, the watchdog kills the
+worker's browsers: its process tree (chromedrivers it started and their Chrome) and
+the Chrome of every session it opened on the shared chromedriver, which itself keeps
+serving the other workers.
+The blocked WebDriver call then fails, the worker fails the job's attempt (it is
+requeued with the usual backoff, see job_queue.py) and opens a fresh session.
+"""
+
+import os
+import time
+import threading
+
+from worker_pool import kill_process_tree
+from driver_service import kill_session_browsers
+
+# Seconds a step may run without a heartbeat
+STEP_BUDGETS = {
+    "session": 180,     # browser launch, login, popups, CreateJob page
+    "navigate": 90,     # back to a fresh CreateJob page between jobs
+    "fill": 300,        # between two progress events of a fill
+}
+
+# Seconds between two checks of the watchdog thread
+WATCHDOG_INTERVAL = 5
+
+
+class SessionWatchdog:
+    """
+    Watchdog thread of one worker process
+
+    The worker calls step(name) when it enters a pipeline step, beat() on every
+    progress event and idle() when it leaves the step. fired() returns why the
+    browser was killed (once), so the worker can record it with the failed attempt.
+    """
+
+    def __init__(self, worker_id, budgets=None, interval=WATCHDOG_INTERVAL):
+        self.worker_id = worker_id
+        self.budgets = budgets or STEP_BUDGETS
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.current = None
+        self.last_beat = 0
+        self.reason = None
+        self.kills = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name=f"watchdog-{worker_id}", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def step(self, name):
+        """Enter a pipeline step; its budget starts now"""
+        with self.lock:
+            self.current = name
+            self.last_beat = time.time()
+
+    def beat(self, event=None):
+        """Heartbeat: the current step made progress (usable as a progress sink)"""
+        with self.lock:
+            self.last_beat = time.time()
+
+    def idle(self):
+        """Leave the current step (no budget applies until the next one)"""
+        with self.lock:
+            self.current = None
+
+    def fired(self):
+        """Reason the browser was killed since the last call, or None"""
+        with self.lock:
+            reason, self.reason = self.reason, None
+        return reason
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            with self.lock:
+                if self.current is None:
+                    continue
+                stalled = time.time() - self.last_beat
+                if stalled <= self.budgets[self.current]:
+                    continue
+                step, self.current = self.current, None
+            # Dedicated chromedrivers are the worker's children; browsers on the
+            # shared chromedriver (driver_service.py) are found by their PIDs
+            killed = kill_process_tree(os.getpid(), include_root=False) + kill_session_browsers()
+            self.kills += 1
+            reason = f"Watchdog: {step} step made no progress for {stalled:.0f}s, killed {killed} browser process(es)"
+            print(f"🐕 Worker {self.worker_id}: {reason}")
+            with self.lock:
+                self.reason = reason
@@ -0,0 +1,189 @@
+"""
+Tab multiplexing for SERVPRO job creation
+Fills several CreateJob.aspx tabs concurrently inside one logged-in browser.
+WebDriver only drives one window at a time, so each job is a step generator that
+yields whenever it has triggered a partial postback; the scheduler then switches
+to another tab instead of sleeping, and only comes back once the postback is done.
+
+Usage:
+    python tab_pool.py job1.json [job2.json ...] [--tabs N]
+"""
+
+import sys
+import time
+from collections import deque
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+from servpro_login import (
+    JOB_CREATION_URL, fill_plan_action, is_postback_pending,
+    verify_and_retry_form, open_job_creation_session, quit_session
+)
+from form_plan import get_form_plan, get_customer_type, iter_plan_values
+from form_checkpoint import get_job_id
+from control_drift import check_control_drift, get_quarantined_fields
+from office_cache import set_session_office, get_job_office
+from worker_pool import summarize_report, load_payloads, print_pool_summary
+
+DEFAULT_MAX_TABS = 4
+
+# A tab whose postback takes longer than this is resumed anyway (same as wait_for_postback)
+POSTBACK_TIMEOUT = 10
+
+# Idle sleep when every open tab is waiting on a postback
+IDLE_POLL = 0.1
+
+
+def open_job_tab(driver):
+    """Open a new tab on the CreateJob page and return its window handle"""
+    driver.switch_to.new_window('tab')
+    driver.get(JOB_CREATION_URL)
+    return driver.current_window_handle
+
+
+def close_job_tab(driver, handle, home_handle):
+    """Close one job tab and focus the home tab again"""
+    try:
+        if handle in driver.window_handles:
+            driver.switch_to.window(handle)
+            driver.close()
+    finally:
+        driver.switch_to.window(home_handle)
+
+
+def iter_job_fill_steps(driver, form_data):
+    """
+    Fill one job as a generator of steps
+
+    Yields 'postback' after every action that started a partial postback; the
+    caller must switch back to this tab before resuming. Returns the verification
+    report (as StopIteration.value) once the form is filled and verified.
+    """
+    wait = WebDriverWait(driver, 10)
+    check_control_drift(driver)
+    quarantined = get_quarantined_fields(driver)
+    plan = get_form_plan(get_customer_type(form_data))
+
+    for action, value in iter_plan_values(plan, form_data):
+        if f"{action.section}.{action.field}" in quarantined:
+            continue
+        fill_plan_action(driver, wait, action, value, wait_postback=False)
+        if action.postback:
+            yield 'postback'
+
+    return verify_and_retry_form(driver, wait, form_data)
+
+
+def run_tab_jobs(driver, payloads, max_tabs=DEFAULT_MAX_TABS, open_tab=None, close_tab=None):
+    """
+    Fill a batch of jobs in up to max_tabs tabs of one logged-in browser
+
+    Args:
+        driver: Logged-in WebDriver (its current tab is kept as the home tab)
+        payloads: List of form data dicts
+        max_tabs: Number of job tabs open at the same time
+        open_tab: Optional open_tab(payload) -> handle of a tab on the CreateJob page
+            (default: a new tab in the shared session, see open_job_tab)
+        close_tab: Optional close_tab(handle) releasing a tab from open_tab and
+            focusing the home tab (default: close_job_tab)
+
+    Returns:
+        List of result dicts in payload order (same shape as worker_pool results)
+    """
+    home_handle = driver.current_window_handle
+    open_tab = open_tab or (lambda payload: open_job_tab(driver))
+    close_tab = close_tab or (lambda handle: close_job_tab(driver, handle, home_handle))
+    pending = deque(enumerate(payloads))
+    active = []
+    results = {}
+
+    def finish(tab, status, report=None, error=None):
+        results[tab['index']] = {
+            'index': tab['index'],
+            'job_id': tab['job_id'],
+            'status': status,
+            'report': summarize_report(report) if report is not None else None,
+            'error': error,
+            'duration': time.time() - tab['started'],
+            'worker': tab['handle'],
+        }
+        active.remove(tab)
+        try:
+            close_tab(tab['handle'])
+        except Exception as e:
+            print(f"⚠️ Could not close tab for job {tab['job_id']}: {str(e)}")
+        print(f"📦 Job {tab['job_id']} ({len(results)}/{len(payloads)}): {status}")
+
+    try:
+        while pending or active:
+            while pending and len(active) < max_tabs:
+                index, payload = pending.popleft()
+                tab = {'index': index, 'job_id': get_job_id(payload), 'office': get_job_office(payload),
+                       'started': time.time(), 'handle': None, 'steps': None, 'waiting_since': None}
+                try:
+                    tab['handle'] = open_tab(payload)
+                    tab['steps'] = iter_job_fill_steps(driver, payload)
+                    active.append(tab)
+                    print(f"🗂️ Job {tab['job_id']} opened in tab {len(active)}/{max_tabs}")
+                except Exception as e:
+                    results[index] = {'index': index, 'job_id': tab['job_id'], 'status': 'error', 'report': None,
+                                      'error': str(e), 'duration': 0, 'worker': tab['handle']}
+                    if tab['handle']:
+                        close_tab(tab['handle'])
+
+            progressed = False
+            for tab in list(active):
+                driver.switch_to.window(tab['handle'])
+                if tab['waiting_since'] is not None:
+                    timed_out = time.time() - tab['waiting_since'] > POSTBACK_TIMEOUT
+                    if not timed_out and is_postback_pending(driver):
+                        continue
+                    if timed_out:
+                        print(f"    ⚠️ Postback still running after {POSTBACK_TIMEOUT}s (job {tab['job_id']})")
+                    tab['waiting_since'] = None
+
+                progressed = True
+                try:
+                    set_session_office(tab['office'])
+                    next(tab['steps'])
+                    tab['waiting_since'] = time.time()
+                except StopIteration as done:
+                    report = done.value or {}
+                    finish(tab, 'failed' if report.get('failed') else 'ok', report=report)
+                except Exception as e:
+                    finish(tab, 'error', error=f"{type(e).__name__}: {str(e)}")
+
+            if not progressed:
+                time.sleep(IDLE_POLL)
+    finally:
+        for tab in list(active):
+            close_tab(tab['handle'])
+        driver.switch_to.window(home_handle)
+
+    return [results[index] for index in range(len(payloads))]
+
+
+def main():
+    """Log in once and fill the JSON payload files given on the command line in parallel tabs"""
+    args = sys.argv[1:]
+    max_tabs = DEFAULT_MAX_TABS
+    if "--tabs" in args:
+        position = args.index("--tabs")
+        max_tabs = int(args[position + 1])
+        del args[position:position + 2]
+    if not args:
+        print(__doc__)
+        return 2
+
+    payloads = load_payloads(args)
+    driver = open_job_creation_session()
+    try:
+        results = run_tab_jobs(driver, payloads, max_tabs=max_tabs)
+    finally:
+        quit_session(driver)
+    print_pool_summary(results)
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,488 @@
+"""
+Multi-process worker pool for SERVPRO job creation
+A supervisor process hands job payloads to N worker processes. Each worker owns
+its own Chrome (setup_driver()) and its own logged-in session, fills and verifies
+jobs one at a time and sends results and failures back to the supervisor.
+
+The pool size is bounded by CPU count and by available memory divided by the
+measured RSS of the first worker's Chrome.
+
+Usage:
+    python worker_pool.py job1.json [job2.json ...] [--workers N]
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import signal
+import traceback
+import multiprocessing
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Assumed per-browser RSS until the first worker has measured its own Chrome
+DEFAULT_CHROME_RSS_MB = 400
+
+# Share of currently available memory the pool may fill with browsers
+MEMORY_HEADROOM = 0.7
+
+# How long the supervisor waits for the first worker to log in and report its RSS
+READY_TIMEOUT = 180
+
+MB = 1024 * 1024
+
+
+def get_available_memory():
+    """Available system memory in bytes (None if it cannot be determined)"""
+    if psutil is not None:
+        return psutil.virtual_memory().available
+    try:
+        with open("/proc/meminfo", "r") as file:
+            for line in file:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def get_child_pids(pid):
+    """All descendant PIDs of a process (Linux /proc fallback when psutil is missing)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                # ppid is the 2nd field after the parenthesised command name
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    descendants = []
+    stack = [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            descendants.append(child)
+            stack.append(child)
+    return descendants
+
+
+def get_process_cmdline(pid):
+    """Command line of a process as a list of arguments (empty if it is gone)"""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).cmdline()
+        except psutil.Error:
+            return []
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as file:
+            return [arg.decode(errors="replace") for arg in file.read().split(b"\0") if arg]
+    except OSError:
+        return []
+
+
+def find_pids_with_arg(arg):
+    """PIDs of all processes that were started with the given command line argument"""
+    if psutil is not None:
+        pids = []
+        for process in psutil.process_iter(["cmdline"]):
+            if arg in (process.info["cmdline"] or []):
+                pids.append(process.pid)
+        return sorted(pids)
+    return sorted(int(entry) for entry in os.listdir("/proc")
+                  if entry.isdigit() and arg in get_process_cmdline(int(entry)))
+
+
+def get_process_tree_rss(pid):
+    """Resident memory in bytes of a process and all its descendants"""
+    if psutil is not None:
+        try:
+            process = psutil.Process(pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total
+        except psutil.Error:
+            return 0
+
+    total = 0
+    for tree_pid in [pid] + get_child_pids(pid):
+        try:
+            with open(f"/proc/{tree_pid}/statm", "r") as file:
+                total += int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+
+def kill_process_tree(pid, include_root=True):
+    """
+    Kill a process's descendants (and the process itself) without waiting for them
+
+    Returns:
+        Number of processes killed
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = root.children(recursive=True) + ([root] if include_root else [])
+        except psutil.Error:
+            return 0
+        killed = 0
+        for process in processes:
+            try:
+                process.kill()
+                killed += 1
+            except psutil.Error:
+                continue
+        return killed
+
+    killed = 0
+    for tree_pid in get_child_pids(pid) + ([pid] if include_root else []):
+        try:
+            os.kill(tree_pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            killed += 1
+        except OSError:
+            continue
+    return killed
+
+
+def get_driver_rss(driver):
+    """
+    RSS in bytes of a session's browser
+
+    A session on the shared chromedriver (driver_service.py) counts its Chrome's process
+    tree; a session with its own chromedriver counts the chromedriver too.
+    """
+    try:
+        pid = getattr(driver, 'browser_pid', None) or driver.service.process.pid
+        return get_process_tree_rss(pid)
+    except Exception:
+        return 0
+
+
+def get_pool_size(requested=None, chrome_rss=None):
+    """
+    Number of workers the host can run
+
+    Args:
+        requested: Desired pool size (defaults to the CPU count)
+        chrome_rss: Measured RSS of one worker's browser in bytes
+
+    Returns:
+        Pool size bounded by CPU count and by available memory / per-browser RSS
+    """
+    cpus = os.cpu_count() or 1
+    size = min(requested or cpus, cpus)
+
+    per_browser = chrome_rss or DEFAULT_CHROME_RSS_MB * MB
+    available = get_available_memory()
+    if available is not None:
+        size = min(size, int(available * MEMORY_HEADROOM // per_browser))
+    return max(1, size)
+
+
+def summarize_report(report):
+    """Picklable summary of a verification report"""
+    return {
+        'checked': report.get('checked', 0),
+        'passed': report.get('passed', 0),
+        'failed': {
+            key: {'status': failure['status'], 'expected': failure['expected'], 'actual': failure['actual']}
+            for key, failure in report.get('failed', {}).items()
+        },
+        'quarantined': list(report.get('quarantined', [])),
+    }
+
+
+def worker_main(worker_id, task_queue, result_queue):
+    """
+    Worker process: open one session, then fill jobs until the supervisor sends None
+
+    Messages sent to the supervisor:
+        ('ready', worker_id, rss_bytes)      session is on the CreateJob page
+        ('started', worker_id, index)        job taken from the queue
+        ('done', worker_id, result)          job result (see run_job)
+        ('exit', worker_id, error or None)   worker is shutting down
+
+    A SessionWatchdog (progress events are its heartbeats) kills a hung browser;
+    the job then ends in 'error' and the next one gets a fresh session. Sessions are
+    recycled by job count, RSS and age (see session_recycling.py).
+    """
+    # Selenium is only imported inside the worker processes
+    import servpro_login
+    from progress import set_progress_sink
+    from session_watchdog import SessionWatchdog
+    from session_recycling import SessionRecycler
+    from request_blocking import enable_traffic_accounting
+
+    enable_traffic_accounting()
+    watchdog = SessionWatchdog(worker_id).start()
+    set_progress_sink(watchdog.beat)
+    recycler = SessionRecycler(worker_id, servpro_login.open_job_creation_session, servpro_login.quit_session)
+    driver = None
+    try:
+        watchdog.step("session")
+        driver = servpro_login.open_job_creation_session()
+        recycler.track(driver)
+        watchdog.idle()
+        result_queue.put(('ready', worker_id, get_driver_rss(driver)))
+
+        first_job = True
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            index, payload = task
+            result_queue.put(('started', worker_id, index))
+
+            if driver is None:
+                watchdog.step("session")
+                driver = recycler.take_prewarmed() or servpro_login.open_job_creation_session()
+                recycler.track(driver)
+                first_job = True
+            elif not first_job:
+                watchdog.step("navigate")
+                servpro_login.navigate_to_job_creation(driver)
+            first_job = False
+
+            watchdog.step("fill")
+            result = run_job(servpro_login, driver, index, payload)
+            watchdog.idle()
+            killed = watchdog.fired()
+            if killed:
+                result['status'] = 'error'
+                result['error'] = f"{result['error'] or ''}\n{killed}".strip()
+            result['worker'] = worker_id
+            result_queue.put(('done', worker_id, result))
+
+            if result['status'] == 'error':
+                # The session may be unusable; start the next job on a fresh browser
+                servpro_login.quit_session(driver)
+                driver = None
+            else:
+                replacement = recycler.after_job(driver)
+                if replacement is not None:
+                    servpro_login.quit_session(driver)
+                    driver, first_job = replacement, True
+
+        result_queue.put(('exit', worker_id, None))
+    except Exception as e:
+        result_queue.put(('exit', worker_id, watchdog.fired() or f"{type(e).__name__}: {str(e)}"))
+    finally:
+        watchdog.stop()
+        recycler.close()
+        if driver is not None:
+            servpro_login.quit_session(driver)
+
+
+def run_job(servpro_login, driver, index, payload, job_id=None):
+    """
+    Fill one job in a worker's session
+
+    job_id is the checkpoint ID, derived from the payload when omitted.
+
+    Returns:
+        Result dict: {'index', 'job_id', 'status': 'ok'|'failed'|'error', 'report', 'error', 'duration',
+        'traffic'} where traffic is the job's network traffic or None (see request_blocking.read_traffic)
+    """
+    from progress import emit
+    from request_blocking import reset_traffic, read_traffic
+
+    job_id = job_id or servpro_login.get_job_id(payload)
+    started = time.time()
+    reset_traffic(driver)
+    try:
+        report = servpro_login.resume_job_creation_form(driver, payload, job_id=job_id)
+        summary = summarize_report(report)
+        result = {
+            'index': index,
+            'job_id': job_id,
+            'status': 'ok' if not summary['failed'] else 'failed',
+            'report': summary,
+            'error': None,
+            'duration': time.time() - started,
+        }
+    except Exception as e:
+        result = {
+            'index': index,
+            'job_id': job_id,
+            'status': 'error',
+            'report': None,
+            'error': traceback.format_exc(limit=5) or str(e),
+            'duration': time.time() - started,
+        }
+    result['traffic'] = read_traffic(driver)
+    if result['traffic'] is not None:
+        emit('traffic', **result['traffic'])
+    return result
+
+
+def start_worker(context, worker_id, task_queue, result_queue):
+    """Spawn one worker process"""
+    process = context.Process(
+        target=worker_main, args=(worker_id, task_queue, result_queue),
+        name=f"servpro-worker-{worker_id}", daemon=True,
+    )
+    process.start()
+    return process
+
+
+def run_worker_pool(payloads, workers=None):
+    """
+    Fill a batch of job payloads across a pool of worker processes
+
+    The first worker is started alone; once it reports its Chrome RSS the pool is
+    sized from CPU count and available memory and the remaining workers are started.
+
+    Args:
+        payloads: List of form data dicts
+        workers: Desired number of workers (bounded by get_pool_size)
+
+    Returns:
+        List of result dicts in payload order (see run_job)
+    """
+    # spawn: each worker gets a clean interpreter instead of a fork of the supervisor
+    context = multiprocessing.get_context("spawn")
+    task_queue = context.Queue()
+    result_queue = context.Queue()
+
+    for index, payload in enumerate(payloads):
+        task_queue.put((index, payload))
+
+    processes = {0: start_worker(context, 0, task_queue, result_queue)}
+    in_flight = {}
+    results = {}
+    pool_size = None
+    ready_deadline = time.time() + READY_TIMEOUT
+    exited = set()
+    respawns = 0
+
+    def size_pool(chrome_rss):
+        size = min(get_pool_size(workers, chrome_rss), max(1, len(payloads)))
+        rss_note = f"{chrome_rss / MB:.0f} MB" if chrome_rss else "unmeasured"
+        print(f"🏭 Worker pool size: {size} (Chrome RSS {rss_note}, {os.cpu_count()} CPUs)")
+        for worker_id in range(1, size):
+            processes[worker_id] = start_worker(context, worker_id, task_queue, result_queue)
+        for _ in range(size):
+            task_queue.put(None)
+        return size
+
+    while len(results) < len(payloads):
+        try:
+            kind, worker_id, data = result_queue.get(timeout=1)
+        except queue.Empty:
+            kind = None
+
+        if kind == 'ready':
+            print(f"✅ Worker {worker_id} ready")
+            if pool_size is None:
+                pool_size = size_pool(data)
+        elif kind == 'started':
+            in_flight[worker_id] = data
+        elif kind == 'done':
+            in_flight.pop(worker_id, None)
+            results[data['index']] = data
+            print(f"📦 Job {data['job_id']} ({len(results)}/{len(payloads)}): {data['status']} "
+                  f"on worker {worker_id} in {data['duration']:.1f}s")
+        elif kind == 'exit':
+            exited.add(worker_id)
+            if data:
+                print(f"❌ Worker {worker_id} stopped: {data}")
+
+        if pool_size is None and (0 in exited or time.time() > ready_deadline):
+            # The first worker never reached the form; size the pool on the default estimate
+            pool_size = size_pool(None)
+
+        if kind is not None:
+            continue
+
+        # Queue drained: fail jobs whose worker process died mid-job and replace the worker
+        for worker_id, process in list(processes.items()):
+            if process.is_alive() or worker_id in exited:
+                continue
+            exited.add(worker_id)
+            if worker_id in in_flight:
+                index = in_flight.pop(worker_id)
+                results[index] = {
+                    'index': index, 'job_id': None, 'status': 'error', 'report': None, 'worker': worker_id,
+                    'error': f"Worker {worker_id} died (exit code {process.exitcode})", 'duration': 0,
+                }
+            if pool_size is not None and respawns < pool_size and len(results) < len(payloads):
+                respawns += 1
+                replacement_id = max(processes) + 1
+                print(f"🔄 Worker {worker_id} died, starting worker {replacement_id}")
+                processes[replacement_id] = start_worker(context, replacement_id, task_queue, result_queue)
+
+        if pool_size is not None and not any(process.is_alive() for process in processes.values()):
+            # No workers left: everything still queued fails
+            for index in range(len(payloads)):
+                if index not in results:
+                    results[index] = {
+                        'index': index, 'job_id': None, 'status': 'error', 'report': None, 'worker': None,
+                        'error': "No live workers left", 'duration': 0,
+                    }
+
+    for process in processes.values():
+        process.join(timeout=30)
+        if process.is_alive():
+            process.terminate()
+
+    return [results[index] for index in range(len(payloads))]
+
+
+def load_payloads(paths):
+    """Load payloads from JSON files (each file holds one payload or a list of payloads)"""
+    payloads = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+        payloads.extend(data if isinstance(data, list) else [data])
+    return payloads
+
+
+def print_pool_summary(results):
+    """Print per-status counts and the failures"""
+    counts = {}
+    for result in results:
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+    print(f"\n📊 Pool results: {', '.join(f'{status}={count}' for status, count in sorted(counts.items()))}")
+    for result in results:
+        if result['status'] == 'failed':
+            print(f"  ⚠️ Job {result['job_id']}: {len(result['report']['failed'])} unconfirmed field(s)")
+        elif result['status'] == 'error':
+            print(f"  ❌ Job #{result['index']} ({result['job_id']}): {result['error'].strip().splitlines()[-1]}")
+
+    from request_blocking import print_traffic_summary
+    print_traffic_summary(results)
+
+
+def main():
+    """Run the pool over JSON payload files given on the command line"""
+    args = sys.argv[1:]
+    workers = None
+    if "--workers" in args:
+        position = args.index("--workers")
+        workers = int(args[position + 1])
+        del args[position:position + 2]
+    if not args:
+        print(__doc__)
+        return 2
+
+    results = run_worker_pool(load_payloads(args), workers=workers)
+    print_pool_summary(results)
+    return 0 if all(result['status'] == 'ok' for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())